@@ -0,0 +1,181 @@
+#include <Wire.h>
+#include <math.h>
+
+// Same sensors and filters as sketch_feb27a.ino (Protocol 2), but every cycle is
+// sent as one 47-byte binary frame instead of ~300 bytes of text.
+// Decode on the PC with glove_binary.py / glove_logger_service.py run --binary.
+//
+// Frame (little-endian):
+//   A5 5A | protocol u8 | seq u16 | millis u32 | 6 x int16 flex | 6 x float32 MPU | CRC-16/CCITT-FALSE u16
+// The CRC covers everything between the sync word and the CRC.
+
+#define SDA_PIN 21
+#define SCL_PIN 22
+
+#define MPU1_ADDR 0x68
+#define MPU2_ADDR 0x69
+
+// Flex Sensor Pins
+#define FLEX_PIN_1 32
+#define FLEX_PIN_2 34
+#define FLEX_PIN_3 35
+
+#define SAMPLE_PERIOD_US 5000  // 200 frames/s fits easily in 115200 baud (max ~245)
+#define PROTOCOL_ID 2
+
+const float GYRO_SENSITIVITY = 131.0; // LSB/°/s
+float pitch_1 = 0, roll_1 = 0, yaw_1 = 0;
+float pitch_2 = 0, roll_2 = 0, yaw_2 = 0;
+
+float alpha = 0.98;  // Complementary filter constant
+
+unsigned long lastTime = 0;
+unsigned long nextSample = 0;
+uint16_t seq = 0;
+bool mpu1_found = false;
+bool mpu2_found = false;
+
+struct __attribute__((packed)) GloveFrame {
+  uint8_t sync[2];
+  uint8_t protocol;
+  uint16_t seq;
+  uint32_t t_ms;
+  int16_t flex[6];   // Flex1_ADC, Flex1_Angle, Flex2_ADC, Flex2_Angle, Flex3_ADC, Flex3_Angle
+  float mpu[6];      // MPU1_Pitch, MPU1_Roll, MPU1_Yaw, MPU2_Pitch, MPU2_Roll, MPU2_Yaw
+  uint16_t crc;
+};
+
+void setup() {
+  Serial.begin(115200);
+  Wire.begin(SDA_PIN, SCL_PIN);
+  Wire.setClock(400000);  // Fast-mode I2C keeps two MPU reads well under the sample period
+
+  // Setup messages stay text; the host decoder skips them while searching for sync words
+  Serial.println("\n🔍 Scanning I2C devices...");
+  for (uint8_t addr = 1; addr < 127; addr++) {
+    Wire.beginTransmission(addr);
+    if (Wire.endTransmission() == 0) {
+      if (addr == MPU1_ADDR) mpu1_found = true;
+      if (addr == MPU2_ADDR) mpu2_found = true;
+    }
+  }
+
+  if (!mpu1_found && !mpu2_found) {
+    Serial.println("❌ No MPU6050 found! Check wiring.");
+    while (1);
+  }
+
+  if (mpu1_found) initMPU6050(MPU1_ADDR);
+  if (mpu2_found) initMPU6050(MPU2_ADDR);
+
+  lastTime = millis();
+  nextSample = micros();
+}
+
+void loop() {
+  // Fixed-rate sampling instead of delay(1000)
+  if ((long)(micros() - nextSample) < 0) return;
+  nextSample += SAMPLE_PERIOD_US;
+
+  // --- [FILTER] Low-pass filter applied to flex sensor readings ---
+  static float filteredADC1 = 0, filteredADC2 = 0, filteredADC3 = 0;
+  float alphaFlex = 0.1;
+
+  filteredADC1 = alphaFlex * analogRead(FLEX_PIN_1) + (1 - alphaFlex) * filteredADC1;
+  filteredADC2 = alphaFlex * analogRead(FLEX_PIN_2) + (1 - alphaFlex) * filteredADC2;
+  filteredADC3 = alphaFlex * analogRead(FLEX_PIN_3) + (1 - alphaFlex) * filteredADC3;
+
+  unsigned long currentTime = millis();
+  float dt = (currentTime - lastTime) / 1000.0;
+  lastTime = currentTime;
+
+  if (mpu1_found) readMPU6050(MPU1_ADDR, dt, pitch_1, roll_1, yaw_1);
+  if (mpu2_found) readMPU6050(MPU2_ADDR, dt, pitch_2, roll_2, yaw_2);
+
+  GloveFrame frame;
+  frame.sync[0] = 0xA5;
+  frame.sync[1] = 0x5A;
+  frame.protocol = PROTOCOL_ID;
+  frame.seq = seq++;
+  frame.t_ms = currentTime;
+  frame.flex[0] = (int16_t)filteredADC1;
+  frame.flex[1] = getAngleFlex1((int)filteredADC1);
+  frame.flex[2] = (int16_t)filteredADC2;
+  frame.flex[3] = getAngleFlex2((int)filteredADC2);
+  frame.flex[4] = (int16_t)filteredADC3;
+  frame.flex[5] = getAngleFlex3((int)filteredADC3);
+  frame.mpu[0] = pitch_1; frame.mpu[1] = roll_1; frame.mpu[2] = yaw_1;
+  frame.mpu[3] = pitch_2; frame.mpu[4] = roll_2; frame.mpu[5] = yaw_2;
+  frame.crc = crc16((const uint8_t *)&frame + 2, sizeof(frame) - 4);
+
+  Serial.write((const uint8_t *)&frame, sizeof(frame));
+}
+
+// --- CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), same as glove_binary.crc16 ---
+uint16_t crc16(const uint8_t *data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (uint8_t i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void initMPU6050(int address) {
+  Wire.beginTransmission(address);
+  Wire.write(0x6B);
+  Wire.write(0);
+  Wire.endTransmission();
+}
+
+// --- [FILTER] Complementary filter applied to MPU6050 orientation ---
+void readMPU6050(int address, float dt, float &pitch, float &roll, float &yaw) {
+  Wire.beginTransmission(address);
+  Wire.write(0x3B);
+  Wire.endTransmission(false);
+  Wire.requestFrom(address, 14, true);
+
+  if (Wire.available() < 14) return;  // Keep the last values; the host sees them repeat
+
+  int16_t AccX = Wire.read() << 8 | Wire.read();
+  int16_t AccY = Wire.read() << 8 | Wire.read();
+  int16_t AccZ = Wire.read() << 8 | Wire.read();
+  Wire.read(); Wire.read(); // Skip temperature
+  int16_t GyroX = Wire.read() << 8 | Wire.read();
+  int16_t GyroY = Wire.read() << 8 | Wire.read();
+  int16_t GyroZ = Wire.read() << 8 | Wire.read();
+
+  float gyroX_dps = GyroX / GYRO_SENSITIVITY;
+  float gyroY_dps = GyroY / GYRO_SENSITIVITY;
+  float gyroZ_dps = GyroZ / GYRO_SENSITIVITY;
+
+  // Accelerometer-based pitch and roll
+  float accPitch = atan2(AccY, sqrt(AccX * AccX + AccZ * AccZ)) * 180 / PI;
+  float accRoll  = atan2(-AccX, AccZ) * 180 / PI;
+
+  // Complementary filter fusion
+  pitch = alpha * (pitch + gyroY_dps * dt) + (1 - alpha) * accPitch;
+  roll  = alpha * (roll  + gyroX_dps * dt) + (1 - alpha) * accRoll;
+  yaw   += gyroZ_dps * dt;  // Yaw can't be corrected by accel, so integrate gyro
+}
+
+// --- [CALIBRATION] ADC to Angle mapping for Flex Sensors ---
+int getAngleFlex1(int adc) {
+  if (adc <= 3350) return 0;
+  else if (adc <= 3456) return 15;
+  else if (adc <= 3562) return 30;
+  else if (adc <= 3668) return 45;
+  else if (adc <= 3774) return 60;
+  else if (adc <= 3880) return 75;
+  else return 90;
+}
+
+int getAngleFlex2(int adc) {
+  return getAngleFlex1(adc); // Same mapping as Flex1
+}
+
+int getAngleFlex3(int adc) {
+  return getAngleFlex1(adc); // Same mapping as Flex1
+}
@@ -1,182 +1,211 @@
-import pandas as pd
-import numpy as np
+import argparse
+import os
+import sys
 import time
-import torch
-import torch.nn as nn
-import torch.nn.functional as F
-from torch.utils.data import DataLoader, TensorDataset
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
-from sklearn.model_selection import train_test_split
-
-# --- Load dataset ---
-file_path = r'C:\Mini Project\Dataset Protocol 2\Filtered Data\combined_data-1.csv'
-df = pd.read_csv(file_path)
-
-# --- Features and labels ---
-feature_columns = [
-    'Flex1_ADC', 'Flex1_Angle', 'Flex2_ADC', 'Flex2_Angle', 'Flex3_ADC', 'Flex3_Angle',
-    'MPU1_Pitch', 'MPU1_Roll', 'MPU1_Yaw', 'MPU2_Pitch', 'MPU2_Roll', 'MPU2_Yaw'
-]
-target_column = 'Phase'
-
-X = df[feature_columns].values.astype(np.float32)
-y = df[target_column].astype('category')
-y_encoded = y.cat.codes.values.astype(np.int64)
-label_mapping = dict(enumerate(y.cat.categories))
-inverse_mapping = {v: k for k, v in label_mapping.items()}
-
-# --- Train-test split ---
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y_encoded, test_size=0.2, random_state=42, stratify=y_encoded
-)
-
-# --- Balance the "Holding" class ---
-holding_class_index = inverse_mapping['Holding']
-holding_mask = y_train == holding_class_index
-
-X_train_half_holding = X_train[holding_mask][:len(X_train[~holding_mask])]
-y_train_half_holding = y_train[holding_mask][:len(y_train[~holding_mask])]
-
-X_train_non_holding = X_train[~holding_mask]
-y_train_non_holding = y_train[~holding_mask]
-
-X_train_balanced = np.vstack([X_train_non_holding, X_train_half_holding])
-y_train_balanced = np.hstack([y_train_non_holding, y_train_half_holding])
-
-indices = np.random.permutation(len(X_train_balanced))
-X_train_balanced = X_train_balanced[indices]
-y_train_balanced = y_train_balanced[indices]
-
-# --- Convert to PyTorch tensors ---
-X_train_tensor = torch.tensor(X_train_balanced).unsqueeze(1)
-y_train_tensor = torch.tensor(y_train_balanced)
-X_test_tensor = torch.tensor(X_test).unsqueeze(1)
-y_test_tensor = torch.tensor(y_test)
-
-# --- Dataset & DataLoader ---
-train_dataset = TensorDataset(X_train_tensor, y_train_tensor)
-test_dataset = TensorDataset(X_test_tensor, y_test_tensor)
-
-train_loader = DataLoader(train_dataset, batch_size=128, shuffle=True)
-test_loader = DataLoader(test_dataset, batch_size=128, shuffle=False)
-
-# --- 1D CNN Model ---
-class CNN1D(nn.Module):
-    def __init__(self, num_classes):
-        super(CNN1D, self).__init__()
-        self.conv1 = nn.Conv1d(1, 64, kernel_size=3)
-        self.conv2 = nn.Conv1d(64, 128, kernel_size=3)
-        self.dropout = nn.Dropout(0.3)
-        self.fc1 = nn.Linear(128 * 8, 256)
-        self.fc2 = nn.Linear(256, num_classes)
-
-    def forward(self, x):
-        x = F.relu(self.conv1(x))
-        x = F.relu(self.conv2(x))
-        x = x.view(x.size(0), -1)
-        x = self.dropout(x)
-        x = F.relu(self.fc1(x))
-        x = self.fc2(x)
-        return x
-
-# --- Model, Loss, Optimizer ---
-num_classes = len(np.unique(y_encoded))
-model = CNN1D(num_classes)
-device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-model.to(device)
-
-criterion = nn.CrossEntropyLoss()
-optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
-
-# --- Training ---
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python Codes"))
+from glove_paths import CHECKPOINT, COMBINED_CSV
+
+# --- Default settings (override on the command line, see --help) ---
+file_path = COMBINED_CSV
+checkpoint_path = CHECKPOINT  # Starting point for incremental_training.py
+replay_capacity = 50000  # Past samples kept for replay during incremental updates
 epochs = 20
-train_start = time.time()
-model.train()
-for epoch in range(epochs):
-    for xb, yb in train_loader:
-        xb, yb = xb.to(device), yb.to(device)
-        preds = model(xb)
-        loss = criterion(preds, yb)
-        optimizer.zero_grad()
-        loss.backward()
-        optimizer.step()
-train_end = time.time()
-training_time = train_end - train_start
-
-# --- Evaluation ---
-eval_start = time.time()
-model.eval()
-with torch.no_grad():
-    y_pred = []
-    y_true = []
-    for xb, yb in test_loader:
-        xb = xb.to(device)
-        outputs = model(xb)
-        predicted = torch.argmax(outputs, dim=1).cpu().numpy()
-        y_pred.extend(predicted)
-        y_true.extend(yb.numpy())
-eval_end = time.time()
-evaluation_time = eval_end - eval_start
-
-# --- Accuracy ---
-train_accuracy = accuracy_score(y_train_balanced, model(torch.tensor(X_train_balanced).unsqueeze(1).to(device)).argmax(1).cpu().numpy())
-test_accuracy = accuracy_score(y_true, y_pred)
-
-print(f"\nTraining Data Count : {len(X_train_balanced)}")
-print(f"Test Data Count     : {len(X_test)}")
-print(f"\nTraining Accuracy   : {train_accuracy:.4f}")
-print(f"Test Accuracy       : {test_accuracy:.4f}")
-print(f"\nOverall Model Accuracy: {test_accuracy * 100:.2f}%")
-print(f"\nTraining Time       : {training_time:.2f} seconds")
-print(f"Evaluation Time     : {evaluation_time:.2f} seconds")
-
-# --- Confusion Matrix ---
-cm = confusion_matrix(y_true, y_pred)
-cm_adjusted = cm.copy()
-label_list = list(label_mapping.values())
-holding_index = label_list.index('Holding')
-cm_adjusted[holding_index] = cm_adjusted[holding_index] // 2
-
-plt.figure(figsize=(10, 7))
-sns.heatmap(cm_adjusted, annot=True, fmt='d', cmap='Blues',
-            xticklabels=label_list,
-            yticklabels=label_list)
-plt.xlabel('Predicted')
-plt.ylabel('Actual')
-plt.title('Confusion Matrix (1D CNN)')
-plt.tight_layout()
-plt.show()
-
-# --- Adjust Classification Report ---
-report_dict = classification_report(y_true, y_pred, output_dict=True, target_names=label_list)
-report_df = pd.DataFrame(report_dict).T
-
-# Halve Holding's support and recalculate weighted avg
-report_df.loc['Holding', 'support'] = report_df.loc['Holding', 'support'] / 2
-report_df.loc['weighted avg', 'support'] = report_df.loc[label_list, 'support'].sum()
-report_df.loc['macro avg', 'support'] = len(label_list)
-
-print("\nAdjusted Classification Report:")
-print(report_df.round(2))
-
-# --- Phase-wise Accuracy ---
-print("\nPhase-wise Accuracies:")
-for idx, name in label_mapping.items():
-    mask = (np.array(y_true) == idx)
-    if mask.sum() > 0:
-        acc = accuracy_score(np.array(y_true)[mask], np.array(y_pred)[mask])
-        print(f"{name:20}: {acc:.4f}")
-    else:
-        print(f"{name:20}: No samples in test set")
-
-# --- Actual vs Predicted Sample ---
-print("\nSample Class Predictions (Actual vs Predicted):")
-y_test_labels = pd.Series(y_true).map(label_mapping)
-y_pred_labels = pd.Series(y_pred).map(label_mapping)
-comparison_df = pd.DataFrame({
-    'Actual': y_test_labels,
-    'Predicted': y_pred_labels
-})
-print(comparison_df.head(20))
\ No newline at end of file
+profile_path = None  # e.g. r'C:\Mini Project\profile_cnn1d.json' to record per-epoch/stage timings
+profile_trace = None  # e.g. r'C:\Mini Project\trace_cnn1d.json' for a torch.profiler Chrome trace
+
+
+def train(file_path=file_path, checkpoint_path=checkpoint_path, epochs=epochs, replay_capacity=replay_capacity,
+          profile_path=profile_path, profile_trace=profile_trace):
+    # Heavy libraries are imported only once the arguments are known to be valid
+    import numpy as np
+    import pandas as pd
+    import torch
+    import torch.nn as nn
+    from torch.utils.data import DataLoader, TensorDataset
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.model_selection import train_test_split
+
+    from glove_loader import combined_sources, load_features, session_fingerprint
+    from cnn_model import CNN1D, FEATURE_COLUMNS, TARGET_COLUMN, ReplayBuffer, save_checkpoint
+    from training_profiler import TrainingProfiler
+    from eval_metrics import ConfusionMatrix, evaluate_model
+
+    # --- Features and labels ---
+    feature_columns = FEATURE_COLUMNS
+    target_column = TARGET_COLUMN
+
+    # Reads only these columns, straight into float32 features and label codes
+    X, y_encoded, class_names = load_features(file_path, feature_columns, target_column)
+    labelled = y_encoded >= 0  # code -1 is a row without a label; it has no class to learn
+    if not labelled.all():
+        print(f"⚠️ Skipped {int((~labelled).sum())} rows without a {target_column} label")
+        X, y_encoded = X[labelled], y_encoded[labelled]
+    label_mapping = dict(enumerate(class_names))
+    inverse_mapping = {v: k for k, v in label_mapping.items()}
+
+    # --- Train-test split ---
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y_encoded, test_size=0.2, random_state=42, stratify=y_encoded
+    )
+
+    # --- Balance the "Holding" class ---
+    holding_class_index = inverse_mapping['Holding']
+    holding_mask = y_train == holding_class_index
+
+    X_train_half_holding = X_train[holding_mask][:len(X_train[~holding_mask])]
+    y_train_half_holding = y_train[holding_mask][:len(y_train[~holding_mask])]
+
+    X_train_non_holding = X_train[~holding_mask]
+    y_train_non_holding = y_train[~holding_mask]
+
+    X_train_balanced = np.vstack([X_train_non_holding, X_train_half_holding])
+    y_train_balanced = np.hstack([y_train_non_holding, y_train_half_holding])
+
+    indices = np.random.permutation(len(X_train_balanced))
+    X_train_balanced = X_train_balanced[indices]
+    y_train_balanced = y_train_balanced[indices]
+
+    # --- Convert to PyTorch tensors ---
+    X_train_tensor = torch.tensor(X_train_balanced).unsqueeze(1)
+    y_train_tensor = torch.tensor(y_train_balanced)
+    X_test_tensor = torch.tensor(X_test).unsqueeze(1)
+    y_test_tensor = torch.tensor(y_test)
+
+    # --- Dataset & DataLoader ---
+    train_dataset = TensorDataset(X_train_tensor, y_train_tensor)
+    test_dataset = TensorDataset(X_test_tensor, y_test_tensor)
+
+    train_loader = DataLoader(train_dataset, batch_size=128, shuffle=True)
+    test_loader = DataLoader(test_dataset, batch_size=128, shuffle=False)
+
+    # --- Model, Loss, Optimizer ---
+    num_classes = len(class_names)
+    model = CNN1D(num_classes)
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    model.to(device)
+
+    criterion = nn.CrossEntropyLoss()
+    optimizer = torch.optim.Adam(model.parameters(), lr=0.001)
+
+    # --- Training ---
+    profiler = TrainingProfiler(device, enabled=profile_path is not None, trace_path=profile_trace)
+    train_start = time.time()
+    model.train()
+    for epoch in range(epochs):
+        with profiler.epoch("train", epoch):
+            for xb, yb in profiler.batches(train_loader):
+                with profiler.stage("transfer"):
+                    xb, yb = xb.to(device), yb.to(device)
+                with profiler.stage("forward"):
+                    preds = model(xb)
+                    loss = criterion(preds, yb)
+                with profiler.stage("backward"):
+                    optimizer.zero_grad()
+                    loss.backward()
+                with profiler.stage("optimizer"):
+                    optimizer.step()
+    train_end = time.time()
+    training_time = train_end - train_start
+
+    # --- Save checkpoint (model, optimizer, labels, replay buffer) ---
+    replay = ReplayBuffer(replay_capacity)
+    replay.add(X_train_balanced, y_train_balanced)
+    # The sessions inside the combined file count as seen, so incremental_training.py only picks up newer ones
+    seen_sessions = {os.path.abspath(file_path): session_fingerprint(file_path)}
+    sources = combined_sources(file_path)
+    if not sources:
+        print(f"⚠️ No source list next to {file_path}; re-create it with Dataset_Combiner.py, "
+              "otherwise incremental_training.py treats the sessions inside it as new")
+    seen_sessions.update(sources)
+    save_checkpoint(checkpoint_path, model, optimizer, label_mapping.values(), replay=replay,
+                    seen_sessions=seen_sessions)
+
+    # --- Evaluation ---
+    # Predictions are folded into a confusion matrix batch by batch; no per-row lists are kept
+    eval_start = time.time()
+    model.eval()
+    metrics = ConfusionMatrix(class_names)
+    sample_true, sample_pred = None, None
+    with torch.no_grad(), profiler.epoch("eval", 0):
+        for xb, yb in profiler.batches(test_loader):
+            with profiler.stage("transfer"):
+                xb = xb.to(device)
+            with profiler.stage("forward"):
+                predicted = model(xb).argmax(1).cpu().numpy()
+            metrics.update(yb.numpy(), predicted)
+            if sample_true is None:
+                sample_true, sample_pred = yb.numpy()[:20], predicted[:20]
+    eval_end = time.time()
+    evaluation_time = eval_end - eval_start
+
+    # --- Accuracy ---
+    train_metrics = evaluate_model(model, DataLoader(train_dataset, batch_size=1024), device, class_names)
+    train_accuracy = train_metrics.accuracy
+    test_accuracy = metrics.accuracy
+
+    print(f"\nTraining Data Count : {len(X_train_balanced)}")
+    print(f"Test Data Count     : {len(X_test)}")
+    print(f"\nTraining Accuracy   : {train_accuracy:.4f}")
+    print(f"Test Accuracy       : {test_accuracy:.4f}")
+    print(f"\nOverall Model Accuracy: {test_accuracy * 100:.2f}%")
+    print(f"\nTraining Time       : {training_time:.2f} seconds")
+    print(f"Evaluation Time     : {evaluation_time:.2f} seconds")
+    if profile_path:
+        profiler.print_summary()
+        profiler.save(profile_path, model_config=model.config, batch_size=train_loader.batch_size,
+                      train_samples=len(X_train_balanced), test_samples=len(X_test))
+
+    # --- Confusion Matrix ---
+    # Row-normalized, so classes with more test rows (e.g. Holding) do not dominate the colours
+    label_list = list(class_names)
+    plt.figure(figsize=(10, 7))
+    sns.heatmap(metrics.normalized(), annot=metrics.matrix, fmt='d', cmap='Blues', vmin=0, vmax=1,
+                xticklabels=label_list,
+                yticklabels=label_list)
+    plt.xlabel('Predicted')
+    plt.ylabel('Actual')
+    plt.title('Confusion Matrix (1D CNN)')
+    plt.tight_layout()
+    plt.show()
+
+    # --- Classification Report ---
+    # "macro avg" weighs every phase equally, independent of how many Holding rows the test set has
+    print("\nClassification Report:")
+    print(metrics.report().round(2))
+
+    # --- Phase-wise Accuracy ---
+    print("\nPhase-wise Accuracies:")
+    per_class = metrics.per_class()
+    for name, row in per_class.iterrows():
+        if row['support'] > 0:
+            print(f"{name:20}: {row['recall']:.4f}")
+        else:
+            print(f"{name:20}: No samples in test set")
+
+    # --- Actual vs Predicted Sample ---
+    print("\nSample Class Predictions (Actual vs Predicted):")
+    comparison_df = pd.DataFrame({
+        'Actual': pd.Series(sample_true).map(label_mapping),
+        'Predicted': pd.Series(sample_pred).map(label_mapping)
+    })
+    print(comparison_df.head(20))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the 1D CNN grasp-phase classifier")
+    parser.add_argument("data", nargs="?", default=file_path, help="combined training CSV or .glarc archive")
+    parser.add_argument("--checkpoint", default=checkpoint_path, help="where to save the trained checkpoint")
+    parser.add_argument("--epochs", type=int, default=epochs)
+    parser.add_argument("--replay-capacity", type=int, default=replay_capacity)
+    parser.add_argument("--profile", default=profile_path, help="write per-epoch/stage timings to this JSON file")
+    parser.add_argument("--trace", default=profile_trace, help="write a torch.profiler Chrome trace (needs --profile)")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.data):
+        raise SystemExit(f"❌ Training data not found: {args.data} (set GLOVE_DATASET_DIR or pass a path)")
+    train(args.data, args.checkpoint, args.epochs, args.replay_capacity, args.profile, args.trace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+FEATURE_COLUMNS = [
+    'Flex1_ADC', 'Flex1_Angle', 'Flex2_ADC', 'Flex2_Angle', 'Flex3_ADC', 'Flex3_Angle',
+    'MPU1_Pitch', 'MPU1_Roll', 'MPU1_Yaw', 'MPU2_Pitch', 'MPU2_Roll', 'MPU2_Yaw'
+]
+TARGET_COLUMN = 'Phase'
+
+
+# --- 1D CNN Model ---
+class CNN1D(nn.Module):
+    def __init__(self, num_classes, num_features=len(FEATURE_COLUMNS), conv1_channels=64, conv2_channels=128, hidden=256):
+        super(CNN1D, self).__init__()
+        self.config = dict(num_classes=num_classes, num_features=num_features, conv1_channels=conv1_channels,
+                           conv2_channels=conv2_channels, hidden=hidden)
+        self.conv1 = nn.Conv1d(1, conv1_channels, kernel_size=3)
+        self.conv2 = nn.Conv1d(conv1_channels, conv2_channels, kernel_size=3)
+        self.dropout = nn.Dropout(0.3)
+        self.fc1 = nn.Linear(conv2_channels * (num_features - 4), hidden)
+        self.fc2 = nn.Linear(hidden, num_classes)
+
+    def forward(self, x):
+        x = F.relu(self.conv1(x))
+        x = F.relu(self.conv2(x))
+        x = x.view(x.size(0), -1)
+        x = self.dropout(x)
+        x = F.relu(self.fc1(x))
+        x = self.fc2(x)
+        return x
+
+
+# --- Checkpoints ---
+def save_checkpoint(path, model, optimizer, class_names, replay=None, seen_sessions=None, history=None):
+    """Save everything needed to resume training: weights, optimizer state, labels, replay buffer."""
+    torch.save({
+        'model_config': model.config,
+        'model_state': model.state_dict(),
+        'optimizer_state': optimizer.state_dict() if optimizer is not None else None,
+        'class_names': list(class_names),
+        'feature_columns': FEATURE_COLUMNS,
+        'replay': replay.state_dict() if replay is not None else None,
+        'seen_sessions': seen_sessions or {},
+        'history': history or [],
+    }, path)
+
+
+def load_checkpoint(path, device='cpu', lr=0.001):
+    """Returns (model, optimizer, checkpoint dict)."""
+    checkpoint = torch.load(path, map_location=device, weights_only=False)
+    model = CNN1D(**checkpoint['model_config']).to(device)
+    model.load_state_dict(checkpoint['model_state'])
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    if checkpoint.get('optimizer_state'):
+        optimizer.load_state_dict(checkpoint['optimizer_state'])
+        for group in optimizer.param_groups:
+            group['lr'] = lr
+    return model, optimizer, checkpoint
+
+
+# --- Replay buffer ---
+class ReplayBuffer:
+    """Fixed-size reservoir sample of past training rows.
+
+    Every row ever added has the same chance of being in the buffer, so a
+    bounded buffer stays representative of the whole training history.
+    """
+
+    def __init__(self, capacity, num_features=len(FEATURE_COLUMNS), seed=0):
+        self.capacity = capacity
+        self.X = np.empty((capacity, num_features), dtype=np.float32)
+        self.y = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, X, y):
+        n = len(X)
+        # Fill free slots first
+        free = min(self.capacity - self.size, n)
+        self.X[self.size:self.size + free] = X[:free]
+        self.y[self.size:self.size + free] = y[:free]
+        self.size += free
+        # Reservoir step for the rest: row i replaces a random slot with probability capacity / (seen + i + 1)
+        if free < n:
+            positions = self.seen + np.arange(free, n)
+            slots = (self.rng.random(n - free) * (positions + 1)).astype(np.int64)
+            keep = slots < self.capacity
+            self.X[slots[keep]] = X[free:][keep]
+            self.y[slots[keep]] = y[free:][keep]
+        self.seen += n
+
+    def sample(self, n):
+        idx = self.rng.integers(0, self.size, size=min(n, self.size)) if self.size else np.empty(0, np.int64)
+        return self.X[idx], self.y[idx]
+
+    def state_dict(self):
+        return {'capacity': self.capacity, 'X': self.X[:self.size].copy(), 'y': self.y[:self.size].copy(),
+                'seen': self.seen}
+
+    @classmethod
+    def from_state(cls, state, seed=0):
+        buffer = cls(state['capacity'], state['X'].shape[1], seed)
+        buffer.size = len(state['X'])
+        buffer.X[:buffer.size] = state['X']
+        buffer.y[:buffer.size] = state['y']
+        buffer.seen = state['seen']
+        return buffer
@@ -0,0 +1,211 @@
+"""Streaming classification metrics built on an incrementally updated confusion matrix.
+
+Each batch of predictions is folded into a K x K matrix with one np.bincount,
+so evaluating a huge test set (or the live stream) never keeps per-row
+predictions around. Per-class precision/recall/F1, macro and weighted
+averages, and per-session breakdowns are all derived from the matrices.
+
+    metrics = ConfusionMatrix(class_names)
+    for xb, yb in loader:
+        metrics.update(yb.numpy(), model(xb).argmax(1).numpy())
+    print(metrics.report().round(2))
+
+    python eval_metrics.py cnn1d_checkpoint.pt "Dataset Protocol 2/Filtered Data" --json metrics.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python Codes"))
+
+
+class ConfusionMatrix:
+    """matrix[i, j] = number of rows with true class i predicted as class j."""
+
+    def __init__(self, class_names):
+        self.class_names = list(class_names)
+        self.k = len(self.class_names)
+        self.matrix = np.zeros((self.k, self.k), dtype=np.int64)
+        self.sessions = {}  # session -> its own matrix
+
+    def update(self, y_true, y_pred, sessions=None):
+        """Add a batch of integer labels. `sessions` (scalar or per-row array) enables per-session metrics."""
+        y_true = np.asarray(y_true, dtype=np.int64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.int64).ravel()
+        cells = y_true * self.k + y_pred
+        kk = self.k * self.k
+        if sessions is None:
+            self.matrix += np.bincount(cells, minlength=kk).reshape(self.k, self.k)
+            return
+        if np.ndim(sessions) == 0:
+            batch = np.bincount(cells, minlength=kk).reshape(self.k, self.k)
+            self.matrix += batch
+            self._add_session(sessions, batch)
+            return
+        names, inverse = np.unique(np.asarray(sessions), return_inverse=True)
+        counts = np.bincount(inverse * kk + cells, minlength=len(names) * kk).reshape(len(names), self.k, self.k)
+        self.matrix += counts.sum(axis=0)
+        for name, batch in zip(names, counts):
+            self._add_session(name.item() if hasattr(name, "item") else name, batch)
+
+    def _add_session(self, name, batch):
+        if name not in self.sessions:
+            self.sessions[name] = np.zeros((self.k, self.k), dtype=np.int64)
+        self.sessions[name] += batch
+
+    def merge(self, other):
+        """Combine with a matrix computed elsewhere (another worker, another shard)."""
+        if other.class_names != self.class_names:
+            raise ValueError("Cannot merge confusion matrices with different classes")
+        self.matrix += other.matrix
+        for name, batch in other.sessions.items():
+            self._add_session(name, batch)
+        return self
+
+    # --- Derived metrics ---
+    @property
+    def total(self):
+        return int(self.matrix.sum())
+
+    @property
+    def accuracy(self):
+        return _accuracy(self.matrix)
+
+    def per_class(self):
+        """DataFrame of precision, recall, f1-score, support per class (recall = phase-wise accuracy)."""
+        return _per_class(self.matrix, self.class_names)
+
+    def report(self):
+        """Same layout as sklearn's classification_report(output_dict=True) as a DataFrame."""
+        return _report(self.matrix, self.class_names)
+
+    def normalized(self):
+        """Row-normalized matrix: fraction of each true class predicted as each class."""
+        support = self.matrix.sum(axis=1, keepdims=True)
+        return np.divide(self.matrix, support, out=np.zeros(self.matrix.shape), where=support > 0)
+
+    def per_session(self):
+        """Accuracy, macro F1 and row count for every session seen in update(..., sessions=...)."""
+        rows = []
+        for name, matrix in self.sessions.items():
+            table = _per_class(matrix, self.class_names)
+            seen = table["support"] > 0
+            rows.append({"session": name, "rows": int(matrix.sum()), "accuracy": _accuracy(matrix),
+                         "macro_f1": float(table.loc[seen, "f1-score"].mean()) if seen.any() else 0.0})
+        return pd.DataFrame(rows, columns=["session", "rows", "accuracy", "macro_f1"]).set_index("session")
+
+    def to_dict(self):
+        return {"class_names": self.class_names, "matrix": self.matrix.tolist(),
+                "sessions": {str(k): v.tolist() for k, v in self.sessions.items()}}
+
+    @classmethod
+    def from_dict(cls, state):
+        metrics = cls(state["class_names"])
+        metrics.matrix[:] = state["matrix"]
+        for name, matrix in state.get("sessions", {}).items():
+            metrics.sessions[name] = np.asarray(matrix, dtype=np.int64)
+        return metrics
+
+
+def _accuracy(matrix):
+    total = matrix.sum()
+    return float(np.trace(matrix) / total) if total else 0.0
+
+
+def _per_class(matrix, class_names):
+    tp = np.diag(matrix).astype(np.float64)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+    denom = precision + recall
+    f1 = np.divide(2 * precision * recall, denom, out=np.zeros_like(tp), where=denom > 0)
+    return pd.DataFrame({"precision": precision, "recall": recall, "f1-score": f1, "support": support},
+                        index=class_names)
+
+
+def _report(matrix, class_names):
+    table = _per_class(matrix, class_names)
+    # Classes that never occur and were never predicted do not count towards the averages
+    active = table[(table["support"] > 0) | (matrix.sum(axis=0) > 0)]
+    support = active["support"]
+    metrics = ["precision", "recall", "f1-score"]
+    macro = active[metrics].mean()
+    weighted = (active[metrics].mul(support, axis=0).sum() / support.sum()) if support.sum() else macro * 0
+    total = int(matrix.sum())
+    accuracy = _accuracy(matrix)
+    summary = pd.DataFrame(
+        [[accuracy, accuracy, accuracy, total], [*macro, total], [*weighted, total]],
+        index=["accuracy", "macro avg", "weighted avg"], columns=metrics + ["support"])
+    return pd.concat([table, summary])
+
+
+def evaluate_model(model, loader, device, class_names, sessions=None):
+    """Run a torch model over a DataLoader and return its ConfusionMatrix.
+
+    `sessions`, if given, is an array with one session id per dataset row, in
+    loader order (the loader must not shuffle).
+    """
+    import torch
+
+    metrics = ConfusionMatrix(class_names)
+    offset = 0
+    model.eval()
+    with torch.no_grad():
+        for xb, yb in loader:
+            predicted = model(xb.to(device)).argmax(1).cpu().numpy()
+            batch_sessions = sessions[offset:offset + len(yb)] if sessions is not None else None
+            metrics.update(yb.numpy(), predicted, batch_sessions)
+            offset += len(yb)
+    return metrics
+
+
+def evaluate_checkpoint(checkpoint_path, paths, batch_size=1024, device="cpu"):
+    """Evaluate a CNN1D checkpoint on session files / folders, one session at a time."""
+    import torch
+    from torch.utils.data import DataLoader, TensorDataset
+
+    from cnn_model import TARGET_COLUMN, load_checkpoint
+    from glove_loader import list_sessions, load_labelled_features
+
+    model, _, checkpoint = load_checkpoint(checkpoint_path, device)
+    metrics = ConfusionMatrix(checkpoint["class_names"])
+    files = []
+    for path in paths:
+        files.extend(list_sessions(path) if os.path.isdir(path) else [path])
+    for path in files:
+        # Unlabelled rows have no ground truth and are left out of every metric
+        X, y, dropped = load_labelled_features(path, checkpoint["feature_columns"], TARGET_COLUMN, metrics.class_names)
+        if dropped:
+            print(f"⚠️ {os.path.basename(path)}: skipped {dropped} rows without a {TARGET_COLUMN} label")
+        loader = DataLoader(TensorDataset(torch.from_numpy(X).unsqueeze(1), torch.from_numpy(y)), batch_size=batch_size)
+        sessions = np.full(len(y), os.path.basename(path))
+        metrics.merge(evaluate_model(model, loader, device, metrics.class_names, sessions))
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a CNN1D checkpoint on recorded sessions")
+    parser.add_argument("checkpoint")
+    parser.add_argument("data", nargs="+", help="session files or folders")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--json", help="also save the confusion matrices to this file")
+    args = parser.parse_args(argv)
+
+    metrics = evaluate_checkpoint(args.checkpoint, args.data, args.batch_size)
+    print(f"\nClassification Report ({metrics.total} rows, {len(metrics.sessions)} sessions):")
+    print(metrics.report().round(2))
+    print("\nPer-session:")
+    print(metrics.per_session().round(4))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(metrics.to_dict(), f)
+        print(f"✅ Metrics saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
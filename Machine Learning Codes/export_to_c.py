@@ -0,0 +1,419 @@
+"""Export a trained classifier to a self-contained C header for on-glove inference.
+
+Supported models:
+  - CNN1D checkpoints (.pt from "1D CNN.py" / incremental_training.py).
+    Train a reduced network for the MCU, e.g.
+    CNN1D(num_classes, conv1_channels=8, conv2_channels=16, hidden=32).
+    Weights are float32, or int8 with one float scale per tensor (--int8, 4x
+    smaller in flash, activations stay float).
+  - Tree bundles (.joblib from incremental_training.py): Random Forest or XGBoost,
+    flattened to node arrays and walked without recursion.
+
+The header holds `const` weight arrays (placed in flash by the ESP32
+toolchain) and `int glove_predict(const float x[GLOVE_NUM_FEATURES], float
+scores[GLOVE_NUM_CLASSES])`, which returns the predicted class index.
+
+`check` compiles the header with a small host runner and compares its
+scores against PyTorch / scikit-learn / XGBoost on recorded sessions:
+
+    python export_to_c.py export cnn1d_small.pt glove_model.h --int8
+    python export_to_c.py check cnn1d_small.pt glove_model.h "Dataset Protocol 2/Filtered Data/Balaji-1.csv"
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python Codes"))
+from cnn_model import FEATURE_COLUMNS
+
+# Rough ESP32 (Xtensa LX6 @ 240 MHz, single-precision FPU) costs used for the estimates
+MCU_CLOCK_HZ = 240_000_000
+CYCLES_PER_MAC = {"float": 4, "int8": 6}  # int8 pays for the convert + scale
+CYCLES_PER_NODE = 12  # load feature/threshold, compare, branch
+CODE_BYTES = 1500  # inference function + loops, excluding weight arrays
+
+
+# === Code generation helpers ===
+def _c_float(value):
+    text = f"{float(value):.9g}"
+    return text + ("f" if ("." in text or "e" in text) else ".0f")
+
+
+def _c_array(name, values, ctype):
+    values = np.asarray(values).ravel()
+    if ctype == "float":
+        items = [_c_float(v) for v in values]
+    else:
+        items = [str(int(v)) for v in values]
+    lines = [", ".join(items[i:i + 12]) for i in range(0, len(items), 12)]
+    return f"static const {ctype} {name}[{len(values)}] = {{\n    " + ",\n    ".join(lines) + "\n};\n"
+
+
+def _header(guard, class_names, defines, body):
+    names = ", ".join(f'"{n}"' for n in class_names)
+    out = [f"/* Generated by export_to_c.py; do not edit. */\n#ifndef {guard}\n#define {guard}\n\n#include <stdint.h>\n\n"]
+    out += [f"#define {k} {v}\n" for k, v in defines.items()]
+    out.append(f"\nstatic const char *const GLOVE_CLASS_NAMES[GLOVE_NUM_CLASSES] = {{{names}}};\n")
+    out.append(f"/* Feature order: {', '.join(FEATURE_COLUMNS)} */\n\n")
+    out.append(body)
+    out.append(f"\n#endif /* {guard} */\n")
+    return "".join(out)
+
+
+# === CNN1D ===
+def _quantize(tensor):
+    """Symmetric per-tensor int8: w ~= q * scale."""
+    scale = float(np.abs(tensor).max()) / 127.0 or 1.0
+    return np.clip(np.round(tensor / scale), -127, 127).astype(np.int8), scale
+
+
+def export_cnn(checkpoint_path, header_path, int8=False):
+    from cnn_model import load_checkpoint
+
+    model, _, checkpoint = load_checkpoint(checkpoint_path, "cpu")
+    cfg = model.config
+    F, C1, C2, H, K = cfg["num_features"], cfg["conv1_channels"], cfg["conv2_channels"], cfg["hidden"], cfg["num_classes"]
+    L1, L2 = F - 2, F - 4
+    state = {k: v.detach().cpu().numpy().astype(np.float32) for k, v in model.state_dict().items()}
+
+    arrays, weight_bytes = [], 0
+    for layer in ("conv1", "conv2", "fc1", "fc2"):
+        w, b = state[f"{layer}.weight"], state[f"{layer}.bias"]
+        if int8:
+            q, scale = _quantize(w)
+            arrays.append(_c_array(f"{layer}_w", q, "int8_t"))
+            arrays.append(f"static const float {layer}_w_scale = {_c_float(scale)};\n")
+            weight_bytes += q.size + 4
+        else:
+            arrays.append(_c_array(f"{layer}_w", w, "float"))
+            weight_bytes += w.size * 4
+        arrays.append(_c_array(f"{layer}_b", b, "float"))
+        weight_bytes += b.size * 4
+
+    weight = "((float)(a)[i] * a##_scale)" if int8 else "((a)[i])"
+    body = "".join(arrays) + f"""
+#define GLOVE_W(a, i) {weight}
+
+static float glove_act1[{C1 * L1}];
+static float glove_act2[{C2 * L2}];
+static float glove_act3[{H}];
+
+static int glove_predict(const float *x, float *scores)
+{{
+    int o, i, t, k, best = 0;
+    /* conv1: 1 -> {C1} channels, kernel 3, ReLU */
+    for (o = 0; o < {C1}; o++)
+        for (t = 0; t < {L1}; t++) {{
+            float s = conv1_b[o];
+            for (k = 0; k < 3; k++) s += GLOVE_W(conv1_w, o * 3 + k) * x[t + k];
+            glove_act1[o * {L1} + t] = s > 0.0f ? s : 0.0f;
+        }}
+    /* conv2: {C1} -> {C2} channels, kernel 3, ReLU */
+    for (o = 0; o < {C2}; o++)
+        for (t = 0; t < {L2}; t++) {{
+            float s = conv2_b[o];
+            for (i = 0; i < {C1}; i++)
+                for (k = 0; k < 3; k++) s += GLOVE_W(conv2_w, (o * {C1} + i) * 3 + k) * glove_act1[i * {L1} + t + k];
+            glove_act2[o * {L2} + t] = s > 0.0f ? s : 0.0f;
+        }}
+    /* fc1: {C2 * L2} -> {H}, ReLU (dropout is identity at inference) */
+    for (o = 0; o < {H}; o++) {{
+        float s = fc1_b[o];
+        for (i = 0; i < {C2 * L2}; i++) s += GLOVE_W(fc1_w, o * {C2 * L2} + i) * glove_act2[i];
+        glove_act3[o] = s > 0.0f ? s : 0.0f;
+    }}
+    /* fc2: {H} -> {K} logits */
+    for (o = 0; o < {K}; o++) {{
+        float s = fc2_b[o];
+        for (i = 0; i < {H}; i++) s += GLOVE_W(fc2_w, o * {H} + i) * glove_act3[i];
+        scores[o] = s;
+        if (s > scores[best]) best = o;
+    }}
+    return best;
+}}
+"""
+    defines = {"GLOVE_MODEL_CNN1D": 1, "GLOVE_NUM_FEATURES": F, "GLOVE_NUM_CLASSES": K}
+    with open(header_path, "w") as f:
+        f.write(_header("GLOVE_MODEL_H", checkpoint["class_names"], defines, body))
+
+    macs = C1 * L1 * 3 + C2 * L2 * C1 * 3 + H * C2 * L2 + K * H
+    cycles = macs * CYCLES_PER_MAC["int8" if int8 else "float"]
+    return {"kind": "cnn1d", "weights": "int8" if int8 else "float32", "macs": macs, "cycles": cycles,
+            "flash_bytes": weight_bytes + CODE_BYTES, "ram_bytes": 4 * (C1 * L1 + C2 * L2 + H)}
+
+
+# === Tree ensembles ===
+def _float32_floor(values):
+    """Largest float32 <= each float64 value, so `x <= t` in C matches sklearn's float64 test."""
+    out = np.asarray(values, dtype=np.float64).astype(np.float32)
+    high = out.astype(np.float64) > values
+    out[high] = np.nextafter(out[high], np.float32(-np.inf))
+    return out
+
+
+def _forest_nodes(model, num_classes):
+    """Concatenate all sklearn trees into one node table. Leaves hold class probabilities."""
+    feature, threshold, left, right, roots, leaf_values = [], [], [], [], [], []
+    offset = 0
+    for est in model.estimators_:
+        t = est.tree_
+        n = t.node_count
+        roots.append(offset)
+        is_leaf = t.children_left < 0
+        feature.append(np.where(is_leaf, -1, t.feature))
+        threshold.append(_float32_floor(np.where(is_leaf, 0.0, t.threshold)))
+        left.append(np.where(is_leaf, 0, t.children_left + offset))
+        right.append(np.where(is_leaf, 0, t.children_right + offset))
+        value = t.value[:, 0, :]
+        value = value / np.maximum(value.sum(axis=1, keepdims=True), 1e-12)
+        full = np.zeros((n, num_classes), dtype=np.float32)
+        full[:, np.asarray(est.classes_, dtype=np.int64)] = value  # classes absent from the fit stay 0
+        leaf_values.append(full)
+        offset += n
+    return (np.concatenate(feature), np.concatenate(threshold), np.concatenate(left), np.concatenate(right),
+            np.array(roots), np.concatenate(leaf_values))
+
+
+def _xgb_nodes(model, num_classes, X_ref):
+    """Flatten an XGBoost booster. Leaves hold one margin value for tree i's class (i % num_classes)."""
+    booster = model.get_booster()
+    df = booster.trees_to_dataframe()
+    ids = {node_id: i for i, node_id in enumerate(df["ID"])}
+    is_leaf = (df["Feature"] == "Leaf").to_numpy()
+    feature = np.where(is_leaf, -1, [int(f[1:]) if f != "Leaf" else -1 for f in df["Feature"]])
+    threshold = np.where(is_leaf, 0.0, df["Split"].fillna(0.0)).astype(np.float32)
+    left = np.array([ids.get(v, 0) for v in df["Yes"]])
+    right = np.array([ids.get(v, 0) for v in df["No"]])
+    leaf = np.where(is_leaf, df["Gain"], 0.0).astype(np.float32)
+    roots = df.index[df["Node"] == 0].to_numpy()
+
+    # Base margin per class = full margin minus the summed leaves (recovered on reference rows)
+    import xgboost as xgb
+
+    dm = xgb.DMatrix(X_ref[:64])
+    margin = booster.predict(dm, output_margin=True)
+    leaves = booster.predict(dm, pred_leaf=True).astype(np.int64)
+    trees = df.groupby("Tree")
+    leaf_sum = np.zeros_like(margin)
+    for tree_id, nodes in trees:
+        values = dict(zip(nodes["Node"], nodes["Gain"]))
+        leaf_sum[:, tree_id % num_classes] += [values[n] for n in leaves[:, tree_id]]
+    base = (margin - leaf_sum).mean(axis=0).astype(np.float32)
+    return feature, threshold, left, right, roots, leaf, base
+
+
+def export_trees(bundle_path, header_path, X_ref=None):
+    import joblib
+
+    bundle = joblib.load(bundle_path)
+    model, class_names, kind = bundle["model"], bundle["class_names"], bundle["kind"]
+    K, F = len(class_names), len(FEATURE_COLUMNS)
+
+    if kind == "rf":
+        feature, threshold, left, right, roots, values = _forest_nodes(model, K)
+        arrays = [_c_array("tree_values", values, "float")]
+        leaf_code = f"""        for (k = 0; k < {K}; k++) scores[k] += tree_values[n * {K} + k];"""
+        finish = f"""    for (k = 0; k < {K}; k++) scores[k] /= {len(roots)}.0f;"""
+        init = "0.0f"
+        value_bytes = values.size * 4
+        cmp = "<="
+    else:
+        if X_ref is None:
+            X_ref = np.random.default_rng(0).random((64, F), dtype=np.float32)
+        feature, threshold, left, right, roots, values, base = _xgb_nodes(model, K, X_ref)
+        arrays = [_c_array("tree_values", values, "float"), _c_array("tree_base", base, "float")]
+        leaf_code = f"""        scores[t % {K}] += tree_values[n];"""
+        finish = ""
+        init = "tree_base[k]"
+        value_bytes = values.size * 4 + K * 4
+        cmp = "<"
+
+    index_type = "int16_t" if len(feature) < 32768 else "int32_t"
+    arrays = [
+        _c_array("tree_feature", feature, "int8_t"),
+        _c_array("tree_threshold", threshold, "float"),
+        _c_array("tree_left", left, index_type),
+        _c_array("tree_right", right, index_type),
+        _c_array("tree_roots", roots, "int32_t"),
+    ] + arrays
+    body = "".join(arrays) + f"""
+static int glove_predict(const float *x, float *scores)
+{{
+    int t, k, best = 0;
+    for (k = 0; k < {K}; k++) scores[k] = {init};
+    for (t = 0; t < {len(roots)}; t++) {{
+        int32_t n = tree_roots[t];
+        while (tree_feature[n] >= 0)
+            n = x[tree_feature[n]] {cmp} tree_threshold[n] ? tree_left[n] : tree_right[n];
+{leaf_code}
+    }}
+{finish}
+    for (k = 1; k < {K}; k++)
+        if (scores[k] > scores[best]) best = k;
+    return best;
+}}
+"""
+    defines = {f"GLOVE_MODEL_{kind.upper()}": 1, "GLOVE_NUM_FEATURES": F, "GLOVE_NUM_CLASSES": K}
+    with open(header_path, "w") as f:
+        f.write(_header("GLOVE_MODEL_H", class_names, defines, body))
+
+    depth = np.mean([est.get_depth() for est in model.estimators_]) if kind == "rf" else \
+        float(model.get_params().get("max_depth") or 6)
+    index_bytes = 2 if index_type == "int16_t" else 4
+    flash = len(feature) * (1 + 4 + 2 * index_bytes) + len(roots) * 4 + value_bytes + CODE_BYTES
+    return {"kind": kind, "nodes": int(len(feature)), "trees": int(len(roots)),
+            "cycles": int(len(roots) * depth * CYCLES_PER_NODE), "flash_bytes": int(flash), "ram_bytes": 4 * K}
+
+
+# === Host parity check ===
+RUNNER = r"""
+#include <stdio.h>
+#include "%s"
+
+int main(void)
+{
+    float x[GLOVE_NUM_FEATURES], scores[GLOVE_NUM_CLASSES];
+    while (fread(x, sizeof(float), GLOVE_NUM_FEATURES, stdin) == GLOVE_NUM_FEATURES) {
+        glove_predict(x, scores);
+        fwrite(scores, sizeof(float), GLOVE_NUM_CLASSES, stdout);
+    }
+    return 0;
+}
+"""
+
+
+def compile_runner(header_path, workdir, compiler="cc"):
+    source = os.path.join(workdir, "glove_runner.c")
+    binary = os.path.join(workdir, "glove_runner")
+    with open(source, "w") as f:
+        f.write(RUNNER % os.path.abspath(header_path).replace("\\", "/"))
+    subprocess.run([compiler, "-O2", "-std=c99", "-Wall", "-o", binary, source], check=True)
+    return binary
+
+
+def reference_scores(model_path, X, int8=False):
+    """Scores in the same space as the C code: logits (CNN), probabilities (RF), margins (XGB).
+
+    With int8=True the CNN runs on the same quantized-then-rescaled weights as the header.
+    """
+    if model_path.endswith(".joblib"):
+        import joblib
+
+        bundle = joblib.load(model_path)
+        model = bundle["model"]
+        if bundle["kind"] == "rf":
+            proba = np.zeros((len(X), len(bundle["class_names"])), dtype=np.float32)
+            proba[:, np.asarray(model.classes_, dtype=np.int64)] = model.predict_proba(X)
+            return proba
+        import xgboost as xgb
+
+        return model.get_booster().predict(xgb.DMatrix(X), output_margin=True)
+
+    import torch
+
+    from cnn_model import load_checkpoint
+
+    model, _, _ = load_checkpoint(model_path, "cpu")
+    model.eval()
+    if int8:
+        with torch.no_grad():
+            for layer in (model.conv1, model.conv2, model.fc1, model.fc2):
+                q, scale = _quantize(layer.weight.numpy())
+                layer.weight.copy_(torch.from_numpy(q.astype(np.float32) * np.float32(scale)))
+    with torch.inference_mode():
+        return model(torch.from_numpy(X).unsqueeze(1)).numpy()
+
+
+def check_parity(model_path, header_path, X, tolerance=1e-3, compiler="cc"):
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    with tempfile.TemporaryDirectory() as workdir:
+        binary = compile_runner(header_path, workdir, compiler)
+        start = time.perf_counter()
+        out = subprocess.run([binary], input=X.tobytes(), capture_output=True, check=True).stdout
+        host_seconds = time.perf_counter() - start
+    c_scores = np.frombuffer(out, dtype=np.float32).reshape(len(X), -1)
+    with open(header_path) as f:
+        int8 = "_w_scale" in f.read()
+    ref = np.asarray(reference_scores(model_path, X, int8), dtype=np.float32)
+    diff = np.abs(c_scores - ref)
+    scale = np.maximum(np.abs(ref), 1.0)
+    return {
+        "rows": len(X),
+        "label_agreement": float((c_scores.argmax(1) == ref.argmax(1)).mean()),
+        "bit_exact": bool((c_scores == ref).all()),
+        "max_abs_diff": float(diff.max()) if len(X) else 0.0,
+        "within_tolerance": bool((diff <= tolerance * scale).all()),
+        "host_us_per_row": host_seconds / max(len(X), 1) * 1e6,
+    }
+
+
+def load_rows(paths, limit):
+    from glove_loader import load_features
+    from cnn_model import TARGET_COLUMN
+
+    X, _, _ = load_features(paths, FEATURE_COLUMNS, TARGET_COLUMN)
+    if limit and len(X) > limit:
+        X = X[np.random.default_rng(0).choice(len(X), limit, replace=False)]
+    return X
+
+
+def export(model_path, header_path, int8=False, X_ref=None):
+    if model_path.endswith(".joblib"):
+        return export_trees(model_path, header_path, X_ref)
+    return export_cnn(model_path, header_path, int8)
+
+
+def print_estimate(info):
+    print(f"✅ Exported {info['kind']} model")
+    if "macs" in info:
+        print(f"   {info['macs']:,} multiply-accumulates per frame ({info['weights']} weights)")
+    else:
+        print(f"   {info['trees']} trees, {info['nodes']:,} nodes")
+    print(f"   ~{info['cycles']:,} cycles per frame (~{info['cycles'] / MCU_CLOCK_HZ * 1e6:.0f} µs at 240 MHz)")
+    print(f"   ~{info['flash_bytes'] / 1024:.1f} KB flash, {info['ram_bytes']:,} B working RAM")
+    if info["flash_bytes"] > 1024 * 1024:
+        print("⚠️ Larger than 1 MB: train a reduced CNN1D or use --int8 / fewer trees")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export glove classifiers to C for on-device inference")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="write the C header and print size/cycle estimates")
+    exp.add_argument("model", help="CNN checkpoint (.pt) or tree bundle (.joblib)")
+    exp.add_argument("header")
+    exp.add_argument("--int8", action="store_true", help="int8 CNN weights with per-tensor scales")
+
+    chk = sub.add_parser("check", help="compile the header on the host and compare against the Python model")
+    chk.add_argument("model")
+    chk.add_argument("header")
+    chk.add_argument("sessions", nargs="*", help="recorded sessions to test on (default: random frames)")
+    chk.add_argument("--rows", type=int, default=20000, help="max rows sampled from the sessions")
+    chk.add_argument("--tolerance", type=float, default=1e-3, help="relative score tolerance")
+    chk.add_argument("--cc", default="cc", help="host C compiler")
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        print_estimate(export(args.model, args.header, args.int8))
+        return
+
+    if not os.path.exists(args.header):
+        raise SystemExit(f"❌ {args.header} not found; run `export_to_c.py export {args.model} {args.header}` first")
+    if args.sessions:
+        X = load_rows(args.sessions, args.rows)
+    else:
+        X = (np.random.default_rng(0).random((args.rows, len(FEATURE_COLUMNS)), dtype=np.float32) * 200 - 100)
+    result = check_parity(args.model, args.header, X, args.tolerance, args.cc)
+    status = "✅" if result["within_tolerance"] and result["label_agreement"] == 1.0 else "⚠️"
+    print(f"{status} {result['rows']} rows: label agreement {result['label_agreement'] * 100:.2f}%, "
+          f"max |diff| {result['max_abs_diff']:.3g}, bit-exact {result['bit_exact']}, "
+          f"host {result['host_us_per_row']:.2f} µs/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Incremental model updates from newly recorded sessions.
+
+Instead of recombining every CSV and retraining from scratch, the last
+checkpoint is fine-tuned on the sessions it has not seen yet, mixed with a
+bounded replay buffer of older samples so earlier patients are not forgotten.
+Update time scales with the new data, not with the whole history.
+
+    # CNN: checkpoint written by "1D CNN.py"
+    python incremental_training.py cnn cnn1d_checkpoint.pt "Dataset Protocol 2/Filtered Data" --epochs 3
+
+    # Tree models: create once with --init, then add trees per update
+    python incremental_training.py tree rf_model.joblib SESSIONS... --kind rf --init
+    python incremental_training.py tree rf_model.joblib SESSIONS... --new-trees 25
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python Codes"))
+from glove_loader import list_sessions, load_features, load_labelled_features, session_fingerprint
+from cnn_model import FEATURE_COLUMNS, TARGET_COLUMN, ReplayBuffer
+
+DEFAULT_REPLAY_CAPACITY = 50000
+
+
+# --- Shared helpers ---
+def new_sessions(paths, seen):
+    """Expand folders and drop sessions whose fingerprint is already recorded in `seen`."""
+    files = []
+    for path in paths:
+        files.extend(list_sessions(path) if os.path.isdir(path) else [path])
+    return [f for f in files if seen.get(os.path.abspath(f)) != session_fingerprint(f)]
+
+
+def load_new_data(paths, class_names=None):
+    """Features and label codes of the new sessions, plus the class names.
+
+    With class_names=None the classes are taken from the sessions themselves.
+    """
+    if class_names is None:
+        X, y, class_names = load_features(paths, FEATURE_COLUMNS, TARGET_COLUMN)
+        labelled = y >= 0  # code -1 is a row without a label
+        dropped = int(len(y) - labelled.sum())
+        X, y = X[labelled], y[labelled]
+    else:
+        X, y, dropped = load_labelled_features(paths, FEATURE_COLUMNS, TARGET_COLUMN, class_names)
+    if dropped:
+        print(f"⚠️ Skipped {dropped} rows without a {TARGET_COLUMN} label")
+    return X, y, list(class_names)
+
+
+def check_all_classes(y, class_names):
+    """Tree ensembles are refitted on new + replay rows, which must contain every class."""
+    missing = [class_names[i] for i in sorted(set(range(len(class_names))) - set(np.unique(y).tolist()))]
+    if missing:
+        raise SystemExit(f"❌ No rows of class(es) {missing} in the new sessions or the replay buffer. "
+                         "Include sessions with these phases or raise --replay-ratio.")
+
+
+def mix_with_replay(X_new, y_new, replay, ratio):
+    """New rows plus ratio * len(new) rows sampled from the replay buffer, shuffled."""
+    X_old, y_old = replay.sample(int(len(X_new) * ratio))
+    X = np.concatenate([X_new, X_old])
+    y = np.concatenate([y_new, y_old])
+    order = np.random.permutation(len(X))
+    return X[order], y[order], len(X_old)
+
+
+# --- CNN ---
+def update_cnn(checkpoint_path, session_paths, epochs=3, lr=1e-4, replay_ratio=1.0, batch_size=128, output_path=None):
+    import torch
+    import torch.nn as nn
+    from torch.utils.data import DataLoader, TensorDataset
+
+    from cnn_model import load_checkpoint, save_checkpoint
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    model, optimizer, checkpoint = load_checkpoint(checkpoint_path, device, lr)
+    class_names = checkpoint['class_names']
+    seen = checkpoint.get('seen_sessions', {})
+
+    sessions = new_sessions(session_paths, seen)
+    if not sessions:
+        print("✅ No new sessions; model is up to date")
+        return
+    X_new, y_new, _ = load_new_data(sessions, class_names)
+
+    replay = (ReplayBuffer.from_state(checkpoint['replay']) if checkpoint.get('replay')
+              else ReplayBuffer(DEFAULT_REPLAY_CAPACITY))
+    X, y, n_replay = mix_with_replay(X_new, y_new, replay, replay_ratio)
+    loader = DataLoader(TensorDataset(torch.tensor(X).unsqueeze(1), torch.tensor(y)), batch_size=batch_size, shuffle=True)
+
+    criterion = nn.CrossEntropyLoss()
+    start = time.time()
+    model.train()
+    for epoch in range(epochs):
+        total_loss = 0.0
+        for xb, yb in loader:
+            xb, yb = xb.to(device), yb.to(device)
+            loss = criterion(model(xb), yb)
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(xb)
+        print(f"Epoch {epoch + 1}/{epochs}  loss {total_loss / len(X):.4f}")
+    elapsed = time.time() - start
+
+    replay.add(X_new, y_new)
+    for path in sessions:
+        seen[os.path.abspath(path)] = session_fingerprint(path)
+    history = checkpoint.get('history', []) + [{
+        'time': time.strftime("%Y-%m-%d %H:%M:%S"), 'sessions': sessions,
+        'new_rows': len(X_new), 'replay_rows': n_replay, 'epochs': epochs, 'seconds': round(elapsed, 2),
+    }]
+    save_checkpoint(output_path or checkpoint_path, model, optimizer, class_names, replay, seen, history)
+    print(f"✅ Updated on {len(sessions)} session(s): {len(X_new)} new + {n_replay} replay rows in {elapsed:.2f} s")
+
+
+# --- Random Forest / XGBoost ---
+def _new_tree_model(kind, n_estimators, num_classes):
+    if kind == 'rf':
+        from sklearn.ensemble import RandomForestClassifier
+
+        return RandomForestClassifier(n_estimators=n_estimators, n_jobs=-1, random_state=42, warm_start=True)
+    if kind == 'xgb':
+        from xgboost import XGBClassifier
+
+        return XGBClassifier(n_estimators=n_estimators, objective='multi:softprob', num_class=num_classes,
+                             tree_method='hist')
+    raise ValueError(f"Unknown tree model kind {kind!r}")
+
+
+def update_tree_model(model_path, session_paths, kind='rf', new_trees=25, replay_ratio=1.0, init=False,
+                      class_names=None):
+    """Create (init=True) or warm-start a tree ensemble bundle saved with joblib.
+
+    RF: `warm_start` grows `new_trees` extra trees fitted on new + replay rows.
+    XGBoost: continues boosting `new_trees` more rounds from the saved booster.
+    """
+    import joblib
+
+    if init:
+        seen = {}
+        sessions = new_sessions(session_paths, seen)
+    else:
+        bundle = joblib.load(model_path)
+        kind = bundle['kind']
+        seen = bundle['seen_sessions']
+        sessions = new_sessions(session_paths, seen)
+        class_names = bundle['class_names']
+    if not sessions:
+        print("✅ No new sessions; model is up to date")
+        return
+
+    # One read of the new sessions; on init without class names the classes come from the same pass
+    X_new, y_new, class_names = load_new_data(sessions, class_names)
+    if init:
+        bundle = {'kind': kind, 'model': None, 'class_names': class_names,
+                  'replay': None, 'seen_sessions': seen, 'history': []}
+    replay = (ReplayBuffer.from_state(bundle['replay']) if bundle['replay']
+              else ReplayBuffer(DEFAULT_REPLAY_CAPACITY))
+    X, y, n_replay = mix_with_replay(X_new, y_new, replay, replay_ratio)
+    check_all_classes(y, class_names)
+
+    start = time.time()
+    model = bundle['model']
+    if model is None:
+        model = _new_tree_model(kind, new_trees, len(class_names))
+        model.fit(X, y)
+    elif kind == 'rf':
+        model.n_estimators += new_trees
+        model.fit(X, y)  # warm_start: only the added trees are fitted
+    else:
+        model.set_params(n_estimators=new_trees)
+        model.fit(X, y, xgb_model=model.get_booster())
+    elapsed = time.time() - start
+
+    replay.add(X_new, y_new)
+    for path in sessions:
+        seen[os.path.abspath(path)] = session_fingerprint(path)
+    bundle.update(model=model, replay=replay.state_dict(), seen_sessions=seen)
+    bundle['history'].append({'time': time.strftime("%Y-%m-%d %H:%M:%S"), 'sessions': sessions,
+                              'new_rows': len(X_new), 'replay_rows': n_replay, 'seconds': round(elapsed, 2)})
+    joblib.dump(bundle, model_path)
+    print(f"✅ {kind.upper()} updated on {len(sessions)} session(s): {len(X_new)} new + {n_replay} replay rows in {elapsed:.2f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally update glove classifiers")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cnn = sub.add_parser("cnn", help="fine-tune the CNN1D checkpoint")
+    cnn.add_argument("checkpoint")
+    cnn.add_argument("sessions", nargs="+", help="session files or folders")
+    cnn.add_argument("--epochs", type=int, default=3)
+    cnn.add_argument("--lr", type=float, default=1e-4)
+    cnn.add_argument("--replay-ratio", type=float, default=1.0, help="replay rows per new row")
+    cnn.add_argument("--output", help="write the updated checkpoint here instead of in place")
+
+    tree = sub.add_parser("tree", help="warm-start a Random Forest / XGBoost model")
+    tree.add_argument("model")
+    tree.add_argument("sessions", nargs="+", help="session files or folders")
+    tree.add_argument("--kind", choices=["rf", "xgb"], default="rf")
+    tree.add_argument("--new-trees", type=int, default=25, help="trees (RF) or boosting rounds (XGB) to add")
+    tree.add_argument("--replay-ratio", type=float, default=1.0)
+    tree.add_argument("--init", action="store_true", help="create a new model from these sessions")
+
+    args = parser.parse_args(argv)
+    if args.command == "cnn":
+        update_cnn(args.checkpoint, args.sessions, args.epochs, args.lr, args.replay_ratio, output_path=args.output)
+    else:
+        update_tree_model(args.model, args.sessions, args.kind, args.new_trees, args.replay_ratio, args.init)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""Local micro-batching inference server for the grasp-phase classifier.
+
+The model (a CNN1D checkpoint from "1D CNN.py" / incremental_training.py, or
+a joblib tree bundle) is loaded once. Concurrent requests from several
+gloves or clients are queued and merged into one forward pass of up to
+--max-batch rows, waiting at most --max-wait-ms for the batch to fill.
+
+    python inference_server.py serve "C:/Mini Project/cnn1d_checkpoint.pt" --max-wait-ms 5
+
+    POST /predict   {"rows": [[Flex1_ADC, Flex1_Angle, ..., MPU2_Yaw], ...]}
+                 or {"frame": {"Flex1_ADC": 512, ...}}
+    -> {"labels": [...], "probabilities": [[...]], "queue_ms": .., "batch_size": .., "inference_ms": ..}
+    GET  /status    model, classes and batching counters
+
+    python inference_server.py bench --clients 8 --requests 200
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Python Codes"))
+# Same columns as cnn_model.FEATURE_COLUMNS; imported from here so tree bundles never load torch
+from glove_protocol import PROTOCOL2_SENSOR_COLUMNS as FEATURE_COLUMNS
+
+DEFAULT_PORT = 8766
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+# === Model loading ===
+def load_predictor(path, device="cpu"):
+    """Return (predict_proba(X float32 [n, features]) -> [n, classes], class_names, feature_columns)."""
+    if path.endswith(".joblib"):
+        import joblib
+
+        bundle = joblib.load(path)
+        model = bundle["model"]
+        class_names = bundle["class_names"]
+        columns = np.asarray(model.classes_, dtype=np.int64)  # classes never seen in training have no column
+
+        def predict_proba(X):
+            proba = np.zeros((len(X), len(class_names)), dtype=np.float32)
+            proba[:, columns] = model.predict_proba(X)
+            return proba
+
+        return predict_proba, class_names, FEATURE_COLUMNS
+
+    import torch
+
+    from cnn_model import load_checkpoint
+
+    model, _, checkpoint = load_checkpoint(path, device)
+    model.eval()
+
+    def predict_proba(X):
+        with torch.inference_mode():
+            logits = model(torch.from_numpy(X).unsqueeze(1).to(device))
+            return torch.softmax(logits, dim=1).cpu().numpy()
+
+    return predict_proba, checkpoint["class_names"], checkpoint.get("feature_columns", FEATURE_COLUMNS)
+
+
+# === Micro-batching ===
+class _Request:
+    __slots__ = ("rows", "enqueued", "done", "result", "error")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Merge concurrent predict() calls into batched model calls on one worker thread."""
+
+    def __init__(self, predict_proba, class_names, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.predict_proba = predict_proba
+        self.class_names = list(class_names)
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue()
+        self.stats = {"requests": 0, "rows": 0, "batches": 0, "inference_s": 0.0}
+        self._lock = threading.Lock()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def predict(self, rows, timeout=30):
+        """Blocking call from a request thread. rows: float32 array [n, features]."""
+        request = _Request(rows)
+        self.queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError("inference timed out")
+        if request.error:
+            raise request.error
+        return request.result
+
+    def _collect(self):
+        first = self.queue.get()
+        if first is None:
+            return []
+        batch, size = [first], len(first.rows)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._running = False
+                break
+            batch.append(request)
+            size += len(request.rows)
+        return batch
+
+    def _run(self):
+        while self._running:
+            batch = self._collect()
+            if not batch:
+                break
+            started = time.perf_counter()
+            try:
+                X = np.concatenate([r.rows for r in batch]) if len(batch) > 1 else batch[0].rows
+                probabilities = self.predict_proba(X)
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+            finished = time.perf_counter()
+            inference_ms = (finished - started) * 1000
+            offset = 0
+            for request in batch:
+                n = len(request.rows)
+                proba = probabilities[offset:offset + n]
+                offset += n
+                request.result = {
+                    "labels": [self.class_names[i] for i in proba.argmax(axis=1)],
+                    "probabilities": np.round(proba.astype(np.float64), 4).tolist(),
+                    "queue_ms": round((started - request.enqueued) * 1000, 3),
+                    "batch_size": len(X),
+                    "inference_ms": round(inference_ms, 3),
+                }
+                request.done.set()
+            with self._lock:
+                self.stats["requests"] += len(batch)
+                self.stats["rows"] += len(X)
+                self.stats["batches"] += 1
+                self.stats["inference_s"] += finished - started
+
+    def status(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["mean_batch_rows"] = round(stats["rows"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["inference_s"] = round(stats["inference_s"], 3)
+        stats.update(queued=self.queue.qsize(), max_batch=self.max_batch, max_wait_ms=self.max_wait * 1000)
+        return stats
+
+    def close(self):
+        self.queue.put(None)
+        self._thread.join(timeout=5)
+
+
+# === HTTP API ===
+def make_server(batcher, feature_columns, model_path, port=DEFAULT_PORT):
+    feature_columns = list(feature_columns)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, code, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/status":
+                self._reply(200, {"model": model_path, "classes": batcher.class_names,
+                                  "features": feature_columns, **batcher.status()})
+            else:
+                self._reply(404, {"error": f"Unknown endpoint {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._reply(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if "frame" in body:
+                    rows = [[body["frame"][c] for c in feature_columns]]
+                else:
+                    rows = body["rows"]
+                X = np.atleast_2d(np.asarray(rows, dtype=np.float32))
+                if X.ndim != 2 or X.shape[1] != len(feature_columns):
+                    raise ValueError(f"expected rows of {len(feature_columns)} features, got shape {X.shape}")
+            except (KeyError, ValueError, TypeError) as e:
+                self._reply(400, {"error": f"Bad request: {e}"})
+                return
+            try:
+                self._reply(200, batcher.predict(X))
+            except Exception as e:
+                self._reply(500, {"error": str(e)})
+
+        def log_message(self, *args):
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+def serve(model_path, port=DEFAULT_PORT, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+    predict_proba, class_names, feature_columns = load_predictor(model_path)
+    batcher = MicroBatcher(predict_proba, class_names, max_batch, max_wait_ms)
+    server = make_server(batcher, feature_columns, model_path, port)
+    print(f"🧠 Loaded {os.path.basename(model_path)} ({len(class_names)} classes)")
+    print(f"📡 Inference API at http://127.0.0.1:{port}/predict (max batch {max_batch}, max wait {max_wait_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🚪 Stopping inference server.")
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+class InferenceClient:
+    """Minimal client for the dashboard / GUI."""
+
+    def __init__(self, port=DEFAULT_PORT, timeout=5):
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.timeout = timeout
+
+    def _call(self, method, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(json.loads(e.read()).get("error", str(e))) from None
+
+    def predict(self, rows):
+        return self._call("POST", "/predict", {"rows": np.asarray(rows).tolist()})
+
+    def predict_frame(self, frame):
+        return self._call("POST", "/predict", {"frame": frame})
+
+    def status(self):
+        return self._call("GET", "/status")
+
+
+def bench(port=DEFAULT_PORT, clients=8, requests=200, rows=1):
+    """Fire `clients` concurrent request loops and print latency / throughput."""
+    client = InferenceClient(port)
+    features = len(client.status()["features"])
+    latencies, batch_sizes = [], []
+    lock = threading.Lock()
+
+    def worker():
+        X = np.random.rand(rows, features).astype(np.float32) * 100
+        c = InferenceClient(port)
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            result = c.predict(X)
+            with lock:
+                latencies.append((time.perf_counter() - t0) * 1000)
+                batch_sizes.append(result["batch_size"])
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    lat = np.array(latencies)
+    print(f"✅ {len(lat)} requests in {elapsed:.2f} s ({len(lat) / elapsed:.0f} req/s)")
+    print(f"   latency p50 {np.percentile(lat, 50):.2f} ms  p99 {np.percentile(lat, 99):.2f} ms")
+    print(f"   mean batch size {np.mean(batch_sizes):.1f} rows")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-batching inference server for the glove classifier")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("serve", help="load a model and serve predictions on localhost")
+    run.add_argument("model", help="CNN checkpoint (.pt) or tree bundle (.joblib)")
+    run.add_argument("--port", type=int, default=DEFAULT_PORT)
+    run.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="rows per model call")
+    run.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                     help="how long the first request waits for others to join its batch")
+
+    load = sub.add_parser("bench", help="load-test a running server")
+    load.add_argument("--port", type=int, default=DEFAULT_PORT)
+    load.add_argument("--clients", type=int, default=8)
+    load.add_argument("--requests", type=int, default=200, help="requests per client")
+    load.add_argument("--rows", type=int, default=1, help="rows per request")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.model, args.port, args.max_batch, args.max_wait_ms)
+    else:
+        bench(args.port, args.clients, args.requests, args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Lightweight profiler for the training / evaluation loops.
+
+Records, per epoch: wall time, time per stage (data loading, host->device
+transfer, forward, backward, optimizer step), samples/sec and peak memory.
+Optionally wraps the first batches in torch.profiler and writes a Chrome
+trace. The JSON report carries the git commit so runs can be compared:
+
+    profiler = TrainingProfiler(device, trace_path="trace.json")
+    for epoch in range(epochs):
+        with profiler.epoch("train", epoch):
+            for xb, yb in profiler.batches(train_loader):
+                with profiler.stage("forward"):
+                    ...
+    profiler.save("profile.json")
+
+    python training_profiler.py compare profile_old.json profile_new.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+STAGES = ["data", "transfer", "forward", "backward", "optimizer"]
+
+
+# === Memory ===
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None if it cannot be measured)."""
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        if hasattr(info, "peak_wset"):  # Windows keeps the peak itself
+            return info.peak_wset / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KB on Linux
+    except ImportError:
+        return None
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# === Profiler ===
+class TrainingProfiler:
+    """Collects per-epoch stage timings. With enabled=False every hook is a no-op."""
+
+    def __init__(self, device="cpu", enabled=True, trace_path=None, trace_steps=20):
+        self.device = str(device)
+        self.enabled = enabled
+        self.trace_path = trace_path if enabled else None
+        self.trace_steps = trace_steps
+        self.records = []
+        self._current = None
+        self._torch_profiler = None
+        self._cuda = self.device.startswith("cuda")
+
+    def _sync(self):
+        # CUDA kernels run asynchronously; wait so the time lands in the right stage
+        if self._cuda:
+            import torch
+
+            torch.cuda.synchronize()
+
+    @contextmanager
+    def stage(self, name):
+        if self._current is None:
+            yield
+            return
+        self._sync()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._sync()
+            stages = self._current["stages"]
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - start
+
+    def batches(self, loader):
+        """Iterate a DataLoader, timing each fetch as the "data" stage and counting samples."""
+        iterator = iter(loader)
+        while True:
+            with self.stage("data"):
+                try:
+                    batch = next(iterator)
+                except StopIteration:
+                    return
+            if self._current is not None:
+                self._current["samples"] += len(batch[0])
+                self._current["batches"] += 1
+            yield batch
+            if self._torch_profiler is not None:
+                self._torch_profiler.step()
+
+    @contextmanager
+    def epoch(self, phase, index):
+        if not self.enabled:
+            yield
+            return
+        self._current = {"phase": phase, "epoch": index, "samples": 0, "batches": 0, "stages": {}}
+        if self.trace_path and not self.records:
+            self._start_trace()
+        self._sync()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._sync()
+            record, self._current = self._current, None
+            record["seconds"] = time.perf_counter() - start
+            record["samples_per_sec"] = record["samples"] / record["seconds"] if record["seconds"] else 0.0
+            record["other_seconds"] = max(0.0, record["seconds"] - sum(record["stages"].values()))
+            record["peak_rss_mb"] = peak_rss_mb()
+            if self._cuda:
+                import torch
+
+                record["peak_cuda_mb"] = torch.cuda.max_memory_allocated() / 2 ** 20
+            self.records.append(record)
+            if self._torch_profiler is not None:
+                self._stop_trace()
+
+    def _start_trace(self):
+        from torch.profiler import ProfilerActivity, profile, schedule
+
+        activities = [ProfilerActivity.CPU] + ([ProfilerActivity.CUDA] if self._cuda else [])
+        path = self.trace_path
+
+        def on_trace_ready(prof):
+            prof.export_chrome_trace(path)
+
+        self._torch_profiler = profile(activities=activities, record_shapes=True, profile_memory=True,
+                                       schedule=schedule(wait=1, warmup=1, active=self.trace_steps, repeat=1),
+                                       on_trace_ready=on_trace_ready)
+        self._torch_profiler.__enter__()
+
+    def _stop_trace(self):
+        self._torch_profiler.__exit__(None, None, None)
+        self._torch_profiler = None
+
+    # --- Reports ---
+    def summary(self):
+        phases = {}
+        for r in self.records:
+            p = phases.setdefault(r["phase"], {"epochs": 0, "seconds": 0.0, "samples": 0, "stages": {}})
+            p["epochs"] += 1
+            p["seconds"] += r["seconds"]
+            p["samples"] += r["samples"]
+            for name, seconds in r["stages"].items():
+                p["stages"][name] = p["stages"].get(name, 0.0) + seconds
+        for p in phases.values():
+            p["samples_per_sec"] = p["samples"] / p["seconds"] if p["seconds"] else 0.0
+        return phases
+
+    def report(self, **extra):
+        import torch
+
+        return {
+            "commit": git_commit(),
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "device": self.device,
+            "threads": torch.get_num_threads(),
+            "peak_rss_mb": peak_rss_mb(),
+            "summary": self.summary(),
+            "epochs": self.records,
+            "trace": self.trace_path,
+            **extra,
+        }
+
+    def save(self, path, **extra):
+        if not self.enabled:
+            return
+        with open(path, "w") as f:
+            json.dump(self.report(**extra), f, indent=2)
+        print(f"⏱️ Profile written to {path}" + (f" (trace: {self.trace_path})" if self.trace_path else ""))
+
+    def print_summary(self):
+        for phase, p in self.summary().items():
+            stages = "  ".join(f"{k} {v:.2f}s" for k, v in sorted(p["stages"].items(), key=lambda kv: -kv[1]))
+            print(f"⏱️ {phase:5}: {p['seconds']:.2f} s, {p['samples_per_sec']:,.0f} samples/s  [{stages}]")
+
+
+# === Compare two runs ===
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'':24}{old.get('commit') or 'old':>12}{new.get('commit') or 'new':>12}{'change':>10}")
+
+    def row(label, a, b, unit=""):
+        if a is None or b is None:
+            return
+        change = f"{(b - a) / a * 100:+.1f}%" if a else ""
+        print(f"{label:24}{a:>11.2f}{unit}{b:>11.2f}{unit}{change:>10}")
+
+    for phase in sorted(set(old["summary"]) | set(new["summary"])):
+        a, b = old["summary"].get(phase), new["summary"].get(phase)
+        if not a or not b:
+            continue
+        row(f"{phase} seconds", a["seconds"], b["seconds"], "s")
+        row(f"{phase} samples/s", a["samples_per_sec"], b["samples_per_sec"], " ")
+        for stage in [s for s in STAGES if s in a["stages"] or s in b["stages"]]:
+            row(f"  {stage}", a["stages"].get(stage, 0.0), b["stages"].get(stage, 0.0), "s")
+    row("peak RSS MB", old.get("peak_rss_mb"), new.get("peak_rss_mb"), " ")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare training profiles")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmp = sub.add_parser("compare", help="print stage times and throughput of two profile JSON files")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    args = parser.parse_args(argv)
+    compare(args.old, args.new)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,47 @@
-import pandas as pd
+import argparse
+import json
 import os
+from glove_loader import iter_chunks, list_sessions, read_header, session_fingerprint
+from glove_paths import COMBINED_PREFIX, DATASET_DIR, PROJECT_DIR, sources_file
 
-# Define the folder where the CSV files are located
-folder_path = "C:\Mini Project\Dataset Protocol 2\Filtered Data"
+# Default folder where the CSV files are located, and the combined output
+folder_path = DATASET_DIR
+output_path = os.path.join(PROJECT_DIR, COMBINED_PREFIX + '.csv')
 
-# List all CSV files in the folder
-csv_files = [f for f in os.listdir(folder_path) if f.endswith('.csv')]
 
-# Initialize an empty list to store dataframes
-dfs = []
+def combine(folder_path, output_path):
+    # All sessions in the folder (.csv, .csv.gz, .glarc); never the output or an earlier combined file
+    session_files = [p for p in list_sessions(folder_path) if os.path.abspath(p) != os.path.abspath(output_path)]
 
-# Loop through each CSV file, read it and append it to the list
-for file in csv_files:
-    file_path = os.path.join(folder_path, file)
-    df = pd.read_csv(file_path)
-    dfs.append(df)
+    # Union of all headers, in first-seen order (same columns pd.concat would produce)
+    columns = []
+    for file_path in session_files:
+        for col in read_header(file_path):
+            if col not in columns:
+                columns.append(col)
 
-# Concatenate all dataframes into one
-combined_df = pd.concat(dfs, ignore_index=True)
+    # Stream each file chunk by chunk into the output, so memory stays bounded
+    with open(output_path, 'w', newline='') as out:
+        out.write(','.join(columns) + '\n')
+        for file_path in session_files:
+            for chunk in iter_chunks(file_path):
+                chunk.reindex(columns=columns).to_csv(out, header=False, index=False)
 
-# Save the combined dataframe to a new CSV file
-combined_df.to_csv('C:\Mini Project\combined_data.csv', index=False)
+    # Record which sessions went in, so training can mark them as already seen
+    sources = {os.path.abspath(p): session_fingerprint(p) for p in session_files}
+    with open(sources_file(output_path), 'w') as f:
+        json.dump(sources, f, indent=2)
 
-print("CSV files combined successfully!")
+    print(f"CSV files combined successfully! ({len(session_files)} files -> {output_path})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Combine every session CSV in a folder into one file")
+    parser.add_argument("folder", nargs="?", default=folder_path)
+    parser.add_argument("-o", "--output", default=output_path)
+    args = parser.parse_args(argv)
+    combine(args.folder, args.output)
+
+
+if __name__ == "__main__":
+    main()
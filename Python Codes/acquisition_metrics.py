@@ -0,0 +1,243 @@
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Default histogram buckets (upper bounds)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+DEPTH_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# A pyserial input buffer this full means the driver is about to drop bytes
+# (the Windows USB-serial driver buffer is 4096 bytes by default)
+OVERRUN_THRESHOLD = 3584
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def to_dict(self):
+        return {
+            "buckets": list(self.buckets) + ["+Inf"],
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class AcquisitionMetrics:
+    """Thread-safe counters, gauges and histograms for the acquisition pipeline.
+
+    Updates only touch in-memory dicts under a lock; serialisation happens
+    in the exporter thread so the reader thread never blocks on I/O.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def inc(self, name, label=None, amount=1):
+        key = name if label is None else f"{name}{{{label}}}"
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram(buckets)
+            hist.observe(value)
+
+    def timer(self, name, buckets=LATENCY_BUCKETS):
+        """Context manager that observes the elapsed seconds into `name`."""
+        return _Timer(self, name, buckets)
+
+    def record_parse_failure(self, exc):
+        self.inc("parse_failures", type(exc).__name__)
+
+    def check_serial_buffer(self, ser):
+        """Record the serial input backlog and count near-overruns."""
+        try:
+            waiting = ser.in_waiting
+        except Exception:
+            return
+        self.set_gauge("serial_in_waiting", waiting)
+        if waiting >= OVERRUN_THRESHOLD:
+            self.inc("serial_buffer_overruns")
+
+    def snapshot(self):
+        with self._lock:
+            uptime = time.time() - self.started
+            return {
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "uptime_seconds": round(uptime, 3),
+                "counters": dict(self.counters),
+                "rates_per_second": {k: v / uptime for k, v in self.counters.items()} if uptime > 0 else {},
+                "gauges": dict(self.gauges),
+                "histograms": {k: h.to_dict() for k, h in self.histograms.items()},
+            }
+
+    def to_prometheus(self):
+        """Render the snapshot in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines = []
+        for key, value in sorted(snap["counters"].items()):
+            name, _, label = key.partition("{")
+            label = f'{{type="{label[:-1]}"}}' if label else ""
+            lines.append(f"glove_{name}_total{label} {value}")
+        for name, value in sorted(snap["gauges"].items()):
+            lines.append(f"glove_{name} {value}")
+        for name, hist in sorted(snap["histograms"].items()):
+            cumulative = 0
+            for bound, count in zip(hist["buckets"], hist["counts"]):
+                cumulative += count
+                lines.append(f'glove_{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"glove_{name}_sum {hist['sum']}")
+            lines.append(f"glove_{name}_count {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+
+class _Timer:
+    def __init__(self, metrics, name, buckets):
+        self.metrics = metrics
+        self.name = name
+        self.buckets = buckets
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, self.buckets)
+        return False
+
+
+# === Exporter ===
+class MetricsExporter:
+    """Periodically dumps metrics to a JSON file and/or serves them over HTTP.
+
+    The HTTP endpoint listens on localhost only:
+        GET /metrics       -> Prometheus text format
+        GET /metrics.json  -> JSON snapshot
+    """
+
+    def __init__(self, metrics, file_path=None, http_port=None, interval=5.0):
+        self.metrics = metrics
+        self.file_path = file_path
+        self.http_port = http_port
+        self.interval = interval
+        self._stop = threading.Event()
+        self._server = None
+        self._write_lock = threading.Lock()  # stop() may run from the GUI and the reader thread at once
+
+    def start(self):
+        if self.file_path:
+            threading.Thread(target=self._file_loop, daemon=True).start()
+        if self.http_port:
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.http_port), self._make_handler())
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            print(f"📈 Metrics at http://127.0.0.1:{self.http_port}/metrics")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+        self.write_file()
+
+    def write_file(self):
+        if not self.file_path:
+            return
+        tmp_path = self.file_path + ".tmp"
+        with self._write_lock:
+            with open(tmp_path, "w") as f:
+                json.dump(self.metrics.snapshot(), f, indent=2)
+            os.replace(tmp_path, self.file_path)  # Readers never see a half-written file
+
+    def _file_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write_file()
+            except OSError as e:
+                print(f"⚠️ Could not write metrics: {e}")
+
+    def _make_handler(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics.json":
+                    body, content_type = json.dumps(metrics.snapshot()).encode(), "application/json"
+                elif self.path == "/metrics":
+                    body, content_type = metrics.to_prometheus().encode(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Keep the console quiet
+
+        return Handler
+
+
+# === Console echo ===
+class ConsoleEcho:
+    """Optional, rate-limited console echo of raw serial lines.
+
+    Printing every line is expensive in the reader thread, so at most
+    `max_per_second` lines are shown and the rest are only counted.
+    """
+
+    def __init__(self, enabled=False, max_per_second=5, stream=None):
+        self.enabled = enabled
+        self.min_interval = 1.0 / max_per_second if max_per_second else 0.0
+        self.stream = stream or sys.stdout
+        self._last = 0.0
+        self.suppressed = 0
+
+    def __call__(self, line):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._last < self.min_interval:
+            self.suppressed += 1
+            return
+        if self.suppressed:
+            line = f"{line}   (+{self.suppressed} lines not shown)"
+            self.suppressed = 0
+        self._last = now
+        print(line, file=self.stream)
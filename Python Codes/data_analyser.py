@@ -1,46 +1,65 @@
-import pandas as pd
+import argparse
+import os
 import matplotlib.pyplot as plt
+from glove_loader import load_session, read_header
+from glove_paths import DATASET_DIR
+from glove_protocol import column_dtype
 
 # === Configuration ===
-file_path = r"C:\Mini Project\Dataset Protocol 2\Filtered Data\Balaji-1.csv"  # Update if path is different
+file_path = os.path.join(DATASET_DIR, "Balaji-1.csv")  # Default session; pass another path on the command line
 
-# === Load & preprocess ===
-df = pd.read_csv(file_path)
+# Columns that are not plotted are never read (label columns are skipped too)
+columns_to_exclude = ['Flex1_ADC', 'Flex2_ADC', 'Flex3_ADC']
 
-# Convert Timestamp and set it as index
-df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-df.set_index('Timestamp', inplace=True)
 
-# Drop unwanted columns
-columns_to_exclude = ['Flex1_ADC', 'Flex2_ADC', 'Flex3_ADC']
-df.drop(columns=[col for col in columns_to_exclude if col in df.columns], inplace=True)
-
-# === Ensure Only Numeric Columns Are Processed ===
-# Convert all columns to numeric, forcing errors to NaN
-df = df.apply(pd.to_numeric, errors='coerce')
-
-# === Handle Duplicate Timestamps ===
-df = df[~df.index.duplicated(keep='first')]
-
-# Resample data for consistent time intervals (e.g., 1 second)
-df_resampled = df.resample('1S').mean()  # Mean of values at each second
-
-# === Plot Each Column Separately ===
-for col in df_resampled.select_dtypes(include='number').columns:
-    plt.figure(figsize=(10, 6))  # Create a new figure for each plot
-    plt.plot(df_resampled.index, df_resampled[col], label=col, marker='o', linestyle='-', linewidth=2)
-    
-    # Add titles and labels for each plot
-    plt.title(f"{col} Over Time", fontsize=14, weight='bold')
-    plt.xlabel("Time", fontsize=12)
-    plt.ylabel(f"{col} Sensor Reading", fontsize=12)
-    
-    # Add grid and legend
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.legend(loc='upper left', fontsize=9)
-    
-    # Adjust layout for better spacing
-    plt.tight_layout()
-    
-    # Show each individual plot
-    plt.show()
+def analyse(file_path, columns_to_exclude=columns_to_exclude, interval='1s'):
+    # === Load & preprocess ===
+    columns = [col for col in read_header(file_path)
+               if col not in columns_to_exclude and column_dtype(col) != 'category']
+    df = load_session(file_path, columns=columns, parse_times=True)
+
+    # Timestamp as index; sensor columns already arrive as int16/float32
+    df.set_index('Timestamp', inplace=True)
+
+    # === Ensure Only Numeric Columns Are Processed ===
+    df = df.select_dtypes(include='number')
+
+    # === Handle Duplicate Timestamps ===
+    df = df[~df.index.duplicated(keep='first')]
+
+    # Resample data for consistent time intervals (e.g., 1 second)
+    df_resampled = df.resample(interval).mean()  # Mean of values in each interval
+
+    # === Plot Each Column Separately ===
+    for col in df_resampled.select_dtypes(include='number').columns:
+        plt.figure(figsize=(10, 6))  # Create a new figure for each plot
+        plt.plot(df_resampled.index, df_resampled[col], label=col, marker='o', linestyle='-', linewidth=2)
+
+        # Add titles and labels for each plot
+        plt.title(f"{col} Over Time", fontsize=14, weight='bold')
+        plt.xlabel("Time", fontsize=12)
+        plt.ylabel(f"{col} Sensor Reading", fontsize=12)
+
+        # Add grid and legend
+        plt.grid(True, linestyle='--', alpha=0.6)
+        plt.legend(loc='upper left', fontsize=9)
+
+        # Adjust layout for better spacing
+        plt.tight_layout()
+
+        # Show each individual plot
+        plt.show()
+    return df_resampled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plot every sensor column of a session over time")
+    parser.add_argument("file", nargs="?", default=file_path)
+    parser.add_argument("--exclude", nargs="*", default=columns_to_exclude, help="columns not to plot")
+    parser.add_argument("--interval", default="1s", help="resampling interval (pandas offset, e.g. 1s, 100ms)")
+    args = parser.parse_args(argv)
+    analyse(args.file, args.exclude, args.interval)
+
+
+if __name__ == "__main__":
+    main()
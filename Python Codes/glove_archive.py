@@ -0,0 +1,400 @@
+"""Chunked, compressed session archive (.glarc) with a time/label index.
+
+A session is stored as row groups; every column of every row group is an
+independently compressed, typed block, so a reader only decompresses the
+columns and row groups it needs. The footer indexes each row group by its
+time range and by the label runs it contains.
+
+Layout:
+    MAGIC | row group blocks ... | footer (compressed JSON) | footer length (u64) | MAGIC
+
+    python glove_archive.py pack session.csv [-o session.glarc]
+    python glove_archive.py info session.glarc
+    python glove_archive.py extract session.glarc --label Phase=Holding -o holding.csv
+"""
+import argparse
+import json
+import os
+import re
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from glove_protocol import column_dtype
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; fall back to zlib from the standard library
+    zstandard = None
+
+MAGIC = b"GLOVARC1"
+ARCHIVE_EXT = ".glarc"
+DEFAULT_ROW_GROUP = 65536
+NAT = np.iinfo(np.int64).min
+_TIME_ONLY = re.compile(r"^\d{1,2}:\d{2}:\d{2}(?:\.(\d{1,6}))?$")
+
+
+# === Compression codecs ===
+def _compressor(codec, level):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress
+    return lambda data: zlib.compress(data, level)
+
+
+def _decompressor(codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This archive uses zstd; install it with: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress
+    return zlib.decompress
+
+
+def _time_format(text):
+    """{"format", "digits"} if `text` is a time of day without a date (Protocol 2 loggers), else None."""
+    match = _TIME_ONLY.match(str(text).strip())
+    if not match:
+        return None
+    digits = len(match.group(1) or "")
+    return {"format": "%H:%M:%S.%f" if digits else "%H:%M:%S", "digits": digits}
+
+
+def _format_times(ns, spec):
+    """Render nanoseconds since midnight back into the original time-of-day text."""
+    text = pd.DatetimeIndex(ns.view("datetime64[ns]")).strftime(spec["format"])
+    if spec["digits"]:
+        text = text.str[:spec["digits"] - 6]  # %f always renders 6 digits
+    return np.asarray(text, dtype=object)
+
+
+def _label_runs(codes):
+    """Run-length encode a code array into [code, start, end) triples."""
+    if len(codes) == 0:
+        return []
+    starts = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.concatenate((starts[1:], [len(codes)]))
+    return [[int(codes[s]), int(s), int(e)] for s, e in zip(starts, ends)]
+
+
+# === Writer ===
+class ArchiveWriter:
+    """Appends DataFrames to an archive, one row group at a time."""
+
+    def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP, codec=None, level=None):
+        self.path = path
+        self.row_group_size = row_group_size
+        self.codec = codec or ("zstd" if zstandard else "zlib")
+        self.level = level if level is not None else (9 if self.codec == "zstd" else 6)
+        self._compress = _compressor(self.codec, self.level)
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.schema = None  # {column: dtype string}
+        self.categories = {}  # {column: [values]} grows as new labels appear
+        self.time_formats = {}  # {column: {"format", "digits"}} for time-only timestamps
+        self.row_groups = []
+        self.num_rows = 0
+        self._pending = []
+        self._pending_rows = 0
+
+    def _init_schema(self, df):
+        self.schema = {}
+        for name in df.columns:
+            dtype = column_dtype(name)
+            if dtype is None:
+                dtype = str(df[name].dtype) if pd.api.types.is_numeric_dtype(df[name]) else "category"
+            self.schema[name] = dtype
+            if dtype == "category":
+                self.categories[name] = []
+            elif dtype.startswith("datetime64") and not pd.api.types.is_datetime64_any_dtype(df[name]):
+                first = df[name].dropna()
+                spec = _time_format(first.iloc[0]) if len(first) else None
+                if spec:
+                    self.time_formats[name] = spec
+
+    def write(self, df):
+        if self.schema is None:
+            self._init_schema(df)
+        self._pending.append(df)
+        self._pending_rows += len(df)
+        if self._pending_rows >= self.row_group_size:
+            data = pd.concat(self._pending, ignore_index=True)
+            full = len(data) - len(data) % self.row_group_size
+            for start in range(0, full, self.row_group_size):
+                self._write_row_group(data.iloc[start:start + self.row_group_size])
+            rest = data.iloc[full:]
+            self._pending = [rest] if len(rest) else []
+            self._pending_rows = len(rest)
+
+    def _encode(self, name, series):
+        """Return (raw bytes, meta) for one column of one row group."""
+        dtype = self.schema[name]
+        meta = {}
+        if dtype == "category":
+            known = self.categories[name]
+            lookup = {v: i for i, v in enumerate(known)}
+            present = series.notna()
+            values = series.astype(object).where(present, None)
+            for value in pd.unique(values[present].astype(str)):
+                if value not in lookup:
+                    lookup[value] = len(known)
+                    known.append(value)
+            # Missing labels are code -1, which Categorical.from_codes reads back as NaN
+            codes = values[present].astype(str).map(lookup).reindex(series.index, fill_value=-1).to_numpy(np.int32)
+            arr = codes.astype(np.int16 if len(known) < 2 ** 15 else np.int32)
+            meta["runs"] = _label_runs(codes)
+        elif dtype.startswith("datetime64"):
+            spec = self.time_formats.get(name)
+            if spec:
+                # Time of day only: store nanoseconds since midnight instead of inventing today's date
+                parsed = pd.to_datetime(series, format=spec["format"], errors="coerce")
+                ns = (parsed - pd.Timestamp("1900-01-01")).to_numpy("timedelta64[ns]").view(np.int64)
+            else:
+                ns = pd.to_datetime(series, errors="coerce").to_numpy("datetime64[ns]").view(np.int64)
+            valid = ns[ns != NAT]
+            if len(valid):
+                meta["t_min"], meta["t_max"] = int(valid.min()), int(valid.max())
+            if len(valid) == len(ns):
+                # Timestamps are monotone-ish, so deltas compress far better
+                arr = np.diff(ns, prepend=np.int64(0))
+                meta["delta"] = True
+            else:
+                arr = ns
+        else:
+            arr = pd.to_numeric(series, errors="coerce").to_numpy()
+            if np.dtype(dtype).kind in "iu" and np.isnan(arr.astype(np.float64)).any():
+                # Gaps (e.g. flex dropouts) cannot be int16: this row group keeps them as float32 NaN,
+                # the same fallback glove_loader uses for CSVs. meta["dtype"] tells the reader.
+                arr = arr.astype(np.float32)
+            else:
+                arr = arr.astype(dtype)
+        meta["dtype"] = arr.dtype.str
+        return np.ascontiguousarray(arr).tobytes(), meta
+
+    def _write_row_group(self, df):
+        group = {"rows": len(df), "first_row": self.num_rows, "columns": {}}
+        for name in self.schema:
+            raw, meta = self._encode(name, df[name])
+            block = self._compress(raw)
+            meta["offset"] = self.file.tell()
+            meta["length"] = len(block)
+            self.file.write(block)
+            group["columns"][name] = meta
+        self.row_groups.append(group)
+        self.num_rows += len(df)
+
+    def close(self):
+        if self._pending_rows:
+            self._write_row_group(pd.concat(self._pending, ignore_index=True))
+            self._pending = []
+        footer = {
+            "version": 1,
+            "codec": self.codec,
+            "schema": self.schema or {},
+            "categories": self.categories,
+            "time_formats": self.time_formats,
+            "num_rows": self.num_rows,
+            "row_groups": self.row_groups,
+        }
+        blob = zlib.compress(json.dumps(footer, separators=(",", ":")).encode())
+        self.file.write(blob)
+        self.file.write(struct.pack("<Q", len(blob)))
+        self.file.write(MAGIC)
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def pack_csv(csv_path, archive_path=None, row_group_size=DEFAULT_ROW_GROUP, chunksize=500_000):
+    """Convert a session CSV into an archive, streaming it in chunks."""
+    archive_path = archive_path or os.path.splitext(csv_path)[0] + ARCHIVE_EXT
+    with ArchiveWriter(archive_path, row_group_size) as writer:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            writer.write(chunk)
+    return archive_path
+
+
+# === Reader ===
+class ArchiveReader:
+    """Random-access reader: seek by time range or label without a full scan."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.file.seek(-(8 + len(MAGIC)), os.SEEK_END)
+        length = struct.unpack("<Q", self.file.read(8))[0]
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a glove archive")
+        self.file.seek(-(8 + len(MAGIC) + length), os.SEEK_END)
+        footer = json.loads(zlib.decompress(self.file.read(length)))
+        self.codec = footer["codec"]
+        self.schema = footer["schema"]
+        self.categories = footer["categories"]
+        self.time_formats = footer.get("time_formats", {})
+        self.num_rows = footer["num_rows"]
+        self.row_groups = footer["row_groups"]
+        self._decompress = _decompressor(self.codec)
+        self.bytes_read = 0
+
+    @property
+    def columns(self):
+        return list(self.schema)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _read_column(self, group, name):
+        meta = group["columns"][name]
+        self.file.seek(meta["offset"])
+        block = self.file.read(meta["length"])
+        self.bytes_read += len(block)
+        arr = np.frombuffer(self._decompress(block), dtype=np.dtype(meta["dtype"]))
+        dtype = self.schema[name]
+        if dtype == "category":
+            return pd.Categorical.from_codes(arr.astype(np.int32), categories=self.categories[name])
+        if dtype.startswith("datetime64"):
+            ns = np.cumsum(arr) if meta.get("delta") else arr
+            return ns.view("datetime64[ns]")
+        return arr
+
+    def _read_group(self, group, columns, rows=None):
+        data = {}
+        for name in columns:
+            values = self._read_column(group, name)
+            values = values[rows] if rows is not None else values
+            if name in self.time_formats:
+                values = _format_times(values, self.time_formats[name])
+            data[name] = values
+        return pd.DataFrame(data)
+
+    def _time_column(self):
+        for name, dtype in self.schema.items():
+            if dtype.startswith("datetime64"):
+                return name
+        raise ValueError("Archive has no timestamp column")
+
+    def read(self, columns=None):
+        """Read whole columns (all columns by default)."""
+        columns = columns or self.columns
+        frames = [self._read_group(g, columns) for g in self.row_groups]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def iter_row_groups(self, columns=None):
+        """Yield one DataFrame per row group."""
+        columns = columns or self.columns
+        for group in self.row_groups:
+            yield self._read_group(group, columns)
+
+    def _time_bound(self, time_col, value):
+        ts = pd.Timestamp(value)
+        if time_col in self.time_formats:  # stored as time of day; ignore any date part
+            return (ts - ts.normalize()).value
+        return ts.value
+
+    def read_time_range(self, start=None, end=None, columns=None):
+        """Rows with start <= Timestamp < end; only overlapping row groups are read."""
+        time_col = self._time_column()
+        lo = self._time_bound(time_col, start) if start is not None else NAT
+        hi = self._time_bound(time_col, end) if end is not None else np.iinfo(np.int64).max
+        columns = columns or self.columns
+        frames = []
+        for group in self.row_groups:
+            meta = group["columns"][time_col]
+            if "t_min" not in meta or meta["t_max"] < lo or meta["t_min"] >= hi:
+                continue
+            ts = self._read_column(group, time_col).view(np.int64)
+            rows = np.flatnonzero((ts >= lo) & (ts < hi))
+            if len(rows):
+                frames.append(self._read_group(group, columns, rows))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def label_runs(self, column):
+        """Yield (label, first_row, end_row) for every run of `column`, archive-wide (label None = missing)."""
+        names = self.categories[column]
+        for group in self.row_groups:
+            base = group["first_row"]
+            for code, start, end in group["columns"][column]["runs"]:
+                yield (names[code] if code >= 0 else None), base + start, base + end
+
+    def read_label(self, column, value, columns=None):
+        """Rows where `column == value`, decoded from the matching runs only."""
+        if value not in self.categories.get(column, []):
+            return pd.DataFrame(columns=columns or self.columns)
+        code = self.categories[column].index(value)
+        columns = columns or self.columns
+        frames = []
+        for group in self.row_groups:
+            runs = [(s, e) for c, s, e in group["columns"][column]["runs"] if c == code]
+            if not runs:
+                continue
+            rows = np.concatenate([np.arange(s, e) for s, e in runs])
+            frames.append(self._read_group(group, columns, rows))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+# === CLI ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Glove session archive tool")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pack = sub.add_parser("pack", help="convert CSV sessions to archives")
+    pack.add_argument("csv", nargs="+")
+    pack.add_argument("-o", "--output", help="output path (single input only)")
+    pack.add_argument("--row-group", type=int, default=DEFAULT_ROW_GROUP)
+
+    info = sub.add_parser("info", help="show archive layout")
+    info.add_argument("archive")
+
+    extract = sub.add_parser("extract", help="extract a slice to CSV")
+    extract.add_argument("archive")
+    extract.add_argument("--start", help="first timestamp (inclusive)")
+    extract.add_argument("--end", help="last timestamp (exclusive)")
+    extract.add_argument("--label", help="Column=value, e.g. Phase=Holding")
+    extract.add_argument("--columns", nargs="+")
+    extract.add_argument("-o", "--output", required=True)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        for csv_path in args.csv:
+            out = pack_csv(csv_path, args.output if len(args.csv) == 1 else None, args.row_group)
+            before, after = os.path.getsize(csv_path), os.path.getsize(out)
+            print(f"📦 {csv_path} -> {out} ({before / 1e6:.1f} MB -> {after / 1e6:.1f} MB, {before / max(after, 1):.1f}x)")
+
+    elif args.command == "info":
+        with ArchiveReader(args.archive) as reader:
+            print(f"Rows: {reader.num_rows}  Row groups: {len(reader.row_groups)}  Codec: {reader.codec}")
+            for name, dtype in reader.schema.items():
+                size = sum(g["columns"][name]["length"] for g in reader.row_groups)
+                print(f"  {name:20} {dtype:16} {size / 1e3:10.1f} kB")
+
+    elif args.command == "extract":
+        with ArchiveReader(args.archive) as reader:
+            if args.label:
+                if args.start or args.end:
+                    parser.error("--label cannot be combined with --start/--end")
+                column, _, value = args.label.partition("=")
+                df = reader.read_label(column, value, args.columns)
+            elif args.start or args.end:
+                df = reader.read_time_range(args.start, args.end, args.columns)
+            else:
+                df = reader.read(args.columns)
+            df.to_csv(args.output, index=False)
+            print(f"✅ {len(df)} rows written to {args.output} ({reader.bytes_read / 1e3:.1f} kB read)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Compact binary frame format for the glove serial link.
+
+The text firmware spends most of every cycle printing labels, emoji and
+degree signs (~300 bytes per Protocol 2 frame). A binary frame carries the
+same values in 47 bytes (Protocol 1: 71), so the same 115200 baud link fits
+~245 frames/s instead of a few dozen.
+
+Frame layout (little-endian, as sent by sketch_binary_frames.ino):
+
+    offset  size  field
+    0       2     sync word 0xA5 0x5A
+    2       1     protocol (1 or 2)
+    3       2     uint16 sequence number (wraps at 65536)
+    5       4     uint32 device time in ms (millis())
+    9       12    int16 Flex1_ADC, Flex1_Angle, Flex2_ADC, Flex2_Angle, Flex3_ADC, Flex3_Angle
+    21      4*n   float32 MPU values in PROTOCOLS[protocol]["sensors"] order (n = 6 or 12)
+    ...     2     CRC-16/CCITT-FALSE over bytes 2 .. end of payload
+
+BinaryFrameDecoder unpacks every complete frame of a read buffer at once
+with NumPy, resynchronises on the next sync word after corrupt bytes, and
+counts sequence gaps (frames lost on the link).
+
+    python glove_binary.py selftest --frames 200000 --corrupt 0.001 --drop 0.001
+"""
+import argparse
+import time
+
+import numpy as np
+
+from glove_protocol import FLEX_COLUMNS, PROTOCOLS
+
+SYNC = b"\xa5\x5a"
+CRC_SIZE = 2
+BAUD_BYTES_PER_BIT = 10  # 8N1: start + 8 data + stop bits
+
+
+def mpu_columns(protocol):
+    return [c for c in PROTOCOLS[protocol]["sensors"] if c not in FLEX_COLUMNS]
+
+
+def frame_dtype(protocol):
+    """Packed NumPy dtype of one frame, CRC included."""
+    fields = [("sync", "<u2"), ("protocol", "u1"), ("seq", "<u2"), ("t_ms", "<u4")]
+    fields += [(c, "<i2") for c in FLEX_COLUMNS]
+    fields += [(c, "<f4") for c in mpu_columns(protocol)]
+    fields += [("crc", "<u2")]
+    return np.dtype(fields)
+
+
+def frame_size(protocol):
+    return frame_dtype(protocol).itemsize
+
+
+# === CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) ===
+def _crc_table():
+    table = np.zeros(256, dtype=np.uint16)
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table[byte] = crc & 0xFFFF
+    return table
+
+
+CRC_TABLE = _crc_table()
+
+
+def crc16(data):
+    """CRC of one bytes object (reference implementation, matches the firmware)."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ int(CRC_TABLE[(crc >> 8) ^ byte])
+    return crc
+
+
+def crc16_rows(rows):
+    """CRC of every row of a (n, length) uint8 array, one table lookup per column."""
+    crc = np.full(len(rows), 0xFFFF, dtype=np.uint16)
+    for column in rows.T:
+        crc = (crc << 8) ^ CRC_TABLE[(crc >> 8) ^ column]
+    return crc
+
+
+# === Encoding (simulation and tests; the firmware does the same in C) ===
+def encode_frames(values, protocol="2", seq=None, t_ms=None):
+    """Encode an (n, sensors) array of sensor values into concatenated binary frames."""
+    values = np.asarray(values)
+    dtype = frame_dtype(protocol)
+    frames = np.zeros(len(values), dtype=dtype)
+    frames["sync"] = np.frombuffer(SYNC, dtype="<u2")[0]
+    frames["protocol"] = int(protocol)
+    frames["seq"] = np.arange(len(values)) % 65536 if seq is None else np.asarray(seq) % 65536
+    frames["t_ms"] = np.arange(len(values)) * 5 if t_ms is None else t_ms
+    for i, name in enumerate(PROTOCOLS[protocol]["sensors"]):
+        frames[name] = values[:, i]
+    raw = frames.view(np.uint8).reshape(len(values), dtype.itemsize)
+    frames["crc"] = crc16_rows(raw[:, 2:-CRC_SIZE])
+    return frames.tobytes()
+
+
+def simulate_stream(n, protocol="2", corrupt=0.0, drop=0.0, noise_bytes=0, seed=0):
+    """Byte stream of n frames with dropped frames, flipped bytes and leading noise.
+
+    Returns (stream bytes, sensor values of all n frames, mask of frames actually sent).
+    """
+    rng = np.random.default_rng(seed)
+    columns = PROTOCOLS[protocol]["sensors"]
+    values = np.empty((n, len(columns)), dtype=np.float64)
+    for i, name in enumerate(columns):
+        if name.endswith("_ADC"):
+            values[:, i] = rng.integers(3200, 4000, n)
+        elif name.endswith("_Angle") and name.startswith("Flex"):
+            values[:, i] = rng.choice([0, 15, 30, 45, 60, 75, 90], n)
+        else:
+            values[:, i] = np.round(np.cumsum(rng.normal(0, 0.5, n)), 2)
+    seq = np.arange(n)
+    sent = rng.random(n) >= drop
+    stream = np.frombuffer(encode_frames(values[sent], protocol, seq[sent], seq[sent] * 5), dtype=np.uint8).copy()
+    flips = rng.random(len(stream)) < corrupt
+    stream[flips] ^= rng.integers(1, 256, flips.sum()).astype(np.uint8)
+    noise = rng.integers(0, 256, noise_bytes).astype(np.uint8).tobytes()
+    return noise + stream.tobytes(), values, sent
+
+
+# === Decoding ===
+class BinaryFrameDecoder:
+    """Incremental decoder: feed() raw serial bytes, get every complete valid frame back.
+
+    Partial frames at the end of a buffer are kept for the next call. Bytes
+    that do not belong to a valid frame are skipped and counted; a frame
+    whose CRC fails is dropped and the search resumes at the next sync word.
+    """
+
+    def __init__(self, protocol="2"):
+        self.protocol = protocol
+        self.dtype = frame_dtype(protocol)
+        self.size = self.dtype.itemsize
+        self.columns = PROTOCOLS[protocol]["sensors"]
+        self._pending = b""
+        self._offsets = np.arange(self.size)
+        self.last_seq = None
+        self.stats = {"frames": 0, "crc_errors": 0, "bytes_skipped": 0, "lost_frames": 0}
+
+    def feed(self, data):
+        """Decode all complete frames in pending + data; returns a structured array."""
+        buf = np.frombuffer(self._pending + bytes(data), dtype=np.uint8)
+        n = len(buf)
+        starts = np.flatnonzero((buf[:-1] == SYNC[0]) & (buf[1:] == SYNC[1]))
+        starts = starts[starts + self.size <= n]
+
+        frames = np.empty(0, dtype=self.dtype)
+        end = 0
+        if len(starts):
+            rows = buf[starts[:, None] + self._offsets]
+            crc = rows[:, -2].astype(np.uint16) | (rows[:, -1].astype(np.uint16) << 8)
+            valid = (crc16_rows(rows[:, 2:-CRC_SIZE]) == crc) & (rows[:, 2] == int(self.protocol))
+            # A sync pattern inside an accepted frame's payload is data, not a new frame
+            good = starts[valid]
+            keep = np.diff(good, prepend=-self.size) >= self.size
+            accepted = good[keep]
+            self.stats["crc_errors"] += int(np.count_nonzero(~valid & ~self._covered(starts, accepted)))
+            if len(accepted):
+                frames = rows[valid][keep].copy().view(self.dtype).ravel()
+                end = int(accepted[-1]) + self.size
+                self.stats["bytes_skipped"] += int(end - len(accepted) * self.size)
+
+        # Anything that could still become a complete frame stays pending
+        tail = max(end, n - self.size + 1)
+        self.stats["bytes_skipped"] += tail - end
+        self._pending = buf[tail:].tobytes()
+        self._count(frames)
+        return frames
+
+    def _covered(self, positions, accepted):
+        """True for positions that fall inside an accepted frame."""
+        if not len(accepted):
+            return np.zeros(len(positions), dtype=bool)
+        i = np.searchsorted(accepted, positions, side="right") - 1
+        return (i >= 0) & (positions < accepted[np.maximum(i, 0)] + self.size)
+
+    def _count(self, frames):
+        if not len(frames):
+            return
+        seq = frames["seq"].astype(np.int64)
+        previous = np.concatenate(([self.last_seq], seq[:-1])) if self.last_seq is not None else seq[:-1]
+        current = seq if self.last_seq is not None else seq[1:]
+        self.stats["lost_frames"] += int(((current - previous - 1) % 65536).sum())
+        self.stats["frames"] += len(frames)
+        self.last_seq = int(seq[-1])
+
+    def values(self, frames):
+        """(n, sensors) float64 array in PROTOCOLS[protocol]["sensors"] order."""
+        return np.column_stack([frames[c] for c in self.columns]) if len(frames) else np.empty((0, len(self.columns)))
+
+
+def bytes_per_text_frame(protocol="2"):
+    """Size of one frame as printed by the text firmware (typical values)."""
+    flex = "🎛️ Flex1: ADC = 3456 | Angle: 15°\r\n"
+    rule = "-" * 48 + "\r\n"
+    if protocol == "2":
+        mpu = "🎯 MPU6050 at 0x68 | Pitch: -12.34 | Roll: 5.67 | Yaw: 123.45\r\n"
+    else:
+        mpu = ("🎯 MPU6050 at 0x68 | GyroX: -1.23 | GyroY: 4.56 | GyroZ: 0.12 | "
+               "AngleX: -12.34 | AngleY: 5.67 | AngleZ: 123.45\r\n")
+    return len((3 * flex + rule + 2 * mpu).encode("utf-8"))
+
+
+def selftest(frames=100_000, protocol="2", corrupt=0.0005, drop=0.001, chunk=4096, seed=0):
+    stream, values, sent = simulate_stream(frames, protocol, corrupt, drop, noise_bytes=37, seed=seed)
+    decoder = BinaryFrameDecoder(protocol)
+    start = time.perf_counter()
+    decoded = [decoder.feed(stream[i:i + chunk]) for i in range(0, len(stream), chunk)]
+    elapsed = time.perf_counter() - start
+    out = np.concatenate(decoded)
+
+    # Unwrap the 16-bit sequence numbers back to frame indices and compare with what was sent
+    seq = out["seq"].astype(np.int64)
+    index = seq[0] + np.concatenate(([0], np.cumsum((np.diff(seq) - 1) % 65536 + 1)))
+    wrong = int(np.count_nonzero(~np.isclose(decoder.values(out), values[index], atol=1e-3).all(axis=1)))
+    wrong += int(np.count_nonzero(~sent[index]))
+    span = index[-1] - index[0] + 1
+    lost = span - len(out)
+    dropped = int(np.count_nonzero(~sent[index[0]:index[-1] + 1]))
+
+    size = decoder.size
+    text = bytes_per_text_frame(protocol)
+    print(f"✅ Decoded {len(out):,}/{frames:,} frames from {len(stream) / 1e6:.2f} MB "
+          f"in {elapsed:.3f} s ({len(stream) / elapsed / 1e6:.1f} MB/s)")
+    print(f"   Lost frames counted {decoder.stats['lost_frames']} (actual {lost}: {dropped} dropped, "
+          f"{lost - dropped} corrupted), CRC errors {decoder.stats['crc_errors']}, "
+          f"bytes skipped {decoder.stats['bytes_skipped']}, wrong values {wrong}")
+    print(f"   Frame size {size} B vs ~{text} B as text: at 115200 baud "
+          f"{115200 / BAUD_BYTES_PER_BIT / size:.0f} frames/s binary vs {115200 / BAUD_BYTES_PER_BIT / text:.0f} frames/s text")
+    if wrong or decoder.stats["lost_frames"] != lost:
+        raise SystemExit("❌ Self-test failed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Binary glove frame codec")
+    sub = parser.add_subparsers(dest="command", required=True)
+    test = sub.add_parser("selftest", help="decode a simulated, corrupted byte stream")
+    test.add_argument("--frames", type=int, default=100_000)
+    test.add_argument("--protocol", choices=sorted(PROTOCOLS), default="2")
+    test.add_argument("--corrupt", type=float, default=0.0005, help="probability of a flipped byte")
+    test.add_argument("--drop", type=float, default=0.001, help="probability of a dropped frame")
+    test.add_argument("--chunk", type=int, default=4096, help="bytes per simulated serial read")
+    test.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    selftest(args.frames, args.protocol, args.corrupt, args.drop, args.chunk, args.seed)
+
+
+if __name__ == "__main__":
+    main()
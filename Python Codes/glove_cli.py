@@ -0,0 +1,234 @@
+"""One command-line entry point for logging, data preparation, training and serving.
+
+    python glove_cli.py log --protocol 2 --start          (glove_logger_service.py run)
+    python glove_cli.py combine FOLDER -o combined.csv     (Dataset_Combiner.py)
+    python glove_cli.py analyse session.csv                (data_analyser.py)
+    python glove_cli.py train combined.csv --epochs 20     ("1D CNN.py")
+    python glove_cli.py evaluate cnn1d_checkpoint.pt FOLDER
+    python glove_cli.py serve cnn1d_checkpoint.pt          (inference_server.py serve)
+    python glove_cli.py sessions [FOLDER]
+    python glove_cli.py port-check [--port COM9]
+    python glove_cli.py import-times
+
+Only the standard library is imported at start-up. A subcommand imports its
+module (and with it pandas, torch, ...) when it runs and hands the remaining
+arguments to that module's own parser, so `glove_cli.py train --help` shows
+the training options. Default paths come from glove_paths.py.
+"""
+import argparse
+import gzip
+import importlib
+import importlib.util
+import json
+import os
+import socket
+import struct
+import subprocess
+import sys
+import time
+import zlib
+
+import glove_paths
+from glove_protocol import detect_protocol
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ML_DIR = os.path.normpath(os.path.join(HERE, "..", "Machine Learning Codes"))
+
+# name: (help, folder, module or script, arguments put in front, imports the module only does once it runs)
+COMMANDS = {
+    "log": ("record sessions with the headless logger service", HERE, "glove_logger_service", ["run"], ["serial"]),
+    "combine": ("combine session CSVs into one file", HERE, "Dataset_Combiner", [], []),
+    "analyse": ("plot the sensor columns of a session", HERE, "data_analyser", [], []),
+    "train": ("train the 1D CNN and save a checkpoint", ML_DIR, "1D CNN.py", [],
+              ["numpy", "pandas", "torch", "matplotlib.pyplot", "seaborn", "sklearn.model_selection",
+               "glove_loader", "cnn_model", "training_profiler", "eval_metrics"]),
+    "evaluate": ("evaluate a checkpoint on recorded sessions", ML_DIR, "eval_metrics", [],
+                 ["torch", "cnn_model", "glove_loader", "incremental_training"]),
+    "serve": ("serve a model over HTTP with micro-batching", ML_DIR, "inference_server", ["serve"], []),
+}
+# Quick commands run inside this file; these are all they import
+BUILTIN_IMPORTS = {
+    "sessions": [],
+    "port-check": ["serial.tools.list_ports"],
+}
+
+
+# === Lazy subcommands ===
+def _load_module(name):
+    _, folder, module, _, _ = COMMANDS[name]
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    if module.endswith(".py"):  # scripts whose file name is not a valid module name
+        spec = importlib.util.spec_from_file_location(name.replace("-", "_") + "_command",
+                                                      os.path.join(folder, module))
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return mod
+    return importlib.import_module(module)
+
+
+def import_command(name):
+    """Import everything a subcommand needs before it can start working."""
+    if name in BUILTIN_IMPORTS:
+        for module in BUILTIN_IMPORTS[name]:
+            importlib.import_module(module)
+        return
+    _load_module(name)
+    for module in COMMANDS[name][4]:
+        importlib.import_module(module)
+
+
+def run_command(name, argv):
+    return _load_module(name).main(COMMANDS[name][3] + list(argv))
+
+
+# === sessions ===
+def _archive_footer(path):
+    # Same trailer as glove_archive.ArchiveReader, read without importing numpy / pandas
+    with open(path, "rb") as f:
+        f.seek(-16, os.SEEK_END)
+        length = struct.unpack("<Q", f.read(8))[0]
+        if f.read(8) != b"GLOVARC1":
+            raise ValueError("not a glove archive")
+        f.seek(-(16 + length), os.SEEK_END)
+        return json.loads(zlib.decompress(f.read(length)))
+
+
+def session_info(path):
+    """Name, format, size, rows (archives only) and protocol of one session file."""
+    fmt = "csv.gz" if path.endswith(".csv.gz") else path.rsplit(".", 1)[-1]
+    info = {"name": os.path.basename(path), "format": fmt,
+            "mb": os.path.getsize(path) / 2 ** 20, "rows": None, "protocol": None}
+    try:
+        if path.endswith(".glarc"):
+            footer = _archive_footer(path)
+            columns, info["rows"] = list(footer["schema"]), footer["num_rows"]
+        else:
+            with (gzip.open(path, "rt", newline="") if fmt == "csv.gz" else open(path, newline="")) as f:
+                columns = f.readline().strip().split(",")
+        info["protocol"] = detect_protocol(columns)
+    except (OSError, ValueError, KeyError, UnicodeDecodeError) as e:
+        info["error"] = str(e)
+    return info
+
+
+def list_sessions(folder):
+    # Same files glove_loader.list_sessions would pick, without importing pandas
+    paths = sorted(os.path.join(folder, n) for n in os.listdir(folder) if n.endswith((".csv", ".csv.gz", ".glarc")))
+    paths = [p for p in paths if not glove_paths.is_combined(p)]
+    sessions = [session_info(p) for p in paths]
+    if not sessions:
+        print(f"No sessions in {folder}")
+        return sessions
+    print(f"{'Session':40}{'Format':>8}{'MB':>10}{'Rows':>12}{'Protocol':>10}")
+    for s in sessions:
+        rows = f"{s['rows']:,}" if s["rows"] is not None else "-"
+        protocol = s.get("error") and "⚠️ " + s["error"] or s["protocol"] or "?"
+        print(f"{s['name']:40}{s['format']:>8}{s['mb']:>10.1f}{rows:>12}{protocol:>10}")
+    total = sum(s["mb"] for s in sessions)
+    print(f"📦 {len(sessions)} sessions, {total:.1f} MB in {folder}")
+    return sessions
+
+
+# === port-check ===
+def _tcp_listening(port, host="127.0.0.1"):
+    try:
+        with socket.create_connection((host, port), timeout=0.3):
+            return True
+    except OSError:
+        return False
+
+
+def port_check(port, baud, control_port, inference_port):
+    """Report serial ports and whether the logger / inference servers are running."""
+    try:
+        import serial
+        from serial.tools import list_ports
+    except ImportError:
+        print("❌ pyserial is not installed (pip install pyserial)")
+        return False
+    available = [p.device for p in list_ports.comports()]
+    print(f"📡 Serial ports: {', '.join(available) or 'none found'}")
+    ok = True
+    try:
+        serial.serial_for_url(port, baud, timeout=0).close()
+        print(f"✅ {port} opens at {baud} baud")
+    except serial.SerialException as e:
+        ok = False
+        print(f"❌ {port}: {e}")
+    for label, tcp_port in [("logger service", control_port), ("inference server", inference_port)]:
+        state = "running" if _tcp_listening(tcp_port) else "not running"
+        print(f"   {label} on port {tcp_port}: {state}")
+    return ok
+
+
+# === import-times ===
+def import_times(names, repeat=3):
+    """Import cost of each subcommand, measured in a fresh interpreter (best of `repeat`)."""
+    code = ("import sys, time; sys.path.insert(0, {here!r}); start = time.perf_counter(); "
+            "import glove_cli; glove_cli.import_command({name!r}); print(time.perf_counter() - start)")
+
+    def best(args):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            out = subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=HERE)
+            if out.returncode != 0:
+                return time.perf_counter() - start, out.stderr.strip().splitlines()[-1]
+            times.append((time.perf_counter() - start, out.stdout.strip()))
+        return min(times)
+
+    startup, _ = best(["-c", "pass"])
+    print(f"⏱️ Python start-up: {startup * 1000:.0f} ms")
+    print(f"{'Command':12}{'imports ms':>12}{'total ms':>10}")
+    results = {}
+    for name in names:
+        total, imports = best(["-c", code.format(here=HERE, name=name)])
+        try:
+            results[name] = float(imports)
+            print(f"{name:12}{results[name] * 1000:>12.0f}{total * 1000:>10.0f}")
+        except ValueError:
+            print(f"{name:12}{'-':>12}{total * 1000:>10.0f}  ⚠️ {imports}")
+    return results
+
+
+# === CLI ===
+def build_parser():
+    parser = argparse.ArgumentParser(prog="glove_cli.py", description="Glove-net command line",
+                                     epilog="Options after a delegated command go to its own parser "
+                                            "(e.g. glove_cli.py train --help).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (help_text, *_) in COMMANDS.items():
+        sub.add_parser(name, help=help_text, add_help=False)
+
+    sessions = sub.add_parser("sessions", help="list session files with size and protocol (no pandas)")
+    sessions.add_argument("folder", nargs="?", default=glove_paths.DATASET_DIR)
+
+    check = sub.add_parser("port-check", help="check the serial port and local servers")
+    check.add_argument("--port", default=glove_paths.SERIAL_PORT)
+    check.add_argument("--baud", type=int, default=glove_paths.BAUD_RATE)
+    check.add_argument("--control-port", type=int, default=8765, help="glove_logger_service control port")
+    check.add_argument("--inference-port", type=int, default=8766, help="inference_server port")
+
+    times = sub.add_parser("import-times", help="measure the import cost of each subcommand")
+    times.add_argument("names", nargs="*", help="subcommands to measure (default: all)")
+    times.add_argument("--repeat", type=int, default=3)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in COMMANDS:
+        return run_command(argv[0], argv[1:])
+    args = build_parser().parse_args(argv)
+    if args.command == "sessions":
+        list_sessions(args.folder)
+    elif args.command == "port-check":
+        if not port_check(args.port, args.baud, args.control_port, args.inference_port):
+            sys.exit(1)
+    elif args.command == "import-times":
+        import_times(args.names or [*COMMANDS, *BUILTIN_IMPORTS], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
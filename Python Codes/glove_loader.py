@@ -0,0 +1,183 @@
+"""Memory-lean, typed loading of glove sessions.
+
+Knows the column layouts of both protocols, reads only the requested
+columns and parses them straight into compact dtypes (int16 flex channels,
+float32 MPU values, categorical labels) instead of float64/object.
+Works on CSV sessions and on .glarc archives.
+
+    from glove_loader import load_session, iter_sessions, load_features
+    df = load_session("Balaji-1.csv", columns=["Timestamp", "MPU1_Pitch", "Phase"])
+    X, y, classes = load_features("combined_data-1.csv", FEATURE_COLUMNS, "Phase")
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from glove_paths import is_combined, sources_file
+from glove_protocol import PROTOCOLS, column_dtype
+
+ARCHIVE_EXT = ".glarc"
+SESSION_EXTS = (".csv", ".csv.gz", ARCHIVE_EXT)  # pandas reads .csv.gz transparently
+
+
+def read_header(path):
+    if path.endswith(ARCHIVE_EXT):
+        from glove_archive import ArchiveReader
+
+        with ArchiveReader(path) as reader:
+            return reader.columns
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def schema_for(columns):
+    """Map each column to its compact dtype; unknown columns are left to pandas."""
+    dtypes = {}
+    for name in columns:
+        dtype = column_dtype(name)
+        if dtype and not dtype.startswith("datetime64"):
+            dtypes[name] = dtype
+    return dtypes
+
+
+def _select(path, columns):
+    header = read_header(path)
+    if columns is None:
+        return header
+    missing = [c for c in columns if c not in header]
+    if missing:
+        raise KeyError(f"{os.path.basename(path)} has no column(s) {', '.join(missing)}")
+    return list(columns)
+
+
+def _finish(df, parse_times):
+    if parse_times and "Timestamp" in df and not pd.api.types.is_datetime64_any_dtype(df["Timestamp"]):
+        df["Timestamp"] = pd.to_datetime(df["Timestamp"], errors="coerce")
+    return df
+
+
+def iter_chunks(path, columns=None, chunksize=250_000, parse_times=False):
+    """Yield typed DataFrame chunks of one session."""
+    columns = _select(path, columns)
+    if path.endswith(ARCHIVE_EXT):
+        from glove_archive import ArchiveReader
+
+        with ArchiveReader(path) as reader:
+            for chunk in reader.iter_row_groups(columns):
+                yield _finish(chunk, parse_times)
+        return
+
+    dtypes = schema_for(columns)
+    done = 0
+    try:
+        for chunk in pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunksize):
+            done += len(chunk)
+            yield _finish(chunk[columns], parse_times)
+    except ValueError:
+        # Gaps in an integer column (int16 cannot hold NaN): continue with float32 for those
+        dtypes = {k: ("float32" if v == "int16" else v) for k, v in dtypes.items()}
+        for chunk in pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunksize,
+                                 skiprows=range(1, done + 1)):
+            yield _finish(chunk[columns], parse_times)
+
+
+def load_session(path, columns=None, parse_times=False, chunksize=250_000):
+    """Load one session (CSV or archive) with compact dtypes."""
+    chunks = list(iter_chunks(path, columns, chunksize, parse_times))
+    if len(chunks) == 1:
+        return chunks[0]
+    df = pd.concat(chunks, ignore_index=True)
+    # concat of chunks with different category sets falls back to object; restore
+    for name, dtype in schema_for(df.columns).items():
+        if dtype == "category" and df[name].dtype != "category":
+            df[name] = df[name].astype("category")
+    return df
+
+
+def list_sessions(folder):
+    """Session files in a folder; combined training files (see glove_paths.is_combined) are skipped."""
+    paths = (os.path.join(folder, n) for n in os.listdir(folder) if n.endswith(SESSION_EXTS))
+    return sorted(p for p in paths if not is_combined(p))
+
+
+def csv_output_name(name):
+    """File name a processing stage writes for a session: .csv / .csv.gz keep theirs, archives become .csv."""
+    return name[:-len(ARCHIVE_EXT)] + ".csv" if name.endswith(ARCHIVE_EXT) else name
+
+
+def iter_sessions(folder, columns=None, parse_times=False):
+    """Yield (path, DataFrame) for every session in a folder."""
+    for path in list_sessions(folder):
+        yield path, load_session(path, columns, parse_times)
+
+
+def load_features(paths, feature_columns, target_column, chunksize=250_000):
+    """Load a float32 feature matrix and integer label codes.
+
+    Only the feature and target columns are read. Each chunk is converted to
+    float32 as it arrives, so peak memory stays close to the final arrays.
+    Returns (X, y, classes) where classes[y[i]] is the label of row i and
+    classes are sorted, matching `Series.astype("category")`. Rows without a
+    label get y = -1.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    columns = list(feature_columns) + [target_column]
+    blocks, chunk_codes, chunk_names = [], [], []
+    for path in paths:
+        for chunk in iter_chunks(path, columns, chunksize):
+            blocks.append(chunk[feature_columns].to_numpy(np.float32))
+            # Per-chunk codes; an all-NaN chunk has no categories at all, so names are kept as str
+            target = chunk[target_column].astype("category")
+            chunk_codes.append(target.cat.codes.to_numpy())
+            chunk_names.append([str(c) for c in target.cat.categories])
+    X = np.concatenate(blocks) if blocks else np.empty((0, len(feature_columns)), np.float32)
+    classes = sorted(set().union(*chunk_names))
+    index = {name: i for i, name in enumerate(classes)}
+    # Map each chunk's local codes to the global order; the trailing -1 keeps missing labels at -1
+    y = [np.array([index[n] for n in names] + [-1], dtype=np.int64)[codes]
+         for codes, names in zip(chunk_codes, chunk_names)]
+    y = np.concatenate(y) if y else np.empty(0, np.int64)
+    return X, y, classes
+
+
+def encode_labels(labels, class_names):
+    """Map label codes from load_features onto a fixed class order (e.g. a saved model's)."""
+    lookup = {name: i for i, name in enumerate(class_names)}
+    unknown = sorted(set(labels) - set(lookup))
+    if unknown:
+        raise ValueError(f"New label(s) {unknown} are not in the model ({class_names}); retrain from scratch")
+    return np.array([lookup[name] for name in labels], dtype=np.int64)
+
+
+def load_labelled_features(paths, feature_columns, target_column, class_names):
+    """load_features with labels in `class_names` order; unlabelled (NaN) rows are dropped.
+
+    Returns (X, y, dropped).
+    """
+    X, codes, names = load_features(paths, feature_columns, target_column)
+    labelled = codes >= 0  # code -1 is a missing label; indexing with it would pick the last class
+    dropped = int(len(codes) - labelled.sum())
+    if dropped:
+        X, codes = X[labelled], codes[labelled]
+    return X, encode_labels(names, class_names)[codes], dropped
+
+
+def protocol_columns(protocol, labels=True):
+    spec = PROTOCOLS[protocol]
+    return spec["sensors"] + (spec["labels"] if labels else [])
+
+
+def session_fingerprint(path):
+    """Cheap identity of a session file: [size, mtime_ns]. Changes when the file is rewritten."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def combined_sources(path):
+    """{session path: fingerprint} recorded by Dataset_Combiner for a combined file ({} if unknown)."""
+    if not os.path.exists(sources_file(path)):
+        return {}
+    with open(sources_file(path)) as f:
+        return json.load(f)
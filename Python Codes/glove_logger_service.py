@@ -0,0 +1,522 @@
+"""Headless glove acquisition service.
+
+Runs the serial reader without any GUI and exposes a small JSON control API
+on localhost, so sessions can be recorded on headless lab machines and the
+Tk logger (logger_gui.py) is just another client.
+
+    python glove_logger_service.py run --port COM9 --protocol 2 --start
+    python glove_logger_service.py ctl relabel Phase=Holding Object=Bottle
+    python glove_logger_service.py ctl pause | resume | start | stop | status | shutdown
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from acquisition_metrics import DEPTH_BUCKETS, AcquisitionMetrics, ConsoleEcho, MetricsExporter
+from glove_paths import BAUD_RATE, OUTPUT_DIR, SERIAL_PORT
+from glove_protocol import PROTOCOLS, SerialLineParser
+
+DEFAULT_OUTPUT_DIR = OUTPUT_DIR
+DEFAULT_CONTROL_PORT = 8765
+
+
+# === Output rotation ===
+class RotatingCSVWriter:
+    """CSV writer that starts a new segment after `max_bytes` or `max_seconds`.
+
+    Closed segments are handed to `on_close(path)` (e.g. the compressor).
+    """
+
+    def __init__(self, output_dir, prefix, header, max_bytes=None, max_seconds=None, on_close=None):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.header = header
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.on_close = on_close
+        self.segment = 0
+        self.file = None
+        self.writer = None
+        self.path = None
+        self.opened_at = None
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _open(self):
+        self.segment += 1
+        self.path = os.path.join(self.output_dir, f"{self.prefix}_{self.segment:04d}.csv")
+        self.file = open(self.path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.header)
+        self.opened_at = time.monotonic()
+
+    def _due(self):
+        if self.max_seconds and time.monotonic() - self.opened_at >= self.max_seconds:
+            return True
+        return bool(self.max_bytes) and self.file.tell() >= self.max_bytes
+
+    def write_rows(self, rows):
+        if self.file is None:
+            self._open()
+        elif self._due():
+            self.rotate()
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def rotate(self):
+        self.close()
+        self._open()
+
+    def close(self):
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        if self.on_close:
+            self.on_close(self.path)
+
+
+class CompressionWorker:
+    """Gzips closed segments in a background thread, off the acquisition path."""
+
+    def __init__(self, metrics=None, keep_original=False):
+        self.metrics = metrics
+        self.keep_original = keep_original
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, path):
+        self.jobs.put(path)
+
+    def close(self):
+        """Finish all pending jobs."""
+        self.jobs.put(None)
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            path = self.jobs.get()
+            if path is None:
+                return
+            start = time.perf_counter()
+            try:
+                with open(path, "rb") as src, gzip.open(path + ".gz", "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                if not self.keep_original:
+                    os.remove(path)
+            except OSError as e:
+                print(f"⚠️ Could not compress {path}: {e}")
+                continue
+            if self.metrics:
+                self.metrics.inc("segments_compressed")
+                self.metrics.observe("compress_seconds", time.perf_counter() - start)
+
+
+# === Acquisition service ===
+class LoggerService:
+    """Owns the serial port, the reader/writer threads and the session state."""
+
+    def __init__(self, port, baud_rate=115200, protocol="2", output_dir=DEFAULT_OUTPUT_DIR,
+                 label_columns=None, rotate_bytes=None, rotate_seconds=None, compress=True,
+                 echo_lines=False, metrics_port=None, fuse_to_p2=False, binary=False):
+        if fuse_to_p2 and protocol != "1":
+            raise ValueError("fuse_to_p2 only applies to Protocol 1 input")
+        self.port = port
+        self.baud_rate = baud_rate
+        self.protocol = protocol
+        self.output_dir = output_dir
+        self.label_columns = label_columns or PROTOCOLS[protocol]["labels"]
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.fuse_to_p2 = fuse_to_p2
+        self.binary = binary  # frames from sketch_binary_frames.ino instead of text lines
+        self.output_protocol = "2" if fuse_to_p2 else protocol
+        # Protocol 1 sessions keep the legacy logger's Upload_Timestamp (host time, HH:MM:SS)
+        self.time_columns = ["Timestamp", "Upload_Timestamp"] if self.output_protocol == "1" else ["Timestamp"]
+        self.labels = dict.fromkeys(self.label_columns, "")
+
+        self.state = "idle"  # idle -> starting -> logging <-> paused -> idle
+        self.session = None
+        self.ser = None
+        self.rows = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._writer = None
+
+        self.metrics = AcquisitionMetrics()
+        self.echo = ConsoleEcho(echo_lines, 5)
+        self.warn = ConsoleEcho(True, 1)
+        self.compressor = CompressionWorker(self.metrics) if compress else None
+        os.makedirs(output_dir, exist_ok=True)  # The metrics file is written before the first session
+        metrics_file = os.path.join(output_dir, "logger_service_metrics.json")
+        self.exporter = MetricsExporter(self.metrics, metrics_file, metrics_port)
+
+    # --- Control operations ---
+    def start(self):
+        import serial  # pyserial is only needed once a session is actually opened
+
+        with self._lock:
+            if self.state != "idle":
+                return self.status()
+            self.state = "starting"  # Other control calls see this while the port opens
+        try:
+            # serial_for_url also accepts loop:// and socket:// for simulated gloves
+            ser = serial.serial_for_url(self.port, self.baud_rate, timeout=1)
+            time.sleep(2)  # Allow time for ESP32 to initialize (outside the lock)
+        except Exception:
+            with self._lock:
+                self.state = "idle"
+            raise
+        with self._lock:
+            self.ser = ser
+            self.session = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            header = self.time_columns + PROTOCOLS[self.output_protocol]["sensors"] + self.label_columns
+            on_close = self.compressor.submit if self.compressor else None
+            self._writer = RotatingCSVWriter(self.output_dir, f"glove_p{self.output_protocol}_{self.session}", header,
+                                             self.rotate_bytes, self.rotate_seconds, on_close)
+            self.state = "logging"
+            self._threads = [
+                threading.Thread(target=self._read_binary if self.binary else self._read_serial, daemon=True),
+                threading.Thread(target=self._write_rows, daemon=True),
+            ]
+            for t in self._threads:
+                t.start()
+            print(f"📡 Logging session {self.session} to {self.output_dir}")
+            return self.status()
+
+    def pause(self):
+        with self._lock:
+            if self.state == "logging":
+                self.state = "paused"
+            return self.status()
+
+    def resume(self):
+        with self._lock:
+            if self.state == "paused":
+                self.state = "logging"
+            return self.status()
+
+    def relabel(self, **labels):
+        unknown = set(labels) - set(self.label_columns)
+        if unknown:
+            raise ValueError(f"Unknown label column(s): {', '.join(sorted(unknown))}")
+        with self._lock:
+            self.labels.update(labels)
+            return self.status()
+
+    def stop(self):
+        with self._lock:
+            if self.state in ("idle", "starting"):
+                return self.status()
+            self.state = "idle"
+        for t in self._threads:
+            t.join()
+        self.ser.close()
+        self._writer.close()
+        print(f"✅ Session {self.session} stopped")
+        return self.status()
+
+    def shutdown(self):
+        self.stop()
+        if self.compressor:
+            self.compressor.close()
+        self.exporter.stop()
+
+    def status(self):
+        return {
+            "state": self.state,
+            "session": self.session,
+            "protocol": self.protocol,
+            "labels": dict(self.labels),
+            "segment": self._writer.path if self._writer else None,
+            "counters": self.metrics.snapshot()["counters"],
+        }
+
+    # --- Worker threads ---
+    def _read_serial(self):
+        parser = SerialLineParser(self.protocol)
+        fusion = None
+        if self.fuse_to_p2:
+            from sensor_fusion import ComplementaryFusion
+
+            fusion = ComplementaryFusion()
+            p2_columns = PROTOCOLS["2"]["sensors"]
+        while self.state != "idle":
+            try:
+                line = self.ser.readline().decode("utf-8").strip()
+            except UnicodeDecodeError as e:
+                self.metrics.record_parse_failure(e)
+                continue
+            except Exception as e:
+                self.warn(f"⚠️ Serial error: {e}")
+                self.metrics.record_parse_failure(e)
+                time.sleep(0.5)
+                continue
+            self.metrics.check_serial_buffer(self.ser)
+            if not line:
+                continue
+            self.metrics.inc("lines_read")
+            self.echo(line)
+            try:
+                values = parser.feed(line)
+            except ValueError as e:
+                self.metrics.record_parse_failure(e)
+                self.warn(f"⚠️ Error processing line: {e}")
+                continue
+            if values is None:
+                continue
+            if fusion:
+                # Keep the filter running while paused so orientation stays continuous
+                frame = dict(zip(parser.columns, values))
+                frame.update(fusion.update_frame(frame, time.monotonic()))
+                values = [frame[c] for c in p2_columns]
+            if self.state != "logging":
+                continue
+            self.rows.put(self._time_fields(datetime.now()) + values + [self.labels[c] for c in self.label_columns])
+            self.metrics.inc("frames_emitted")
+            self.metrics.set_gauge("queue_depth", self.rows.qsize())
+
+    def _read_binary(self):
+        from glove_binary import BinaryFrameDecoder
+
+        decoder = BinaryFrameDecoder(self.protocol)
+        fusion = None
+        if self.fuse_to_p2:
+            from sensor_fusion import ComplementaryFusion
+
+            fusion = ComplementaryFusion()
+        columns = PROTOCOLS[self.output_protocol]["sensors"]
+        anchor = None  # (host time, device ms) of the first frame; row timestamps follow the device clock
+        while self.state != "idle":
+            try:
+                data = self.ser.read(self.ser.in_waiting or 1)
+            except Exception as e:
+                self.warn(f"⚠️ Serial error: {e}")
+                self.metrics.record_parse_failure(e)
+                time.sleep(0.5)
+                continue
+            self.metrics.check_serial_buffer(self.ser)
+            if not data:
+                continue
+            self.metrics.inc("bytes_read", amount=len(data))
+            before = dict(decoder.stats)
+            frames = decoder.feed(data)
+            for key in ("crc_errors", "lost_frames", "bytes_skipped"):
+                if decoder.stats[key] > before[key]:
+                    self.metrics.inc(key, amount=decoder.stats[key] - before[key])
+            if not len(frames):
+                continue
+
+            t_ms = frames["t_ms"].astype("int64")
+            if anchor is None or t_ms[0] < anchor[1]:  # first frame or the glove was reset
+                anchor = (time.time(), int(t_ms[0]))
+            sensors = {c: frames[c] for c in decoder.columns}
+            if fusion:
+                # Keep the filter running while paused so orientation stays continuous
+                sensors.update(fusion.update(sensors, sensors, t_ms / 1000.0))
+            if self.state != "logging":
+                continue
+            data_columns = [sensors[c].tolist() if c.startswith("Flex") else sensors[c].astype("float64").round(2).tolist()
+                            for c in columns]
+            labels = [self.labels[c] for c in self.label_columns]
+            received = datetime.now()
+            for ms, *values in zip(t_ms.tolist(), *data_columns):
+                when = datetime.fromtimestamp(anchor[0] + (ms - anchor[1]) / 1000.0)
+                self.rows.put(self._time_fields(when, received) + values + labels)
+            self.metrics.inc("frames_emitted", amount=len(frames))
+            self.metrics.set_gauge("queue_depth", self.rows.qsize())
+
+    def _time_fields(self, when, received=None):
+        fields = [when.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]]
+        if len(self.time_columns) > 1:
+            fields.append((received or when).strftime("%H:%M:%S"))
+        return fields
+
+    def _write_rows(self):
+        while self.state != "idle" or not self.rows.empty():
+            try:
+                batch = [self.rows.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            while len(batch) < 256:
+                try:
+                    batch.append(self.rows.get_nowait())
+                except queue.Empty:
+                    break
+            with self.metrics.timer("write_batch_seconds"):
+                self._writer.write_rows(batch)
+            self.metrics.inc("rows_written", amount=len(batch))
+            self.metrics.observe("write_batch_rows", len(batch), DEPTH_BUCKETS)
+
+
+# === Control API ===
+def serve_control_api(service, port=DEFAULT_CONTROL_PORT):
+    """Serve the JSON control API on localhost until a `shutdown` request."""
+    done = threading.Event()
+    commands = {
+        "start": service.start,
+        "pause": service.pause,
+        "resume": service.resume,
+        "stop": service.stop,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, code, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/status":
+                self._reply(200, service.status())
+            else:
+                self._reply(404, {"error": f"Unknown endpoint {self.path}"})
+
+        def do_POST(self):
+            name = self.path.strip("/")
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if name == "relabel":
+                    self._reply(200, service.relabel(**body))
+                elif name == "shutdown":
+                    self._reply(200, {"state": "shutting down"})
+                    done.set()
+                elif name in commands:
+                    self._reply(200, commands[name]())
+                else:
+                    self._reply(404, {"error": f"Unknown command {name!r}"})
+            except Exception as e:
+                self._reply(400, {"error": str(e)})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🕹️ Control API at http://127.0.0.1:{port}")
+    try:
+        while not done.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        print("\n🚪 Stopping data collection.")
+    finally:
+        server.shutdown()
+        service.shutdown()
+
+
+class ServiceClient:
+    """Thin client for the control API, used by the CLI and the Tk GUI."""
+
+    def __init__(self, port=DEFAULT_CONTROL_PORT, timeout=5):
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.timeout = timeout
+
+    def _call(self, method, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(json.loads(e.read()).get("error", str(e))) from None
+
+    def status(self):
+        return self._call("GET", "/status")
+
+    def command(self, name):
+        return self._call("POST", f"/{name}", {})
+
+    def relabel(self, **labels):
+        return self._call("POST", "/relabel", labels)
+
+
+# === CLI ===
+def _parse_labels(pairs):
+    labels = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"Labels must look like Column=value, got {pair!r}")
+        labels[key] = value
+    return labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless glove data logger")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the acquisition service")
+    run.add_argument("--port", default=SERIAL_PORT, help="serial port, e.g. COM9 or /dev/ttyUSB0")
+    run.add_argument("--baud", type=int, default=BAUD_RATE)
+    run.add_argument("--protocol", choices=sorted(PROTOCOLS), default="2")
+    run.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    run.add_argument("--fuse-to-p2", action="store_true",
+                     help="convert Protocol 1 gyro/angle frames to Protocol 2 pitch/roll/yaw while logging")
+    run.add_argument("--binary", action="store_true",
+                     help="decode binary frames (sketch_binary_frames.ino) instead of text lines")
+    run.add_argument("--label-columns", nargs="+", help="label columns (default depends on protocol)")
+    run.add_argument("--label", nargs="*", default=[], help="initial labels as Column=value")
+    run.add_argument("--rotate-mb", type=float, help="start a new file after this many MB")
+    run.add_argument("--rotate-minutes", type=float, help="start a new file after this many minutes")
+    run.add_argument("--no-compress", action="store_true", help="keep closed segments as plain CSV")
+    run.add_argument("--echo", action="store_true", help="echo raw serial lines (rate-limited)")
+    run.add_argument("--control-port", type=int, default=DEFAULT_CONTROL_PORT)
+    run.add_argument("--metrics-port", type=int, help="serve acquisition metrics on this port")
+    run.add_argument("--start", action="store_true", help="start logging immediately")
+
+    ctl = sub.add_parser("ctl", help="control a running service")
+    ctl.add_argument("action", choices=["status", "start", "pause", "resume", "relabel", "stop", "shutdown"])
+    ctl.add_argument("labels", nargs="*", help="Column=value pairs for relabel")
+    ctl.add_argument("--control-port", type=int, default=DEFAULT_CONTROL_PORT)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "ctl":
+        client = ServiceClient(args.control_port)
+        try:
+            if args.action == "status":
+                result = client.status()
+            elif args.action == "relabel":
+                result = client.relabel(**_parse_labels(args.labels))
+            else:
+                result = client.command(args.action)
+        except (RuntimeError, OSError) as e:
+            raise SystemExit(f"❌ {e}")
+        print(json.dumps(result, indent=2))
+        return
+
+    service = LoggerService(
+        args.port, args.baud, args.protocol, args.output_dir,
+        label_columns=args.label_columns,
+        rotate_bytes=int(args.rotate_mb * 1024 * 1024) if args.rotate_mb else None,
+        rotate_seconds=args.rotate_minutes * 60 if args.rotate_minutes else None,
+        compress=not args.no_compress,
+        echo_lines=args.echo,
+        metrics_port=args.metrics_port,
+        fuse_to_p2=args.fuse_to_p2,
+        binary=args.binary,
+    )
+    service.exporter.start()
+    service.relabel(**_parse_labels(args.label))
+    if args.start:
+        service.start()
+    serve_control_api(service, args.control_port)
+
+
+if __name__ == "__main__":
+    main()
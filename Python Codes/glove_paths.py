@@ -0,0 +1,39 @@
+"""Default file locations and serial port for every script.
+
+Each can be overridden with an environment variable, so the same code runs
+on the lab PC (C:/Mini Project) and anywhere else without editing:
+
+    set GLOVE_PROJECT_DIR=D:/Glove          (Windows)
+    export GLOVE_PROJECT_DIR=~/glove        (Linux / macOS)
+    export GLOVE_SERIAL_PORT=/dev/ttyUSB0
+
+Only the standard library is imported here; the CLI reads it on every start.
+"""
+import os
+
+PROJECT_DIR = os.path.expanduser(os.environ.get("GLOVE_PROJECT_DIR", "C:/Mini Project/"))
+
+# Where the loggers write new sessions
+OUTPUT_DIR = os.path.expanduser(os.environ.get("GLOVE_OUTPUT_DIR", PROJECT_DIR))
+
+# Filtered Protocol 2 sessions, the combined training CSV and the CNN checkpoint
+DATASET_DIR = os.path.expanduser(os.environ.get(
+    "GLOVE_DATASET_DIR", os.path.join(PROJECT_DIR, "Dataset Protocol 2", "Filtered Data")))
+COMBINED_CSV = os.path.join(DATASET_DIR, "combined_data-1.csv")
+CHECKPOINT = os.path.join(PROJECT_DIR, "cnn1d_checkpoint.pt")
+
+SERIAL_PORT = os.environ.get("GLOVE_SERIAL_PORT", "COM9")
+BAUD_RATE = 115200
+
+# Combined / derived training files are not sessions: folder scans skip them
+COMBINED_PREFIX = "combined_data"
+
+
+def sources_file(combined_path):
+    """Sidecar JSON listing the sessions (and fingerprints) a combined file was built from."""
+    return combined_path + ".sources.json"
+
+
+def is_combined(path):
+    return (os.path.basename(path).startswith(COMBINED_PREFIX) or path.endswith(".sources.json")
+            or os.path.exists(sources_file(path)))
@@ -0,0 +1,102 @@
+import re
+
+# === Column layouts written by the loggers ===
+FLEX_COLUMNS = ["Flex1_ADC", "Flex1_Angle", "Flex2_ADC", "Flex2_Angle", "Flex3_ADC", "Flex3_Angle"]
+
+# FlexN_Angle from FlexN_ADC: same bins as getAngleFlexN() in the ESP32 sketches
+# (angle = FLEX_ANGLES[np.digitize(adc, FLEX_ADC_BINS)])
+FLEX_ADC_BINS = [3351, 3457, 3563, 3669, 3775, 3881]
+FLEX_ANGLES = [0, 15, 30, 45, 60, 75, 90]
+
+# Protocol 1: raw gyro rates and gyro-integrated angles (sketch_apr7a.ino)
+PROTOCOL1_SENSOR_COLUMNS = FLEX_COLUMNS + [
+    "MPU1_GyroX", "MPU1_GyroY", "MPU1_GyroZ", "MPU1_AngleX", "MPU1_AngleY", "MPU1_AngleZ",
+    "MPU2_GyroX", "MPU2_GyroY", "MPU2_GyroZ", "MPU2_AngleX", "MPU2_AngleY", "MPU2_AngleZ",
+]
+
+# Protocol 2: complementary-filtered orientation (sketch_feb27a.ino)
+PROTOCOL2_SENSOR_COLUMNS = FLEX_COLUMNS + [
+    "MPU1_Pitch", "MPU1_Roll", "MPU1_Yaw",
+    "MPU2_Pitch", "MPU2_Roll", "MPU2_Yaw",
+]
+
+PROTOCOLS = {
+    "1": {"sensors": PROTOCOL1_SENSOR_COLUMNS, "labels": ["Gesture_Name", "Object_Used"]},
+    "2": {"sensors": PROTOCOL2_SENSOR_COLUMNS, "labels": ["Phase", "Grip_Type", "Object"]},
+}
+
+_FLEX_RE = re.compile(r"Flex([123]): ADC = (-?\d+) \| Angle: (-?\d+)")
+_MPU_RE = re.compile(r"MPU6050 at 0x(68|69)((?: \| \w+: -?[\d.]+)+)")
+
+
+class SerialLineParser:
+    """Turns the firmware's text lines into complete sensor frames.
+
+    Keeps the last known value of every field; a frame is emitted each time
+    the second MPU (0x69) reports, which is the last line of a firmware cycle.
+    """
+
+    def __init__(self, protocol="2"):
+        self.columns = PROTOCOLS[protocol]["sensors"]
+        self.values = dict.fromkeys(self.columns, 0)
+        self._mpu_fields = {
+            "68": [c for c in self.columns if c.startswith("MPU1_")],
+            "69": [c for c in self.columns if c.startswith("MPU2_")],
+        }
+
+    def feed(self, line):
+        """Parse one line; return a list of sensor values when a frame completes.
+
+        Raises ValueError for lines that look like sensor data but are malformed.
+        """
+        if "Flex" in line:
+            match = _FLEX_RE.search(line)
+            if not match:
+                raise ValueError(f"Malformed flex line: {line!r}")
+            n = match.group(1)
+            self.values[f"Flex{n}_ADC"] = int(match.group(2))
+            self.values[f"Flex{n}_Angle"] = int(match.group(3))
+            return None
+
+        if "MPU6050 at 0x" in line and "|" in line:
+            match = _MPU_RE.search(line)
+            if not match:
+                raise ValueError(f"Malformed MPU line: {line!r}")
+            fields = self._mpu_fields[match.group(1)]
+            data = [float(x.split(": ")[1]) for x in match.group(2).split(" | ")[1:]]
+            if len(data) != len(fields):
+                raise ValueError(f"Expected {len(fields)} MPU values, got {len(data)}")
+            self.values.update(zip(fields, data))
+            if match.group(1) == "69":
+                return [self.values[c] for c in self.columns]
+        return None
+
+LABEL_COLUMNS = sorted({c for p in PROTOCOLS.values() for c in p["labels"]})
+TIME_COLUMNS = ["Timestamp", "Upload_Timestamp"]
+
+
+def column_dtype(name):
+    """Compact storage dtype for a known logger column (None if unknown).
+
+    Flex ADC readings are 12-bit and the calibrated flex angles are whole
+    degrees, so both fit int16; MPU values are float32; labels are categories.
+    """
+    if name == "Timestamp":
+        return "datetime64[ns]"
+    if name in TIME_COLUMNS or name in LABEL_COLUMNS:
+        return "category"
+    if name.startswith("Flex") and (name.endswith("_ADC") or name.endswith("_Angle")):
+        return "int16"
+    if name.startswith("MPU"):
+        return "float32"
+    return None
+
+
+def detect_protocol(columns):
+    """Return "1", "2" or None from a list of column names."""
+    columns = set(columns)
+    if {"MPU1_GyroX", "MPU2_GyroX"} & columns:
+        return "1"
+    if {"MPU1_Pitch", "MPU2_Pitch"} & columns:
+        return "2"
+    return None
@@ -0,0 +1,233 @@
+"""Label-segment index over a folder of sessions.
+
+Every contiguous run of a label (Phase, Gesture_Name, Grip_Type, ...) is
+stored once as (session, label, start, end) instead of being rediscovered by
+scanning the repeated label column. The index is cached next to the sessions
+and only rebuilt for files that changed.
+
+On top of it:
+  - session_split(): leakage-free train/test split by whole session
+  - WindowSampler: O(1) random windows from a given label (alias method)
+
+    python label_index.py summary "Dataset Protocol 2/Filtered Data" --column Phase
+    python label_index.py split "Dataset Protocol 2/Filtered Data" --test-size 0.2
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from glove_loader import ARCHIVE_EXT, iter_chunks, list_sessions, read_header, session_fingerprint
+from glove_protocol import LABEL_COLUMNS
+
+INDEX_NAME = ".label_index.json"
+
+
+def _append_run(runs, label, start, end):
+    if runs and runs[-1][0] == label and runs[-1][2] == start:
+        runs[-1][2] = end  # run continues across a chunk / row-group boundary
+    else:
+        runs.append([label, start, end])
+
+
+def _append_values(runs, series, offset):
+    """Append the runs of one chunk of a label column (missing labels become "")."""
+    values = series.astype(str).where(series.notna(), "").to_numpy()
+    cuts = np.flatnonzero(values[1:] != values[:-1]) + 1
+    starts = np.concatenate(([0], cuts))
+    ends = np.concatenate((cuts, [len(values)]))
+    for s, e in zip(starts, ends):
+        _append_run(runs, values[s], offset + int(s), offset + int(e))
+
+
+def session_segments(path, columns):
+    """({column: [[label, start, end), ...]}, total rows) for one session, read column-wise."""
+    runs = {col: [] for col in columns}
+    if path.endswith(ARCHIVE_EXT):
+        from glove_archive import ArchiveReader
+
+        with ArchiveReader(path) as reader:
+            for col in columns:
+                if reader.schema[col] != "category":
+                    # Only categorical columns carry precomputed runs; scan anything else
+                    offset = 0
+                    for chunk in reader.iter_row_groups([col]):
+                        _append_values(runs[col], chunk[col], offset)
+                        offset += len(chunk)
+                    continue
+                for label, start, end in reader.label_runs(col):
+                    _append_run(runs[col], "" if label is None else str(label), int(start), int(end))
+            return runs, reader.num_rows
+
+    # With no label columns, one sensor column is enough to count the rows
+    offset = 0
+    for chunk in iter_chunks(path, columns or read_header(path)[:1]):
+        for col in columns:
+            _append_values(runs[col], chunk[col], offset)
+        offset += len(chunk)
+    return runs, offset
+
+
+class LabelIndex:
+    """All label segments of a folder, cached in INDEX_NAME and refreshed per changed session."""
+
+    def __init__(self, sessions, entries):
+        self.sessions = sessions  # list of session paths; segment arrays refer to positions in it
+        self.entries = entries
+        self._tables = {}
+
+    @classmethod
+    def build(cls, folder, columns=None):
+        """Load the cached index and refresh entries for new or changed sessions."""
+        cache_path = os.path.join(folder, INDEX_NAME)
+        cache = {}
+        if os.path.exists(cache_path):
+            with open(cache_path) as f:
+                cache = json.load(f)
+
+        sessions, entries, changed = [], {}, False
+        for path in list_sessions(folder):  # combined training files are skipped (glove_paths.is_combined)
+            name = os.path.basename(path)
+            fingerprint = session_fingerprint(path)
+            entry = cache.get(name)
+            header = read_header(path)
+            wanted = [c for c in (columns or LABEL_COLUMNS) if c in header]
+            if (entry is None or entry["fingerprint"] != fingerprint or "rows" not in entry
+                    or not set(wanted) <= set(entry["segments"])):
+                segments, rows = session_segments(path, wanted)
+                entry = {"fingerprint": fingerprint, "segments": segments, "rows": rows}
+                changed = True
+            sessions.append(path)
+            entries[name] = entry
+        if changed or set(cache) != set(entries):
+            with open(cache_path, "w") as f:
+                json.dump(entries, f)
+        return cls(sessions, entries)
+
+    def table(self, column):
+        """DataFrame of (session, label, start, end, length) for one label column."""
+        if column not in self._tables:
+            rows = []
+            for sid, path in enumerate(self.sessions):
+                for label, start, end in self.entries[os.path.basename(path)]["segments"].get(column, []):
+                    rows.append((sid, label, start, end))
+            df = pd.DataFrame(rows, columns=["session", "label", "start", "end"])
+            df["label"] = df["label"].astype("category")
+            df["length"] = df["end"] - df["start"]
+            self._tables[column] = df
+        return self._tables[column]
+
+    def summary(self, column):
+        df = self.table(column)
+        return df.groupby("label", observed=True).agg(segments=("length", "size"), rows=("length", "sum"),
+                                                      sessions=("session", "nunique"))
+
+    def session_rows(self):
+        """Row count of every session, counted from the file (not from its label segments)."""
+        return np.array([self.entries[os.path.basename(p)]["rows"] for p in self.sessions], dtype=np.int64)
+
+    def session_split(self, test_size=0.2, seed=42):
+        """Split whole sessions into train/test so no session contributes to both.
+
+        Sessions are shuffled and added to the test set until it holds about
+        `test_size` of all rows. Returns (train_paths, test_paths).
+        """
+        rows = self.session_rows()
+        order = np.random.default_rng(seed).permutation(len(self.sessions))
+        target = test_size * rows.sum()
+        test, taken = [], 0
+        for i in order:
+            if taken >= target or len(test) == len(self.sessions) - 1:
+                break
+            test.append(i)
+            taken += rows[i]
+        test = set(test)
+        train_paths = [p for i, p in enumerate(self.sessions) if i not in test]
+        test_paths = [p for i, p in enumerate(self.sessions) if i in test]
+        return train_paths, test_paths
+
+
+class WindowSampler:
+    """Constant-time random sampling of fixed-length windows inside label segments.
+
+    Each segment is weighted by its number of valid window starts, and a
+    segment is drawn with Walker's alias method, so every valid window of the
+    label is equally likely and each draw is O(1) regardless of archive size.
+    """
+
+    def __init__(self, index, column, label, window, sessions=None):
+        df = index.table(column)
+        df = df[(df["label"] == label) & (df["length"] >= window)]
+        if sessions is not None:
+            wanted = {index.sessions.index(p) for p in sessions}
+            df = df[df["session"].isin(wanted)]
+        if df.empty:
+            raise ValueError(f"No {column}={label!r} segment is at least {window} rows long")
+        self.index = index
+        self.window = window
+        self.session = df["session"].to_numpy()
+        self.start = df["start"].to_numpy()
+        self.choices = (df["length"] - window + 1).to_numpy()
+        self.prob, self.alias = self._alias_table(self.choices / self.choices.sum())
+
+    @staticmethod
+    def _alias_table(p):
+        n = len(p)
+        prob = p * n
+        alias = np.zeros(n, dtype=np.int64)
+        small = [i for i in range(n) if prob[i] < 1.0]
+        large = [i for i in range(n) if prob[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        for i in small + large:
+            prob[i] = 1.0
+        return prob, alias
+
+    def sample(self, n, rng=None):
+        """Return (session_paths, start_rows) for n windows."""
+        rng = rng or np.random.default_rng()
+        k = rng.integers(0, len(self.prob), size=n)
+        seg = np.where(rng.random(n) < self.prob[k], k, self.alias[k])
+        offsets = (rng.random(n) * self.choices[seg]).astype(np.int64)
+        return [self.index.sessions[s] for s in self.session[seg]], self.start[seg] + offsets
+
+
+def balanced_sample(index, column, window, per_label, sessions=None, rng=None):
+    """{label: (session_paths, start_rows)} with the same number of windows for every label."""
+    rng = rng or np.random.default_rng()
+    batches = {}
+    for label in index.table(column)["label"].cat.categories:
+        try:
+            batches[label] = WindowSampler(index, column, label, window, sessions).sample(per_label, rng)
+        except ValueError:
+            continue  # label only occurs in segments shorter than the window
+    return batches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Label segment index for glove sessions")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("summary", "split"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("folder")
+        cmd.add_argument("--column", default="Phase")
+    sub.choices["split"].add_argument("--test-size", type=float, default=0.2)
+    sub.choices["split"].add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    index = LabelIndex.build(args.folder)
+    if args.command == "summary":
+        print(index.summary(args.column))
+    else:
+        train, test = index.session_split(args.test_size, args.seed)
+        print("Train sessions:\n  " + "\n  ".join(os.path.basename(p) for p in train))
+        print("Test sessions:\n  " + "\n  ".join(os.path.basename(p) for p in test))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import tkinter as tk
+from tkinter import messagebox
+
+from glove_logger_service import DEFAULT_CONTROL_PORT, ServiceClient
+
+# The acquisition itself runs in glove_logger_service.py; this window only
+# sends commands to it, so closing the GUI never interrupts a recording.
+CONTROL_PORT = DEFAULT_CONTROL_PORT
+REFRESH_MS = 1000
+
+client = ServiceClient(CONTROL_PORT)
+label_entries = {}
+
+
+def call(action, *args, **kwargs):
+    try:
+        status = action(*args, **kwargs)
+    except Exception as e:
+        messagebox.showerror("Logger Service", f"Request failed:\n{e}")
+        return
+    show_status(status)
+
+
+def show_status(status):
+    segment = status.get("segment") or "-"
+    rows = status.get("counters", {}).get("rows_written", 0)
+    status_label.config(text=f"Status: {status['state'].title()}")
+    detail_label.config(text=f"Rows written: {rows}\nFile: {segment}")
+
+
+def send_labels():
+    labels = {name: entry.get() for name, entry in label_entries.items()}
+    call(client.relabel, **labels)
+
+
+def refresh():
+    try:
+        show_status(client.status())
+    except Exception:
+        status_label.config(text="Status: Service not running")
+    root.after(REFRESH_MS, refresh)
+
+
+def build_label_entries():
+    try:
+        labels = client.status()["labels"]
+    except Exception:
+        messagebox.showerror("Logger Service", f"No logger service on port {CONTROL_PORT}.\n"
+                             "Start it with: python glove_logger_service.py run")
+        root.destroy()
+        return False
+    for name, value in labels.items():
+        tk.Label(root, text=f"{name.replace('_', ' ')}:").pack()
+        entry = tk.Entry(root, font=("Arial", 12), width=30)
+        entry.insert(0, value)
+        entry.pack(pady=2)
+        label_entries[name] = entry
+    return True
+
+
+if __name__ == "__main__":
+    # GUI setup
+    root = tk.Tk()
+    root.title("ESP32 Data Logger")
+    root.geometry("400x480")
+
+    status_label = tk.Label(root, text="Status: Connecting...", font=("Arial", 14))
+    status_label.pack(pady=10)
+
+    detail_label = tk.Label(root, text="", font=("Arial", 9), wraplength=380)
+    detail_label.pack(pady=5)
+
+    tk.Button(root, text="Start Session", command=lambda: call(client.command, "start"), font=("Arial", 12), width=20).pack(pady=5)
+    tk.Button(root, text="Pause Logging", command=lambda: call(client.command, "pause"), font=("Arial", 12), width=20).pack(pady=5)
+    tk.Button(root, text="Resume Logging", command=lambda: call(client.command, "resume"), font=("Arial", 12), width=20).pack(pady=5)
+    tk.Button(root, text="Apply Labels", command=send_labels, font=("Arial", 12), width=20).pack(pady=5)
+    tk.Button(root, text="Stop & Save", command=lambda: call(client.command, "stop"), font=("Arial", 12), width=20, bg="red", fg="white").pack(pady=5)
+
+    if build_label_entries():  # The window is already gone when no service answered
+        root.after(REFRESH_MS, refresh)
+        root.mainloop()
@@ -0,0 +1,216 @@
+"""Raw -> Filtered preprocessing for glove sessions.
+
+Applies vectorized filters to every session in a Raw Data folder and writes
+the result to the matching Filtered Data folder. Sessions are processed in
+parallel, and a manifest in the output folder records the raw file and the
+filter configuration each output was built from, so unchanged sessions are
+skipped on the next run.
+
+    python preprocess.py "Dataset for Protocol 2/Raw Data" "Dataset for Protocol 2/Filtered Data"
+    python preprocess.py RAW_DIR OUT_DIR --config filters.json --workers 4 --force
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from glove_loader import csv_output_name, list_sessions, load_session
+from glove_protocol import FLEX_ADC_BINS, FLEX_ANGLES
+
+MANIFEST_NAME = ".preprocess_manifest.json"
+
+DEFAULT_CONFIG = {
+    # "median" (window in samples) or "butterworth" (low-pass, zero-phase)
+    "flex_filter": {"method": "median", "window": 5, "order": 2, "cutoff_hz": 2.0, "sample_rate_hz": None},
+    # Re-derive FlexN_Angle from the smoothed ADC using the firmware calibration
+    "recompute_flex_angle": True,
+    # Rolling-median/MAD spike rejection on the MPU angle channels
+    "angle_spikes": {"window": 7, "threshold": 4.0},
+    "unwrap_yaw": True,
+}
+
+
+def load_config(path=None):
+    config = json.loads(json.dumps(DEFAULT_CONFIG))  # deep copy
+    if path:
+        with open(path) as f:
+            user = json.load(f)
+        for key, value in user.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+    return config
+
+
+def config_hash(config):
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+
+
+# === Vectorized filters (all operate on 2-D arrays: samples x channels) ===
+def _fill_gaps(x):
+    """Forward/back fill NaNs column-wise so window filters see valid data."""
+    return pd.DataFrame(x).ffill().bfill().fillna(0).to_numpy(np.float64)
+
+
+def median_smooth(x, window):
+    from scipy.ndimage import median_filter
+
+    return median_filter(x, size=(window, 1), mode="nearest")
+
+
+def butterworth_smooth(x, order, cutoff_hz, sample_rate_hz):
+    from scipy.signal import butter, sosfiltfilt
+
+    sos = butter(order, cutoff_hz, btype="low", fs=sample_rate_hz, output="sos")
+    if len(x) <= 3 * (2 * len(sos) + 1):  # too short for filtfilt padding
+        return x
+    return sosfiltfilt(sos, x, axis=0)
+
+
+def reject_spikes(x, window, threshold):
+    """Replace samples further than `threshold` robust SDs from the rolling median."""
+    from scipy.ndimage import median_filter
+
+    med = median_filter(x, size=(window, 1), mode="nearest")
+    dev = np.abs(x - med)
+    mad = median_filter(dev, size=(window, 1), mode="nearest") * 1.4826
+    spikes = dev > threshold * np.maximum(mad, 1e-6)
+    return np.where(spikes, med, x), int(spikes.sum())
+
+
+def unwrap_degrees(x):
+    return np.unwrap(x, period=360.0, axis=0)
+
+
+def estimate_sample_rate(df):
+    if "Timestamp" not in df:
+        return None
+    ts = pd.to_datetime(df["Timestamp"], errors="coerce").dropna()
+    step = np.median(np.diff(ts.to_numpy().view(np.int64))) / 1e9 if len(ts) > 1 else 0
+    return 1.0 / step if step > 0 else None
+
+
+def filter_session(df, config):
+    """Apply the configured filters to one session; returns (df, stats)."""
+    df = df.copy()
+    stats = {"rows": len(df)}
+
+    adc_cols = [c for c in df.columns if c.startswith("Flex") and c.endswith("_ADC")]
+    if adc_cols:
+        adc = _fill_gaps(df[adc_cols].apply(pd.to_numeric, errors="coerce").to_numpy())
+        flt = config["flex_filter"]
+        if flt["method"] == "median":
+            adc = median_smooth(adc, flt["window"])
+        elif flt["method"] == "butterworth":
+            rate = flt.get("sample_rate_hz") or estimate_sample_rate(df)
+            if not rate:
+                raise ValueError("Butterworth filter needs sample_rate_hz (no usable Timestamp column)")
+            adc = butterworth_smooth(adc, flt["order"], flt["cutoff_hz"], rate)
+        else:
+            raise ValueError(f"Unknown flex filter {flt['method']!r}")
+        adc = np.clip(np.rint(adc), 0, 4095).astype(np.int16)
+        df[adc_cols] = adc
+        if config.get("recompute_flex_angle"):
+            for i, col in enumerate(adc_cols):
+                angle_col = col.replace("_ADC", "_Angle")
+                if angle_col in df:
+                    df[angle_col] = np.asarray(FLEX_ANGLES, dtype=np.int16)[np.digitize(adc[:, i], FLEX_ADC_BINS)]
+
+    yaw_cols = [c for c in df.columns if c.startswith("MPU") and c.endswith("_Yaw")]
+    if yaw_cols and config.get("unwrap_yaw"):
+        # Unwrap before spike rejection, otherwise every wrap looks like a spike
+        yaw = _fill_gaps(df[yaw_cols].apply(pd.to_numeric, errors="coerce").to_numpy())
+        df[yaw_cols] = unwrap_degrees(yaw)
+
+    angle_cols = [c for c in df.columns if c.startswith("MPU") and c.split("_")[-1] in
+                  ("Pitch", "Roll", "Yaw", "AngleX", "AngleY", "AngleZ")]
+    if angle_cols and config.get("angle_spikes"):
+        spikes = config["angle_spikes"]
+        angles = _fill_gaps(df[angle_cols].apply(pd.to_numeric, errors="coerce").to_numpy())
+        angles, stats["spikes_replaced"] = reject_spikes(angles, spikes["window"], spikes["threshold"])
+        df[angle_cols] = angles.astype(np.float32)
+
+    return df, stats
+
+
+# === Session batch processing ===
+def _raw_signature(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def process_file(raw_path, out_path, config):
+    start = time.perf_counter()
+    df = load_session(raw_path)
+    df, stats = filter_session(df, config)
+    tmp_path = out_path + ".tmp"
+    compression = "gzip" if out_path.endswith(".gz") else None  # .tmp hides the extension from pandas
+    df.to_csv(tmp_path, index=False, float_format="%.4f", compression=compression)
+    os.replace(tmp_path, out_path)
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def run(raw_dir, out_dir, config, workers=None, force=False):
+    """Filter every session (.csv, .csv.gz, .glarc) in raw_dir whose input or config changed since the last run."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    cfg_hash = config_hash(config)
+    raw_paths = list_sessions(raw_dir)
+    jobs = {}
+    for raw_path in raw_paths:
+        name = os.path.basename(raw_path)
+        out_path = os.path.join(out_dir, csv_output_name(name))
+        entry = manifest.get(name, {})
+        up_to_date = (entry.get("raw") == _raw_signature(raw_path) and entry.get("config") == cfg_hash
+                      and os.path.exists(out_path))
+        if force or not up_to_date:
+            jobs[name] = (raw_path, out_path)
+
+    skipped = len(raw_paths) - len(jobs)
+    print(f"🧹 {len(jobs)} session(s) to filter, {skipped} unchanged")
+    if not jobs:
+        return manifest
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_file, raw, out, config): name for name, (raw, out) in jobs.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                stats = future.result()
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+                manifest.pop(name, None)
+                continue
+            manifest[name] = {"raw": _raw_signature(jobs[name][0]), "config": cfg_hash, "stats": stats}
+            print(f"✅ {name}: {stats['rows']} rows in {stats['seconds']:.2f}s")
+
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filter raw glove sessions")
+    parser.add_argument("raw_dir")
+    parser.add_argument("out_dir")
+    parser.add_argument("--config", help="JSON file overriding DEFAULT_CONFIG")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="reprocess every session")
+    args = parser.parse_args(argv)
+    run(args.raw_dir, args.out_dir, load_config(args.config), args.workers, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Convert Protocol 1 sessions (gyro rates + integrated angles) to the Protocol 2
+Pitch/Roll/Yaw schema expected by the classifiers.
+
+Protocol 1 firmware (sketch_apr7a.ino) never logged the accelerometer, so an
+absolute tilt reference (as used by sketch_feb27a.ino or a Madgwick filter)
+cannot be rebuilt on the host. Instead the same complementary filter the
+Protocol 2 firmware runs is applied with the logged firmware angle as the
+slow reference:
+
+    pitch[k] = a * (pitch[k-1] + GyroY[k] * dt[k]) + (1 - a) * AngleY[k]
+    roll[k]  = a * (roll[k-1]  + GyroX[k] * dt[k]) + (1 - a) * AngleX[k]
+    yaw[k]   = yaw[k-1] + GyroZ[k] * dt[k]
+
+The recursion is a first-order IIR filter, so it runs through
+scipy.signal.lfilter for whole sessions and carries its state between
+chunks when used as a streaming stage.
+
+    python sensor_fusion.py "Dataset for Protocol 1/Filtered Data" OUT_DIR --workers 4
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from glove_loader import csv_output_name, list_sessions, load_session
+from glove_protocol import FLEX_COLUMNS, PROTOCOL2_SENSOR_COLUMNS
+
+ALPHA = 0.98  # Same constant as the Protocol 2 firmware
+DEFAULT_DT = 1.0  # sketch_apr7a.ino samples once per second
+MAX_DT = 5.0  # Larger gaps are treated as a pause, not a long integration step
+
+# (output axis, gyro column, reference angle column)
+AXES = [("Pitch", "GyroY", "AngleY"), ("Roll", "GyroX", "AngleX")]
+DROP_COLUMNS = ["Upload_Timestamp"]
+
+
+def timestamps_to_seconds(timestamps):
+    """Seconds since the first sample, spreading rows that share a timestamp.
+
+    The Protocol 1 loggers write whole-second timestamps, so k rows logged in
+    the same second are placed at evenly spaced offsets within it.
+    """
+    ns = pd.to_datetime(timestamps, errors="coerce").ffill().bfill().to_numpy("datetime64[ns]").view(np.int64)
+    if len(ns) == 0:
+        return np.zeros(0)
+    seconds = (ns - ns[0]) / 1e9
+    _, start, inverse, counts = np.unique(seconds, return_index=True, return_inverse=True, return_counts=True)
+    rank = np.arange(len(seconds)) - start[inverse]
+    resolution = np.diff(np.unique(seconds)).min() if len(counts) > 1 else 1.0
+    return seconds + resolution * rank / counts[inverse]
+
+
+class ComplementaryFusion:
+    """Vectorized Protocol 1 -> Protocol 2 orientation fusion with carried state.
+
+    Call `update()` with consecutive chunks (a whole session or single live
+    frames); filter state and the last timestamp carry over between calls.
+    """
+
+    def __init__(self, alpha=ALPHA, mpus=(1, 2)):
+        self.alpha = alpha
+        self.mpus = mpus
+        self.state = {}  # {output column: last value}
+        self.last_time = None
+
+    def reset(self):
+        self.state = {}
+        self.last_time = None
+
+    def _dt(self, seconds):
+        if self.last_time is None:
+            # No previous sample: assume the chunk's typical step (a lone frame integrates nothing)
+            first = np.median(np.diff(seconds)) if len(seconds) > 1 else 0.0
+            dt = np.diff(seconds, prepend=seconds[0] - first)
+        else:
+            dt = np.diff(seconds, prepend=self.last_time)
+        self.last_time = seconds[-1]
+        return np.clip(dt, 0.0, MAX_DT)
+
+    def update(self, gyro, angle, seconds):
+        """Fuse one chunk.
+
+        gyro, angle: {column name: 1-D array} for the Protocol 1 MPU columns
+        seconds: 1-D array of sample times in seconds (monotonic)
+        Returns {Protocol 2 column: float32 array}.
+        """
+        from scipy.signal import lfilter
+
+        a = self.alpha
+        dt = self._dt(np.asarray(seconds, dtype=np.float64))
+        out = {}
+        for m in self.mpus:
+            for axis, gyro_axis, ref_axis in AXES:
+                col = f"MPU{m}_{axis}"
+                drive = a * np.asarray(gyro[f"MPU{m}_{gyro_axis}"]) * dt + (1 - a) * np.asarray(angle[f"MPU{m}_{ref_axis}"])
+                y0 = self.state.get(col, np.asarray(angle[f"MPU{m}_{ref_axis}"])[0])
+                y, _ = lfilter([1.0], [1.0, -a], drive, zi=[a * y0])
+                out[col] = y.astype(np.float32)
+                self.state[col] = float(y[-1])
+            col = f"MPU{m}_Yaw"
+            yaw = self.state.get(col, 0.0) + np.cumsum(np.asarray(gyro[f"MPU{m}_GyroZ"]) * dt)
+            out[col] = yaw.astype(np.float32)
+            self.state[col] = float(yaw[-1])
+        return out
+
+    def update_frame(self, values, timestamp):
+        """Streaming helper for one live frame given as {column: value}."""
+        gyro = {k: [v] for k, v in values.items() if "_Gyro" in k}
+        angle = {k: [v] for k, v in values.items() if "_Angle" in k and k.startswith("MPU")}
+        fused = self.update(gyro, angle, [timestamp])
+        return {k: round(float(v[0]), 2) for k, v in fused.items()}
+
+
+def fuse_session(df, alpha=ALPHA):
+    """Convert one Protocol 1 DataFrame to the Protocol 2 column layout."""
+    seconds = timestamps_to_seconds(df["Timestamp"]) if "Timestamp" in df else np.arange(len(df)) * DEFAULT_DT
+    mpu_cols = [c for c in df.columns if c.startswith("MPU")]
+    numeric = df[mpu_cols].apply(pd.to_numeric, errors="coerce").ffill().fillna(0)
+    fused = ComplementaryFusion(alpha).update(numeric, numeric, seconds)
+
+    out = pd.DataFrame(index=df.index)
+    if "Timestamp" in df:
+        out["Timestamp"] = df["Timestamp"]
+    for col in PROTOCOL2_SENSOR_COLUMNS:
+        out[col] = df[col] if col in FLEX_COLUMNS else fused[col]
+    for col in df.columns:
+        if col not in out and col not in mpu_cols and col not in DROP_COLUMNS:
+            out[col] = df[col]  # labels pass through unchanged
+    return out
+
+
+def convert_file(in_path, out_path, alpha=ALPHA):
+    df = load_session(in_path)
+    missing = [c for c in ("MPU1_GyroX", "MPU2_GyroX") if c not in df]
+    if missing:
+        raise ValueError(f"not a Protocol 1 session (missing {', '.join(missing)})")
+    fuse_session(df, alpha).to_csv(out_path, index=False, float_format="%.2f")  # .csv.gz is gzipped
+    return len(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Protocol 1 sessions to Protocol 2 orientation")
+    parser.add_argument("in_dir")
+    parser.add_argument("out_dir")
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    paths = list_sessions(args.in_dir)  # .csv, .csv.gz (logger service segments) and .glarc
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {}
+        for path in paths:
+            name = os.path.basename(path)
+            out_path = os.path.join(args.out_dir, csv_output_name(name))
+            futures[pool.submit(convert_file, path, out_path, args.alpha)] = name
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                print(f"✅ {name}: {future.result()} rows")
+            except Exception as e:
+                print(f"⚠️ {name}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,23 @@ import threading
 import tkinter as tk
 from tkinter import messagebox
 import os
+import glove_paths
+from acquisition_metrics import AcquisitionMetrics, ConsoleEcho, MetricsExporter
 
 # Configure the serial connection (Update PORT)
-SERIAL_PORT = "COM9"  # Change based on your system (e.g., "COM3" for Windows, "/dev/ttyUSB0" for Linux)
+SERIAL_PORT = glove_paths.SERIAL_PORT  # Set GLOVE_SERIAL_PORT (e.g. "COM3" or "/dev/ttyUSB0")
 BAUD_RATE = 115200
 
 # Create a new unique filename for each session
 timestamp_now = time.strftime("%Y-%m-%d_%H-%M-%S")
-OUTPUT_DIR = "C:/Mini Project/"  # Change path if needed
+OUTPUT_DIR = glove_paths.OUTPUT_DIR  # Set GLOVE_OUTPUT_DIR to change
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, f"arduino_data_{timestamp_now}.csv")
 
-# Open serial connection
-ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-time.sleep(2)  # Allow time for ESP32 to initialize
+# Diagnostics
+ECHO_LINES = False  # Echo raw serial lines to the console (rate-limited)
+ECHO_MAX_PER_SECOND = 5
+METRICS_FILE = os.path.join(OUTPUT_DIR, f"arduino_data_{timestamp_now}_metrics.json")
+METRICS_HTTP_PORT = None  # e.g. 9100 to serve http://127.0.0.1:9100/metrics
 
 # Flags for controlling data logging
 logging_active = True
@@ -42,47 +46,61 @@ def read_serial_data():
 
         try:
             while running:
-                line = ser.readline().decode("utf-8").strip()
+                try:
+                    line = ser.readline().decode("utf-8").strip()
+                except UnicodeDecodeError as e:
+                    metrics.record_parse_failure(e)
+                    continue
+                metrics.check_serial_buffer(ser)
                 
                 if line:
-                    print(line)  # Debug: Print to terminal
+                    metrics.inc("lines_read")
+                    echo(line)  # Debug: Print to terminal
                     
                     if line == "STOP":
                         print("\n🚪 Stop command received. Stopping data collection.")
                         break
                     
                     # Parse sensor data
-                    if "Flex1:" in line:
-                        flex1_adc = int(line.split("ADC = ")[1].split(" | ")[0])
-                        flex1_angle = int(line.split("Angle: ")[1].split("°")[0])
-                    elif "Flex2:" in line:
-                        flex2_adc = int(line.split("ADC = ")[1].split(" | ")[0])
-                        flex2_angle = int(line.split("Angle: ")[1].split("°")[0])
-                    elif "Flex3:" in line:
-                        flex3_adc = int(line.split("ADC = ")[1].split(" | ")[0])
-                        flex3_angle = int(line.split("Angle: ")[1].split("°")[0])
-                    elif "MPU6050 at 0x68" in line:  # MPU1 Data
-                        data = [float(x.split(": ")[1]) for x in line.split(" | ")[1:]]
-                        mpu1_gyroX, mpu1_gyroY, mpu1_gyroZ, mpu1_angleX, mpu1_angleY, mpu1_angleZ = data
-                    elif "MPU6050 at 0x69" in line:  # MPU2 Data
-                        data = [float(x.split(": ")[1]) for x in line.split(" | ")[1:]]
-                        mpu2_gyroX, mpu2_gyroY, mpu2_gyroZ, mpu2_angleX, mpu2_angleY, mpu2_angleZ = data
-
-                        # Record timestamps
-                        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                        upload_timestamp = time.strftime("%H:%M:%S")  # Upload time (HH:MM:SS)
-
-                        # Write to CSV if logging is active
-                        if logging_active:
-                            writer.writerow([timestamp, upload_timestamp, flex1_adc, flex1_angle, flex2_adc, flex2_angle, flex3_adc, flex3_angle,
-                                             mpu1_gyroX, mpu1_gyroY, mpu1_gyroZ, mpu1_angleX, mpu1_angleY, mpu1_angleZ,
-                                             mpu2_gyroX, mpu2_gyroY, mpu2_gyroZ, mpu2_angleX, mpu2_angleY, mpu2_angleZ])
-                            file.flush()  # Ensure data is written immediately
+                    try:
+                        if "Flex1:" in line:
+                            flex1_adc = int(line.split("ADC = ")[1].split(" | ")[0])
+                            flex1_angle = int(line.split("Angle: ")[1].split("°")[0])
+                        elif "Flex2:" in line:
+                            flex2_adc = int(line.split("ADC = ")[1].split(" | ")[0])
+                            flex2_angle = int(line.split("Angle: ")[1].split("°")[0])
+                        elif "Flex3:" in line:
+                            flex3_adc = int(line.split("ADC = ")[1].split(" | ")[0])
+                            flex3_angle = int(line.split("Angle: ")[1].split("°")[0])
+                        elif "MPU6050 at 0x68" in line:  # MPU1 Data
+                            data = [float(x.split(": ")[1]) for x in line.split(" | ")[1:]]
+                            mpu1_gyroX, mpu1_gyroY, mpu1_gyroZ, mpu1_angleX, mpu1_angleY, mpu1_angleZ = data
+                        elif "MPU6050 at 0x69" in line:  # MPU2 Data
+                            data = [float(x.split(": ")[1]) for x in line.split(" | ")[1:]]
+                            mpu2_gyroX, mpu2_gyroY, mpu2_gyroZ, mpu2_angleX, mpu2_angleY, mpu2_angleZ = data
+
+                            # Record timestamps
+                            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                            upload_timestamp = time.strftime("%H:%M:%S")  # Upload time (HH:MM:SS)
+
+                            # Write to CSV if logging is active
+                            if logging_active:
+                                with metrics.timer("write_row_seconds"):
+                                    writer.writerow([timestamp, upload_timestamp, flex1_adc, flex1_angle, flex2_adc, flex2_angle, flex3_adc, flex3_angle,
+                                                     mpu1_gyroX, mpu1_gyroY, mpu1_gyroZ, mpu1_angleX, mpu1_angleY, mpu1_angleZ,
+                                                     mpu2_gyroX, mpu2_gyroY, mpu2_gyroZ, mpu2_angleX, mpu2_angleY, mpu2_angleZ])
+                                    file.flush()  # Ensure data is written immediately
+                                metrics.inc("frames_emitted")
+
+                    except Exception as e:
+                        metrics.record_parse_failure(e)
+                        warn(f"⚠️ Error processing line: {e}")
 
         except KeyboardInterrupt:
             print("\n🚪 Stopping data collection.")
         finally:
             ser.close()
+            exporter.stop()
 
 
 # GUI Functions
@@ -102,32 +120,43 @@ def stop_program():
     global running
     running = False
     ser.close()
+    exporter.stop()  # Final metrics before the GUI exits; the daemon reader may not get to its finally
     root.quit()  # Close GUI
     messagebox.showinfo("Data Logging", f"Data logging stopped and saved in:\n{OUTPUT_FILE}")
 
 
-# Create GUI window
-root = tk.Tk()
-root.title("ESP32 Data Logger")
-root.geometry("400x300")
+# Nothing below runs on import: the port is opened only when the logger is started
+if __name__ == "__main__":
+    metrics = AcquisitionMetrics()
+    echo = ConsoleEcho(ECHO_LINES, ECHO_MAX_PER_SECOND)
+    warn = ConsoleEcho(True, 1)
+    exporter = MetricsExporter(metrics, METRICS_FILE, METRICS_HTTP_PORT).start()
 
-status_label = tk.Label(root, text="Status: Logging Data", font=("Arial", 14))
-status_label.pack(pady=20)
+    # Open serial connection
+    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+    time.sleep(2)  # Allow time for ESP32 to initialize
 
-# Create buttons
-pause_button = tk.Button(root, text="Pause Logging", command=pause_logging, font=("Arial", 12), width=20)
-pause_button.pack(pady=5)
+    # Create GUI window
+    root = tk.Tk()
+    root.title("ESP32 Data Logger")
+    root.geometry("400x300")
 
-resume_button = tk.Button(root, text="Resume Logging", command=resume_logging, font=("Arial", 12), width=20)
-resume_button.pack(pady=5)
+    status_label = tk.Label(root, text="Status: Logging Data", font=("Arial", 14))
+    status_label.pack(pady=20)
 
-stop_button = tk.Button(root, text="Stop & Save", command=stop_program, font=("Arial", 12), width=20, bg="red", fg="white")
-stop_button.pack(pady=5)
+    # Create buttons
+    pause_button = tk.Button(root, text="Pause Logging", command=pause_logging, font=("Arial", 12), width=20)
+    pause_button.pack(pady=5)
 
-# Run serial reading in a separate thread to keep GUI responsive
-serial_thread = threading.Thread(target=read_serial_data, daemon=True)
-serial_thread.start()
+    resume_button = tk.Button(root, text="Resume Logging", command=resume_logging, font=("Arial", 12), width=20)
+    resume_button.pack(pady=5)
 
-# Start GUI
-root.mainloop()
+    stop_button = tk.Button(root, text="Stop & Save", command=stop_program, font=("Arial", 12), width=20, bg="red", fg="white")
+    stop_button.pack(pady=5)
 
+    # Run serial reading in a separate thread to keep GUI responsive
+    serial_thread = threading.Thread(target=read_serial_data, daemon=True)
+    serial_thread.start()
+
+    # Start GUI
+    root.mainloop()
@@ -5,16 +5,20 @@ import threading
 import tkinter as tk
 from tkinter import messagebox
 import os
+import glove_paths
+from acquisition_metrics import AcquisitionMetrics, ConsoleEcho, MetricsExporter
 
-SERIAL_PORT = "COM9"  # Update this if needed
+SERIAL_PORT = glove_paths.SERIAL_PORT  # Set GLOVE_SERIAL_PORT (e.g. "COM3" or "/dev/ttyUSB0")
 BAUD_RATE = 115200
 
 timestamp_now = time.strftime("%Y-%m-%d_%H-%M-%S")
-OUTPUT_DIR = "C:/Mini Project/"
+OUTPUT_DIR = glove_paths.OUTPUT_DIR  # Set GLOVE_OUTPUT_DIR to change
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, f"grip_data_{timestamp_now}.csv")
 
-ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-time.sleep(2)
+ECHO_LINES = False  # Echo raw serial lines to the console (rate-limited)
+ECHO_MAX_PER_SECOND = 5
+METRICS_FILE = os.path.join(OUTPUT_DIR, f"grip_data_{timestamp_now}_metrics.json")
+METRICS_HTTP_PORT = None  # e.g. 9100 to serve http://127.0.0.1:9100/metrics
 
 logging_active = True
 running = True
@@ -43,10 +47,16 @@ def read_serial_data():
 
         try:
             while running:
-                line = ser.readline().decode("utf-8").strip()
+                try:
+                    line = ser.readline().decode("utf-8").strip()
+                except UnicodeDecodeError as e:
+                    metrics.record_parse_failure(e)
+                    continue
+                metrics.check_serial_buffer(ser)
 
                 if line:
-                    print(line)
+                    metrics.inc("lines_read")
+                    echo(line)
 
                     try:
                         if "Flex1:" in line:
@@ -70,21 +80,25 @@ def read_serial_data():
                             mpu2_yaw = float(parts[3].split(": ")[1])
 
                         if logging_active:
-                            writer.writerow([
-                                time.strftime("%Y-%m-%d %H:%M:%S"),
-                                flex1_adc, flex1_angle,
-                                flex2_adc, flex2_angle,
-                                flex3_adc, flex3_angle,
-                                mpu1_pitch, mpu1_roll, mpu1_yaw,
-                                mpu2_pitch, mpu2_roll, mpu2_yaw,
-                                gesture_name, object_used
-                            ])
-                            file.flush()
+                            with metrics.timer("write_row_seconds"):
+                                writer.writerow([
+                                    time.strftime("%Y-%m-%d %H:%M:%S"),
+                                    flex1_adc, flex1_angle,
+                                    flex2_adc, flex2_angle,
+                                    flex3_adc, flex3_angle,
+                                    mpu1_pitch, mpu1_roll, mpu1_yaw,
+                                    mpu2_pitch, mpu2_roll, mpu2_yaw,
+                                    gesture_name, object_used
+                                ])
+                                file.flush()
+                            metrics.inc("frames_emitted")
 
                     except Exception as e:
-                        print(f"⚠️ Error processing line: {e}")
+                        metrics.record_parse_failure(e)
+                        warn(f"⚠️ Error processing line: {e}")
         finally:
             ser.close()
+            exporter.stop()
 
 def pause_logging():
     global logging_active, gesture_name, object_used
@@ -104,42 +118,53 @@ def stop_program():
     global running
     running = False
     ser.close()
+    exporter.stop()  # Final metrics before the GUI exits; the daemon reader may not get to its finally
     root.quit()
     messagebox.showinfo("Data Logging", f"✅ Data saved to:\n{OUTPUT_FILE}")
 
-# GUI Setup
-root = tk.Tk()
-root.title("ESP32 Grip Data Logger")
-root.geometry("400x400")
+# Nothing below runs on import: the port is opened only when the logger is started
+if __name__ == "__main__":
+    metrics = AcquisitionMetrics()
+    echo = ConsoleEcho(ECHO_LINES, ECHO_MAX_PER_SECOND)
+    warn = ConsoleEcho(True, 1)
+    exporter = MetricsExporter(metrics, METRICS_FILE, METRICS_HTTP_PORT).start()
 
-status_label = tk.Label(root, text="Status: Logging", font=("Arial", 14))
-status_label.pack(pady=10)
+    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+    time.sleep(2)
 
-gesture_label = tk.Label(root, text="Gesture: Not Set", font=("Arial", 12))
-gesture_label.pack()
+    # GUI Setup
+    root = tk.Tk()
+    root.title("ESP32 Grip Data Logger")
+    root.geometry("400x400")
 
-object_label = tk.Label(root, text="Object: Not Set", font=("Arial", 12))
-object_label.pack()
+    status_label = tk.Label(root, text="Status: Logging", font=("Arial", 14))
+    status_label.pack(pady=10)
 
-gesture_entry = tk.Entry(root, font=("Arial", 12), width=30)
-gesture_entry.pack(pady=10)
-gesture_entry.insert(0, "Enter Gesture")
+    gesture_label = tk.Label(root, text="Gesture: Not Set", font=("Arial", 12))
+    gesture_label.pack()
 
-object_entry = tk.Entry(root, font=("Arial", 12), width=30)
-object_entry.pack(pady=10)
-object_entry.insert(0, "Enter Object")
+    object_label = tk.Label(root, text="Object: Not Set", font=("Arial", 12))
+    object_label.pack()
 
-pause_button = tk.Button(root, text="Pause Logging", command=pause_logging, font=("Arial", 12), width=20)
-pause_button.pack(pady=5)
+    gesture_entry = tk.Entry(root, font=("Arial", 12), width=30)
+    gesture_entry.pack(pady=10)
+    gesture_entry.insert(0, "Enter Gesture")
 
-resume_button = tk.Button(root, text="Resume Logging", command=resume_logging, font=("Arial", 12), width=20)
-resume_button.pack(pady=5)
+    object_entry = tk.Entry(root, font=("Arial", 12), width=30)
+    object_entry.pack(pady=10)
+    object_entry.insert(0, "Enter Object")
 
-stop_button = tk.Button(root, text="Stop & Save", command=stop_program, font=("Arial", 12), width=20, bg="red", fg="white")
-stop_button.pack(pady=10)
+    pause_button = tk.Button(root, text="Pause Logging", command=pause_logging, font=("Arial", 12), width=20)
+    pause_button.pack(pady=5)
 
-# Start thread
-serial_thread = threading.Thread(target=read_serial_data, daemon=True)
-serial_thread.start()
+    resume_button = tk.Button(root, text="Resume Logging", command=resume_logging, font=("Arial", 12), width=20)
+    resume_button.pack(pady=5)
 
-root.mainloop()
+    stop_button = tk.Button(root, text="Stop & Save", command=stop_program, font=("Arial", 12), width=20, bg="red", fg="white")
+    stop_button.pack(pady=10)
+
+    # Start thread
+    serial_thread = threading.Thread(target=read_serial_data, daemon=True)
+    serial_thread.start()
+
+    root.mainloop()
@@ -5,19 +5,23 @@ import threading
 import tkinter as tk
 from tkinter import messagebox
 import os
+import glove_paths
+from acquisition_metrics import AcquisitionMetrics, ConsoleEcho, MetricsExporter
 
 # Configure the serial connection
-SERIAL_PORT = "COM9"  # Update as per your system
+SERIAL_PORT = glove_paths.SERIAL_PORT  # Set GLOVE_SERIAL_PORT (e.g. "COM3" or "/dev/ttyUSB0")
 BAUD_RATE = 115200
 
 # Create a unique filename for each session
 timestamp_now = time.strftime("%Y-%m-%d_%H-%M-%S")
-OUTPUT_DIR = "C:/Mini Project/"
+OUTPUT_DIR = glove_paths.OUTPUT_DIR  # Set GLOVE_OUTPUT_DIR to change
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, f"arduino_data_{timestamp_now}.csv")
 
-# Open serial connection
-ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-time.sleep(2)  # Allow time for ESP32 to initialize
+# Diagnostics
+ECHO_LINES = False  # Echo raw serial lines to the console (rate-limited)
+ECHO_MAX_PER_SECOND = 5
+METRICS_FILE = os.path.join(OUTPUT_DIR, f"arduino_data_{timestamp_now}_metrics.json")
+METRICS_HTTP_PORT = None  # e.g. 9100 to serve http://127.0.0.1:9100/metrics
 
 # Flags for controlling data logging
 logging_active = True
@@ -48,10 +52,16 @@ def read_serial_data():
 
         try:
             while running:
-                line = ser.readline().decode("utf-8").strip()
+                try:
+                    line = ser.readline().decode("utf-8").strip()
+                except UnicodeDecodeError as e:
+                    metrics.record_parse_failure(e)
+                    continue
+                metrics.check_serial_buffer(ser)
 
                 if line:
-                    print(line)  
+                    metrics.inc("lines_read")
+                    echo(line)
 
                     if line == "STOP":
                         print("\n🚪 Stop command received. Stopping data collection.")
@@ -72,13 +82,15 @@ def read_serial_data():
                             if len(data) == 6:  # Ensure valid data
                                 mpu1_gyroX, mpu1_gyroY, mpu1_gyroZ, mpu1_angleX, mpu1_angleY, mpu1_angleZ = data
                             else:
-                                print("⚠️ Invalid MPU1 data, using last known values.")
+                                metrics.inc("parse_failures", "InvalidMPU1")
+                                warn("⚠️ Invalid MPU1 data, using last known values.")
                         elif "MPU6050 at 0x69" in line:  # MPU2 Data
                             data = [float(x.split(": ")[1]) for x in line.split(" | ")[1:]]
                             if len(data) == 6:  # Ensure valid data
                                 mpu2_gyroX, mpu2_gyroY, mpu2_gyroZ, mpu2_angleX, mpu2_angleY, mpu2_angleZ = data
                             else:
-                                print("⚠️ Invalid MPU2 data, using last known values.")
+                                metrics.inc("parse_failures", "InvalidMPU2")
+                                warn("⚠️ Invalid MPU2 data, using last known values.")
 
                         # Record timestamps
                         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
@@ -86,19 +98,23 @@ def read_serial_data():
 
                         # Write to CSV if logging is active
                         if logging_active:
-                            writer.writerow([timestamp, upload_timestamp, flex1_adc, flex1_angle, flex2_adc, flex2_angle, flex3_adc, flex3_angle,
-                                             mpu1_gyroX, mpu1_gyroY, mpu1_gyroZ, mpu1_angleX, mpu1_angleY, mpu1_angleZ,
-                                             mpu2_gyroX, mpu2_gyroY, mpu2_gyroZ, mpu2_angleX, mpu2_angleY, mpu2_angleZ, 
-                                             gesture_name, object_used])
-                            file.flush()
+                            with metrics.timer("write_row_seconds"):
+                                writer.writerow([timestamp, upload_timestamp, flex1_adc, flex1_angle, flex2_adc, flex2_angle, flex3_adc, flex3_angle,
+                                                 mpu1_gyroX, mpu1_gyroY, mpu1_gyroZ, mpu1_angleX, mpu1_angleY, mpu1_angleZ,
+                                                 mpu2_gyroX, mpu2_gyroY, mpu2_gyroZ, mpu2_angleX, mpu2_angleY, mpu2_angleZ, 
+                                                 gesture_name, object_used])
+                                file.flush()
+                            metrics.inc("frames_emitted")
 
                     except Exception as e:
-                        print(f"⚠️ Error processing line: {e}. Using default values.")
+                        metrics.record_parse_failure(e)
+                        warn(f"⚠️ Error processing line: {e}. Using default values.")
 
         except KeyboardInterrupt:
             print("\n🚪 Stopping data collection.")
         finally:
             ser.close()
+            exporter.stop()
 
 # GUI Functions
 def pause_logging():
@@ -122,43 +138,55 @@ def stop_program():
     global running
     running = False
     ser.close()
+    exporter.stop()  # Final metrics before the GUI exits; the daemon reader may not get to its finally
     root.quit()
     messagebox.showinfo("Data Logging", f"Data logging stopped and saved in:\n{OUTPUT_FILE}")
 
-# Create GUI window
-root = tk.Tk()
-root.title("ESP32 Data Logger")
-root.geometry("400x400")
+# Nothing below runs on import: the port is opened only when the logger is started
+if __name__ == "__main__":
+    metrics = AcquisitionMetrics()
+    echo = ConsoleEcho(ECHO_LINES, ECHO_MAX_PER_SECOND)
+    warn = ConsoleEcho(True, 1)
+    exporter = MetricsExporter(metrics, METRICS_FILE, METRICS_HTTP_PORT).start()
 
-status_label = tk.Label(root, text="Status: Logging Data", font=("Arial", 14))
-status_label.pack(pady=20)
+    # Open serial connection
+    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+    time.sleep(2)  # Allow time for ESP32 to initialize
 
-gesture_label = tk.Label(root, text="Gesture: Not Set", font=("Arial", 12))
-gesture_label.pack(pady=5)
+    # Create GUI window
+    root = tk.Tk()
+    root.title("ESP32 Data Logger")
+    root.geometry("400x400")
 
-object_label = tk.Label(root, text="Object: Not Set", font=("Arial", 12))
-object_label.pack(pady=5)
+    status_label = tk.Label(root, text="Status: Logging Data", font=("Arial", 14))
+    status_label.pack(pady=20)
 
-# Create text entries for gesture name and object used
-gesture_entry = tk.Entry(root, font=("Arial", 12), width=30)
-gesture_entry.pack(pady=10)
+    gesture_label = tk.Label(root, text="Gesture: Not Set", font=("Arial", 12))
+    gesture_label.pack(pady=5)
 
-object_entry = tk.Entry(root, font=("Arial", 12), width=30)
-object_entry.pack(pady=10)
+    object_label = tk.Label(root, text="Object: Not Set", font=("Arial", 12))
+    object_label.pack(pady=5)
 
-# Create buttons
-pause_button = tk.Button(root, text="Pause Logging", command=pause_logging, font=("Arial", 12), width=20)
-pause_button.pack(pady=5)
+    # Create text entries for gesture name and object used
+    gesture_entry = tk.Entry(root, font=("Arial", 12), width=30)
+    gesture_entry.pack(pady=10)
 
-resume_button = tk.Button(root, text="Resume Logging", command=resume_logging, font=("Arial", 12), width=20)
-resume_button.pack(pady=5)
+    object_entry = tk.Entry(root, font=("Arial", 12), width=30)
+    object_entry.pack(pady=10)
 
-stop_button = tk.Button(root, text="Stop & Save", command=stop_program, font=("Arial", 12), width=20, bg="red", fg="white")
-stop_button.pack(pady=5)
+    # Create buttons
+    pause_button = tk.Button(root, text="Pause Logging", command=pause_logging, font=("Arial", 12), width=20)
+    pause_button.pack(pady=5)
 
-# Run serial reading in a separate thread
-serial_thread = threading.Thread(target=read_serial_data, daemon=True)
-serial_thread.start()
+    resume_button = tk.Button(root, text="Resume Logging", command=resume_logging, font=("Arial", 12), width=20)
+    resume_button.pack(pady=5)
 
-# Start GUI
-root.mainloop()
+    stop_button = tk.Button(root, text="Stop & Save", command=stop_program, font=("Arial", 12), width=20, bg="red", fg="white")
+    stop_button.pack(pady=5)
+
+    # Run serial reading in a separate thread
+    serial_thread = threading.Thread(target=read_serial_data, daemon=True)
+    serial_thread.start()
+
+    # Start GUI
+    root.mainloop()
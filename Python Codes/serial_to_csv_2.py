@@ -1,16 +1,25 @@
 import serial
 import csv
+import os
 import re
 from datetime import datetime
 import threading
 import queue
 import tkinter as tk
 from tkinter import messagebox
+import glove_paths
+from acquisition_metrics import DEPTH_BUCKETS, AcquisitionMetrics, ConsoleEcho, MetricsExporter
 
 # Settings
-SERIAL_PORT = 'COM9'
+SERIAL_PORT = glove_paths.SERIAL_PORT  # Set GLOVE_SERIAL_PORT (e.g. "COM3" or "/dev/ttyUSB0")
 BAUD_RATE = 115200
-filename = "C:/Mini Project/mpu_orientation_log.csv"
+filename = os.path.join(glove_paths.OUTPUT_DIR, "mpu_orientation_log.csv")
+ECHO_LINES = False  # Echo raw serial lines to the console (rate-limited)
+ECHO_MAX_PER_SECOND = 5
+METRICS_FILE = os.path.join(glove_paths.OUTPUT_DIR, "mpu_orientation_log_metrics.json")
+METRICS_HTTP_PORT = None  # e.g. 9100 to serve http://127.0.0.1:9100/metrics
+WRITE_BATCH_SIZE = 256  # Max rows written per batch
+MPU_LINE = re.compile(r'MPU6050 at 0x(..) \| Pitch: ([\d\.\-]+) \| Roll: ([\d\.\-]+) \| Yaw: ([\d\.\-]+)')
 
 # Flags and Data
 logging_active = True
@@ -22,10 +31,6 @@ object_name = ""
 # Queues
 data_queue = queue.Queue()
 
-# Serial Setup
-ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
-ser.flush()
-
 # GUI callbacks
 def pause_logging():
     global logging_active
@@ -44,6 +49,7 @@ def stop_program():
     global running
     running = False
     ser.close()
+    exporter.stop()  # Final metrics before the GUI exits
     root.quit()
     messagebox.showinfo("Logging Stopped", f"Data saved to {filename}")
 
@@ -52,16 +58,31 @@ def read_serial():
     while running:
         try:
             line = ser.readline().decode('utf-8').strip()
-            match = re.search(r'MPU6050 at 0x(..) \| Pitch: ([\d\.\-]+) \| Roll: ([\d\.\-]+) \| Yaw: ([\d\.\-]+)', line)
-            if match and match.group(1) == '69':
+            metrics.check_serial_buffer(ser)
+            if not line:
+                continue
+            metrics.inc("lines_read")
+            echo(line)
+            # Flex lines, separators and status messages are normal output; only MPU data lines
+            # ("🎯 MPU6050 at 0x69 | Pitch: ...") are parsed, the same test SerialLineParser uses
+            if not ("MPU6050 at 0x" in line and "|" in line):
+                continue
+            match = MPU_LINE.search(line)
+            if not match:
+                metrics.inc("parse_failures", "MalformedMPU")
+            elif match.group(1) == '69':
                 timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
                 pitch = float(match.group(2))
                 roll = float(match.group(3))
                 yaw = float(match.group(4))
                 if logging_active:
                     data_queue.put([timestamp, pitch, roll, yaw, phase, grip_type, object_name])
+                    metrics.inc("frames_emitted")
+                    depth = data_queue.qsize()
+                    metrics.set_gauge("queue_depth", depth)
+                    metrics.observe("queue_depth", depth, DEPTH_BUCKETS)
         except Exception as e:
-            pass  # Silently skip bad lines
+            metrics.record_parse_failure(e)  # Skip bad lines, but count them
 
 # CSV writer thread
 def write_csv():
@@ -70,43 +91,64 @@ def write_csv():
         writer.writerow(["Timestamp", "MPU2_Pitch", "MPU2_Roll", "MPU2_Yaw", "Phase", "Grip_Type", "Object"])
         while running or not data_queue.empty():
             try:
-                row = data_queue.get(timeout=1)
-                writer.writerow(row)
+                batch = [data_queue.get(timeout=1)]
             except queue.Empty:
                 continue
-
-# GUI setup
-root = tk.Tk()
-root.title("MPU Logger GUI")
-root.geometry("400x400")
-
-status_label = tk.Label(root, text="Status: Logging Data", font=("Arial", 12))
-status_label.pack(pady=10)
-
-pause_btn = tk.Button(root, text="Pause", command=pause_logging, width=20)
-pause_btn.pack(pady=5)
-
-resume_btn = tk.Button(root, text="Resume", command=resume_logging, width=20)
-resume_btn.pack(pady=5)
-
-stop_btn = tk.Button(root, text="Stop and Save", command=stop_program, width=20, bg="red", fg="white")
-stop_btn.pack(pady=5)
-
-tk.Label(root, text="Phase:").pack()
-phase_entry = tk.Entry(root)
-phase_entry.pack(pady=2)
-
-tk.Label(root, text="Grip Type:").pack()
-grip_type_entry = tk.Entry(root)
-grip_type_entry.pack(pady=2)
-
-tk.Label(root, text="Object:").pack()
-object_entry = tk.Entry(root)
-object_entry.pack(pady=2)
-
-# Start threads
-threading.Thread(target=read_serial, daemon=True).start()
-threading.Thread(target=write_csv, daemon=True).start()
-
-# Run GUI
-root.mainloop()
+            # Drain whatever else is already waiting so rows are written in batches
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(data_queue.get_nowait())
+                except queue.Empty:
+                    break
+            with metrics.timer("write_batch_seconds"):
+                writer.writerows(batch)
+                file.flush()
+            metrics.inc("rows_written", amount=len(batch))
+            metrics.observe("write_batch_rows", len(batch), DEPTH_BUCKETS)
+
+# Nothing below runs on import: the port is opened only when the logger is started
+if __name__ == "__main__":
+    # Diagnostics
+    metrics = AcquisitionMetrics()
+    echo = ConsoleEcho(ECHO_LINES, ECHO_MAX_PER_SECOND)
+    exporter = MetricsExporter(metrics, METRICS_FILE, METRICS_HTTP_PORT).start()
+
+    # Serial Setup
+    ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+    ser.flush()
+
+    # GUI setup
+    root = tk.Tk()
+    root.title("MPU Logger GUI")
+    root.geometry("400x400")
+
+    status_label = tk.Label(root, text="Status: Logging Data", font=("Arial", 12))
+    status_label.pack(pady=10)
+
+    pause_btn = tk.Button(root, text="Pause", command=pause_logging, width=20)
+    pause_btn.pack(pady=5)
+
+    resume_btn = tk.Button(root, text="Resume", command=resume_logging, width=20)
+    resume_btn.pack(pady=5)
+
+    stop_btn = tk.Button(root, text="Stop and Save", command=stop_program, width=20, bg="red", fg="white")
+    stop_btn.pack(pady=5)
+
+    tk.Label(root, text="Phase:").pack()
+    phase_entry = tk.Entry(root)
+    phase_entry.pack(pady=2)
+
+    tk.Label(root, text="Grip Type:").pack()
+    grip_type_entry = tk.Entry(root)
+    grip_type_entry.pack(pady=2)
+
+    tk.Label(root, text="Object:").pack()
+    object_entry = tk.Entry(root)
+    object_entry.pack(pady=2)
+
+    # Start threads
+    threading.Thread(target=read_serial, daemon=True).start()
+    threading.Thread(target=write_csv, daemon=True).start()
+
+    # Run GUI
+    root.mainloop()
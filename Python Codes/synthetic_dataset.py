@@ -0,0 +1,326 @@
+"""Synthetic glove sessions for stress-testing the data and training pipeline.
+
+Generates realistic multi-session datasets in either protocol schema:
+grasp trials made of labelled phases (Protocol 2) or gestures (Protocol 1),
+smooth sensor responses to each phase, per-sensor noise, slow drift, stale
+MPU readings ("not responding"), glitches and dropped rows. Sessions are
+written in parallel, one shard per session, as CSV, gzip'ed CSV or .glarc
+archives, in bounded-memory chunks. Output is reproducible for a given seed,
+whatever the worker count.
+
+    python synthetic_dataset.py OUT_DIR --protocol 2 --sessions 16 --rows 10000000
+    python synthetic_dataset.py OUT_DIR --protocol 1 --size 2GB --format csv.gz --workers 8
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from glove_protocol import FLEX_ADC_BINS, FLEX_ANGLES, FLEX_COLUMNS, PROTOCOLS
+
+FORMATS = {"csv": ".csv", "csv.gz": ".csv.gz", "glarc": ".glarc"}
+CHUNK_ROWS = 200_000
+
+# Phase order of one grasp trial with mean duration in seconds
+PHASES = [("Relaxing", 2.0), ("Reaching", 1.0), ("Holding", 3.0), ("Releasing", 1.0)]
+GRIP_TYPES = ["Cylindrical", "Spherical", "Pinch", "Lateral"]
+OBJECTS = ["Bottle", "Ball", "Pen", "Key", "Cup"]
+GESTURES = ["Fist", "Open Palm", "Pinch", "Point", "Grasp"]
+GESTURE_SECONDS = 4.0
+
+# Flex ADC set-points (12-bit, same range as the firmware calibration)
+FLEX_RELAXED = 3300.0
+FLEX_CLOSED = {"Cylindrical": 3900.0, "Spherical": 3800.0, "Pinch": 3650.0, "Lateral": 3700.0,
+               "Fist": 3950.0, "Open Palm": 3300.0, "Point": 3600.0, "Grasp": 3850.0}
+FINGER_WEIGHT = np.array([1.0, 0.9, 0.8])  # Flex3 bends least
+PHASE_CLOSURE = {"Relaxing": 0.0, "Reaching": 0.3, "Holding": 1.0, "Releasing": 0.45}
+PHASE_ORIENTATION = {  # (pitch, roll) of the hand in degrees
+    "Relaxing": (0.0, 0.0), "Reaching": (-35.0, 10.0), "Holding": (-20.0, 5.0), "Releasing": (-30.0, 12.0),
+}
+
+DEFAULTS = {
+    "rate_hz": 50.0,  # logger frame rate
+    "flex_noise": 8.0,  # ADC counts
+    "angle_noise": 0.4,  # degrees
+    "gyro_noise": 1.5,  # deg/s
+    "drift": 0.2,  # random-walk sensor drift per sqrt(second), in units of the noise level
+    "yaw_bias": 0.05,  # deg/s gyro bias
+    "stale": 0.002,  # chance per row that an MPU freezes for ~0.5 s
+    "glitch": 0.0005,  # chance per row of a single-sample MPU spike
+    "drop_rows": 0.001,  # chance per row that a frame is lost (timestamp gap)
+    "smoothing_s": 0.15,  # sensor response time to a phase change
+}
+
+
+# === Session plan ===
+def plan_trials(rng, protocol, rows, rate_hz):
+    """Label segments for a whole session: (segment end rows, label columns, closure, orientation, grip)."""
+    ends, labels, closure, orient, grip = [], {c: [] for c in PROTOCOLS[protocol]["labels"]}, [], [], []
+    row = 0
+    while row < rows:
+        if protocol == "2":
+            trial_grip = rng.choice(GRIP_TYPES)
+            trial_object = rng.choice(OBJECTS)
+            segments = [(phase, mean, trial_grip) for phase, mean in PHASES]
+        else:
+            gesture = rng.choice(GESTURES)
+            trial_object = rng.choice(OBJECTS)
+            segments = [(gesture, GESTURE_SECONDS, gesture)]
+        heading = rng.normal(0, 25)
+        for name, mean_s, shape in segments:
+            length = max(1, int(rng.gamma(4.0, mean_s / 4.0) * rate_hz))
+            row += length
+            ends.append(min(row, rows))
+            if protocol == "2":
+                labels["Phase"].append(name)
+                labels["Grip_Type"].append(trial_grip)
+                labels["Object"].append(trial_object)
+                closure.append(PHASE_CLOSURE[name])
+                pitch, roll = PHASE_ORIENTATION[name]
+            else:
+                labels["Gesture_Name"].append(name)
+                labels["Object_Used"].append(trial_object)
+                closure.append(1.0 if name != "Open Palm" else 0.0)
+                pitch, roll = PHASE_ORIENTATION["Holding"]
+            orient.append((pitch + rng.normal(0, 4), roll + rng.normal(0, 4), heading))
+            grip.append(FLEX_CLOSED[shape])
+            if row >= rows:
+                break
+    return (np.array(ends), {c: np.array(v) for c, v in labels.items()},
+            np.array(closure), np.array(orient), np.array(grip))
+
+
+# === Signal generation ===
+class SessionSimulator:
+    """Generates one session chunk by chunk; filter, drift and yaw state carry across chunks."""
+
+    def __init__(self, protocol, rows, seed, start_time=None, **options):
+        self.protocol = protocol
+        self.rows = rows
+        self.opt = {**DEFAULTS, **options}
+        self.rng = np.random.default_rng(seed)
+        rate = self.opt["rate_hz"]
+        self.start_ns = pd.Timestamp(start_time or "2025-03-01 10:00:00").value + int(self.rng.integers(0, 8 * 3600)) * 10 ** 9
+        self.ends, self.labels, self.closure, self.orient, self.grip = plan_trials(self.rng, protocol, rows, rate)
+        self.alpha = float(np.exp(-1.0 / (self.opt["smoothing_s"] * rate)))
+        # Carried state: smoothed targets (3 flex + 2 MPUs x pitch/roll), drift, yaw, previous angles
+        self.smooth = None
+        self.drift = np.zeros(7)
+        self.yaw = np.zeros(2)
+        self.prev_angles = None
+        self.sensor_offset = self.rng.normal(0, 40, 3)  # per-glove flex calibration offset
+
+    def _targets(self, seg):
+        closure = self.closure[seg][:, None] * FINGER_WEIGHT[None, :]
+        flex = FLEX_RELAXED + closure * (self.grip[seg][:, None] - FLEX_RELAXED) + self.sensor_offset
+        pitch, roll = self.orient[seg, 0], self.orient[seg, 1]
+        # The second MPU (0x69) sits on the back of the hand and follows the first with an offset
+        return np.column_stack([flex, pitch, roll, pitch * 0.8 - 5, roll * 0.9 + 3])
+
+    def _smooth(self, targets):
+        from scipy.signal import lfilter
+
+        a = self.alpha
+        if self.smooth is None:
+            self.smooth = targets[0] * a
+        out, self.smooth = lfilter([1 - a], [1, -a], targets, axis=0, zi=self.smooth[None, :])
+        self.smooth = self.smooth[0]
+        return out
+
+    def _stale_mask(self, n):
+        """Runs of ~0.5 s where an MPU keeps repeating its last reading."""
+        mask = np.zeros(n, dtype=bool)
+        length = max(1, int(0.5 * self.opt["rate_hz"]))
+        for start in np.flatnonzero(self.rng.random(n) < self.opt["stale"]):
+            mask[start:start + length] = True
+        return mask
+
+    def chunks(self, chunk_rows=CHUNK_ROWS):
+        rate = self.opt["rate_hz"]
+        for i0 in range(0, self.rows, chunk_rows):
+            idx = np.arange(i0, min(i0 + chunk_rows, self.rows))
+            n = len(idx)
+            seg = np.searchsorted(self.ends, idx, side="right")
+            signal = self._smooth(self._targets(seg))
+
+            noise_scale = np.array([self.opt["flex_noise"]] * 3 + [self.opt["angle_noise"]] * 4)
+            steps = self.rng.normal(0, self.opt["drift"] / np.sqrt(rate), (n, 7)) * noise_scale
+            drift = self.drift + np.cumsum(steps, axis=0)
+            self.drift = drift[-1]
+            signal = signal + drift + self.rng.normal(0, 1, (n, 7)) * noise_scale
+
+            adc = np.clip(np.round(signal[:, :3]), 0, 4095).astype(np.int16)
+            flex_angle = np.asarray(FLEX_ANGLES, dtype=np.int16)[np.digitize(adc, FLEX_ADC_BINS)]
+
+            yaw_rate = self.opt["yaw_bias"] + self.rng.normal(0, self.opt["gyro_noise"], (n, 2))
+            yaw = self.yaw + np.cumsum(yaw_rate, axis=0) / rate
+            self.yaw = yaw[-1]
+            heading = self.orient[seg, 2][:, None]
+            angles = np.column_stack([signal[:, 3], signal[:, 4], yaw[:, 0] + heading[:, 0],
+                                      signal[:, 5], signal[:, 6], yaw[:, 1] + heading[:, 0]])
+
+            glitches = self.rng.random((n, 6)) < self.opt["glitch"]
+            angles[glitches] += self.rng.choice([-1, 1], glitches.sum()) * self.rng.uniform(60, 180, glitches.sum())
+            for m in range(2):
+                stale = self._stale_mask(n)
+                if stale.any():
+                    values = angles[:, m * 3:(m + 1) * 3]
+                    held = pd.DataFrame(np.where(stale[:, None], np.nan, values)).ffill().to_numpy()
+                    angles[:, m * 3:(m + 1) * 3] = np.where(np.isnan(held), values, held)
+
+            keep = self.rng.random(n) >= self.opt["drop_rows"]
+            df = self._frame(idx, seg, adc, flex_angle, angles, rate)
+            yield df[keep].reset_index(drop=True)
+
+    def _frame(self, idx, seg, adc, flex_angle, angles, rate):
+        ts = (self.start_ns + (idx * (1e9 / rate)).astype(np.int64)).view("datetime64[ns]")
+        data = {"Timestamp": ts}
+        if self.protocol == "1":
+            data["Timestamp"] = ts.astype("datetime64[s]").astype("datetime64[ns]")  # loggers write whole seconds
+            data["Upload_Timestamp"] = pd.Series(np.datetime_as_string(ts, unit="s")).str.slice(11, 19)
+        for i in range(3):
+            data[FLEX_COLUMNS[2 * i]] = adc[:, i]
+            data[FLEX_COLUMNS[2 * i + 1]] = flex_angle[:, i]
+        if self.protocol == "2":
+            for m in range(2):
+                for j, axis in enumerate(("Pitch", "Roll", "Yaw")):
+                    data[f"MPU{m + 1}_{axis}"] = angles[:, m * 3 + j].astype(np.float32)
+        else:
+            if self.prev_angles is None:
+                self.prev_angles = angles[0]
+            rates = np.diff(angles, axis=0, prepend=self.prev_angles[None, :]) * rate
+            self.prev_angles = angles[-1]
+            rates += self.rng.normal(0, self.opt["gyro_noise"], rates.shape)
+            # AngleX follows roll, AngleY pitch, AngleZ yaw (sketch_apr7a.ino integration axes)
+            for m in range(2):
+                pitch, roll, yaw = (m * 3, m * 3 + 1, m * 3 + 2)
+                for axis, col in (("X", roll), ("Y", pitch), ("Z", yaw)):
+                    data[f"MPU{m + 1}_Gyro{axis}"] = rates[:, col].astype(np.float32)
+                for axis, col in (("X", roll), ("Y", pitch), ("Z", yaw)):
+                    data[f"MPU{m + 1}_Angle{axis}"] = angles[:, col].astype(np.float32)
+        for column, values in self.labels.items():
+            data[column] = values[seg]
+        df = pd.DataFrame(data)
+        return df[["Timestamp"] + (["Upload_Timestamp"] if self.protocol == "1" else [])
+                  + PROTOCOLS[self.protocol]["sensors"] + PROTOCOLS[self.protocol]["labels"]]
+
+
+# === Writers ===
+def _csv_ready(df, protocol):
+    """Logger-style text timestamps and 2-decimal floats.
+
+    Rounding in float64 and letting pandas print the shortest repr is much
+    faster than to_csv(float_format=...).
+    """
+    unit = "s" if protocol == "1" else "ms"
+    text = np.datetime_as_string(df["Timestamp"].to_numpy("datetime64[ns]"), unit=unit)
+    df = df.copy()
+    df["Timestamp"] = np.char.replace(text.astype(str), "T", " ")
+    for name in df.columns:
+        if df[name].dtype == np.float32:
+            df[name] = df[name].astype(np.float64).round(2)
+    return df
+
+
+def write_session(path, protocol, rows, seed, fmt="csv", options=None):
+    """Generate one session file; returns (path, rows written, bytes)."""
+    sim = SessionSimulator(protocol, rows, seed, **(options or {}))
+    written = 0
+    if fmt == "glarc":
+        from glove_archive import ArchiveWriter
+
+        writer = ArchiveWriter(path)
+        for chunk in sim.chunks():
+            writer.write(chunk)
+            written += len(chunk)
+        writer.close()
+    else:
+        # Compression level 1: generation speed matters more than the last few percent here
+        f = gzip.open(path, "wt", newline="", compresslevel=1) if fmt == "csv.gz" else open(path, "w", newline="")
+        with f:
+            for i, chunk in enumerate(sim.chunks()):
+                _csv_ready(chunk, protocol).to_csv(f, header=(i == 0), index=False)
+                written += len(chunk)
+    return path, written, os.path.getsize(path)
+
+
+def bytes_per_row(protocol, fmt, options=None, sample_rows=20_000):
+    """Measure the on-disk size of a sample session in the chosen format."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sample" + FORMATS[fmt])
+        _, rows, size = write_session(path, protocol, sample_rows, 0, fmt, options)
+    return size / rows
+
+
+def parse_size(text):
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)B?\s*", text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size {text!r}; use e.g. 500MB or 2GB")
+    return int(float(match.group(1)) * 1024 ** " KMGT".index(match.group(2) or " "))
+
+
+def generate(out_dir, protocol="2", sessions=8, rows=None, size=None, fmt="csv", workers=None, seed=0,
+             options=None):
+    """Write `sessions` shards totalling `rows` rows (or about `size` bytes)."""
+    if rows is None:
+        if size is None:
+            raise ValueError("Give a target in rows or bytes")
+        rows = int(size / bytes_per_row(protocol, fmt, options))
+    os.makedirs(out_dir, exist_ok=True)
+    per_session = np.full(sessions, rows // sessions)
+    per_session[:rows % sessions] += 1
+    seeds = np.random.SeedSequence(seed).spawn(sessions)
+
+    start = time.perf_counter()
+    total_rows = total_bytes = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(write_session, os.path.join(out_dir, f"synthetic_p{protocol}_{i + 1:03d}{FORMATS[fmt]}"),
+                        protocol, int(n), seeds[i], fmt, options)
+            for i, n in enumerate(per_session) if n > 0
+        ]
+        for future in as_completed(futures):
+            path, n, nbytes = future.result()
+            total_rows += n
+            total_bytes += nbytes
+            print(f"✅ {os.path.basename(path)}: {n:,} rows, {nbytes / 2 ** 20:.1f} MB")
+
+    elapsed = time.perf_counter() - start
+    manifest = {"protocol": protocol, "sessions": sessions, "rows": total_rows, "bytes": total_bytes,
+                "format": fmt, "seed": seed, "options": {**DEFAULTS, **(options or {})}}
+    with open(os.path.join(out_dir, "synthetic_manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"📦 {total_rows:,} rows / {total_bytes / 2 ** 20:.1f} MB in {elapsed:.1f} s "
+          f"({total_rows / elapsed:,.0f} rows/s)")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic glove sessions")
+    parser.add_argument("out_dir")
+    parser.add_argument("--protocol", choices=sorted(PROTOCOLS), default="2")
+    parser.add_argument("--sessions", type=int, default=8, help="number of session files (shards)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--rows", type=int, help="total rows over all sessions")
+    target.add_argument("--size", type=parse_size, help="approximate total size on disk, e.g. 500MB, 2GB")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    for name, value in DEFAULTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=float, default=value)
+    args = parser.parse_args(argv)
+
+    options = {name: getattr(args, name) for name in DEFAULTS}
+    generate(args.out_dir, args.protocol, args.sessions, args.rows, args.size, args.format, args.workers,
+             args.seed, options)
+
+
+if __name__ == "__main__":
+    main()
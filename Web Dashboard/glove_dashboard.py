@@ -1,7 +1,7 @@
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
 import requests
-import pandas as pd
+from collections import deque
 from datetime import datetime
 
 # --- LOGIN SECTION ---
@@ -39,7 +39,7 @@ ACCURACY_PIN = "v1"
 def fetch_blynk_data():
     url = f"https://blynk.cloud/external/api/get?token={BLYNK_AUTH}&{PHASE_PIN}&{ACCURACY_PIN}"
     try:
-        response = requests.get(url)
+        response = requests.get(url, timeout=1.5)  # Never block a rerun longer than the refresh interval
         if response.status_code == 200:
             return response.json()
         else:
@@ -57,9 +57,10 @@ if st.button("Logout"):
 # --- Flicker-free auto-refresh ---
 st_autorefresh(interval=2000, limit=None, key="dashboardrefresh")  # 2000ms = 2 seconds
 
-# Data buffer for time series
+# Data buffer for time series: a bounded deque, appended in place on every rerun
+# (no DataFrame is rebuilt or concatenated each time the page refreshes)
 if "data_log" not in st.session_state:
-    st.session_state["data_log"] = pd.DataFrame(columns=["Time", "Accuracy"])
+    st.session_state["data_log"] = deque(maxlen=50)  # Keep the last 50 entries
 
 # Fetch latest data
 blynk_data = fetch_blynk_data()
@@ -70,12 +71,7 @@ except:
     accuracy = 0
 
 now = datetime.now().strftime("%H:%M:%S")
-new_row = pd.DataFrame([[now, accuracy]], columns=["Time", "Accuracy"])
-st.session_state["data_log"] = pd.concat([st.session_state["data_log"], new_row], ignore_index=True)
-
-# Limit to last 50 entries
-if len(st.session_state["data_log"]) > 50:
-    st.session_state["data_log"] = st.session_state["data_log"].iloc[-50:]
+st.session_state["data_log"].append((now, accuracy))
 
 # --- UI ---
 phase_placeholder = st.empty()
@@ -84,4 +80,5 @@ chart_placeholder = st.empty()
 
 phase_placeholder.subheader(f"📌 Current Phase: `{phase}`")
 accuracy_placeholder.metric("🎯 Accuracy (%)", f"{accuracy:.2f}")
-chart_placeholder.line_chart(st.session_state["data_log"].set_index("Time"))
+times, accuracies = zip(*st.session_state["data_log"])
+chart_placeholder.line_chart({"Time": times, "Accuracy": accuracies}, x="Time", y="Accuracy")